@@ -12,5 +12,13 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pm_backend.settings')
+# Route /graphql/ to AsyncGraphQLView + async_schema (see urls.py)
+os.environ.setdefault('GRAPHQL_ASYNC', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Needs the app registry that get_asgi_application() set up
+from pm_backend.websocket import websocket_router  # noqa: E402
+
+# WebSockets on /graphql/ carry subscriptions; everything else is Django
+application = websocket_router(django_application)
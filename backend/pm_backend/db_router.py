@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from projects.response_cache import get_cache
+
+
+# --------------------
+# Primary / read-replica routing
+# --------------------
+# Reads go to settings.DATABASE_READ_REPLICA only inside read_from(), which
+# the GraphQL views enter while executing query operations. Mutations, the
+# admin, management commands and migrations use the primary.
+# A mutation pins its organization to the primary for
+# DATABASE_REPLICA_PIN_SECONDS, so the client that wrote reads its own
+# writes while the replica catches up. The client sends no cookies, so the
+# pin is per organization, kept in the default cache. settings.py refuses a
+# replica with a process-local cache backend: the next request may be served
+# by another worker, which would not see the pin.
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+@contextmanager
+def read_from(alias):
+    """Route reads in this context to alias (None = the primary)."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def _pin_key(org_id):
+    return f"db:primary-pin:{org_id}"
+
+
+def pin_to_primary(org_id):
+    if settings.DATABASE_READ_REPLICA and org_id is not None:
+        get_cache().set(_pin_key(org_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(org_id):
+    return org_id is not None and get_cache().get(_pin_key(org_id)) is not None
+
+
+def replica_for_query(org_id):
+    """Alias a query operation of this organization may read from, None for the primary."""
+    replica = settings.DATABASE_READ_REPLICA
+    if not replica or is_pinned(org_id):
+        return None
+    return replica
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Explicit: related managers would otherwise follow the instance's database
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same rows on both databases
+        return True
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from graphql import OperationType
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+# --------------------
+# Encoding of /graphql/ responses (PMGraphQLView, AsyncGraphQLView)
+# --------------------
+# - JSON is written by orjson when it is installed, else by a compact stdlib encoder
+# - bodies from GRAPHQL_COMPRESSION_MIN_BYTES on are brotli (if installed)
+#   or gzip compressed, as Accept-Encoding allows
+# - 200 responses to query operations carry a strong ETag of the JSON body;
+#   a matching If-None-Match, on GET or POST, gets a 304 without a body
+# Mutations never get an ETag. Traced responses are left alone: the tracing
+# middleware rewrites their body after the view.
+
+GZIP_LEVEL = 6
+
+_stdlib_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
+
+def dumps(data):
+    """Compact JSON text of a response dict."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return _stdlib_encoder.encode(data)
+
+
+def available_encodings():
+    """Content codings this process can produce, preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding, available=None):
+    """The coding to use for an Accept-Encoding header, None for identity."""
+    available = available_encodings() if available is None else available
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = q
+
+    weights = {coding: accepted.get(coding, accepted.get("*", 0.0)) for coding in available}
+    # Highest q wins; ties go to the coding listed first (smaller bodies)
+    best = max(available, key=lambda coding: weights[coding], default=None)
+    return best if best is not None and weights[best] > 0 else None
+
+
+def compress(body, coding):
+    if coding == "br":
+        return brotli.compress(body, quality=settings.GRAPHQL_BROTLI_QUALITY)
+    # mtime=0: the same body always compresses to the same bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def body_digest(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(if_none_match, digest):
+    """Weak comparison (as If-None-Match asks), ignoring the coding suffix."""
+    for tag in parse_etags(if_none_match or ""):
+        if tag == "*" or tag.removeprefix("W/").strip('"').split("-")[0] == digest:
+            return True
+    return False
+
+
+def encode_response(request, response):
+    """ETag/304 and compression for a finished /graphql/ HttpResponse."""
+    tracer = getattr(request, "graphql_tracer", None)
+    if (
+        response.streaming
+        or response.has_header("Content-Encoding")
+        or not response.get("Content-Type", "").startswith("application/json")
+        or (tracer is not None and tracer.trace_resolvers)
+    ):
+        return response
+
+    body = response.content
+    coding = None
+    if len(body) >= settings.GRAPHQL_COMPRESSION_MIN_BYTES:
+        patch_vary_headers(response, ["Accept-Encoding"])
+        coding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+
+    if response.status_code == 200 and getattr(request, "graphql_operation", None) == OperationType.QUERY:
+        digest = body_digest(body)
+        # Strong validators differ per content coding
+        response["ETag"] = f'"{digest}-{coding}"' if coding else f'"{digest}"'
+        # Tenant data: revalidate every time, never in shared caches
+        response["Cache-Control"] = "private, no-cache"
+        if etag_matches(request.META.get("HTTP_IF_NONE_MATCH"), digest):
+            not_modified = HttpResponseNotModified()
+            for header in ("ETag", "Cache-Control", "Vary"):
+                if response.has_header(header):
+                    not_modified[header] = response[header]
+            return not_modified
+
+    if coding is not None:
+        response.content = compress(body, coding)
+        response["Content-Encoding"] = coding
+    return response
@@ -1,6 +1,7 @@
 #This is the root schema that Graphene uses.
 import graphene
 from projects.schema import Query as ProjectsQuery, Mutation as ProjectsMutation
+from projects.subscriptions import Subscription as ProjectsSubscription
 
 
 class Query(ProjectsQuery, graphene.ObjectType):
@@ -13,4 +14,15 @@ class Mutation(ProjectsMutation, graphene.ObjectType):
     pass
 
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
+class Subscription(ProjectsSubscription, graphene.ObjectType):
+    # Served over WebSockets by the ASGI app (pm_backend/websocket.py)
+    pass
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation, subscription=Subscription)
+
+
+# Same schema with async query resolvers, served by the ASGI view (see urls.py)
+from projects.async_schema import AsyncQuery  # noqa: E402
+
+async_schema = graphene.Schema(query=AsyncQuery, mutation=Mutation, subscription=Subscription)
@@ -4,6 +4,7 @@ Django settings for pm_backend project.
 
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 from corsheaders.defaults import default_headers
 import dj_database_url
@@ -55,6 +56,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # No-op unless GRAPHQL_TRACING_ENABLED (see pm_backend/tracing.py)
+    "pm_backend.tracing.GraphQLTracingMiddleware",
 ]
 
 # --------------------------------------------------
@@ -84,14 +87,45 @@ TEMPLATES = [
 # --------------------------------------------------
 # DATABASE (FIXED FOR RENDER + LOCAL)
 # --------------------------------------------------
+DATABASE_URL = os.getenv("DATABASE_URL")
+
 DATABASES = {
     "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"),
+        default=DATABASE_URL,
         conn_max_age=600,
-        ssl_require=True,
+        # sslmode is a PostgreSQL option; sqlite:/// URLs (local load tests) reject it
+        ssl_require=not (DATABASE_URL or "").startswith("sqlite"),
     )
 }
 
+# Optional read replica of DATABASE_URL. GraphQL queries read from it;
+# mutations, the admin and management commands stay on the primary
+# (see pm_backend/db_router.py). Needs a shared cache (CACHES below) for the
+# read-your-writes pin. Locally, two SQLite files work:
+#   DATABASE_URL=sqlite:///primary.sqlite3 DATABASE_REPLICA_URL=sqlite:///replica.sqlite3
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache CACHE_LOCATION=/tmp/pm-cache
+# with "manage.py sync_sqlite_replica" standing in for replication.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        ssl_require=not DATABASE_REPLICA_URL.startswith("sqlite"),
+        # Tests read and write one database
+        test_options={"MIRROR": "default"},
+    )
+
+DATABASE_ROUTERS = ["pm_backend.db_router.PrimaryReplicaRouter"]
+DATABASE_READ_REPLICA = "replica" if DATABASE_REPLICA_URL else None
+# After a mutation, the organization reads from the primary this long (replica lag)
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))
+
+# PostgreSQL only: partition projects_task by organization (migration 0011,
+# manage.py partition_tasks; see projects/partitioning.py)
+TASK_PARTITIONING = os.getenv("TASK_PARTITIONING", "False") == "True"
+TASK_PARTITIONING_BATCH_SIZE = int(os.getenv("TASK_PARTITIONING_BATCH_SIZE", "10000"))
+
 # --------------------------------------------------
 # PASSWORD VALIDATION
 # --------------------------------------------------
@@ -109,6 +143,78 @@ GRAPHENE = {
     "SCHEMA": "pm_backend.schema.schema",
 }
 
+# Serve /graphql/ with async resolvers (set by asgi.py; wsgi.py keeps the sync view)
+GRAPHQL_ASYNC = os.getenv("GRAPHQL_ASYNC", "False") == "True"
+
+# Static query cost limits (Organization.max_query_depth/max_query_cost override them)
+GRAPHQL_MAX_QUERY_DEPTH = int(os.getenv("GRAPHQL_MAX_QUERY_DEPTH", "10"))
+GRAPHQL_MAX_QUERY_COST = int(os.getenv("GRAPHQL_MAX_QUERY_COST", "10000"))
+# Assumed size of unpaginated lists (Project.tasks, Task.comments, ...)
+GRAPHQL_LIST_SIZE_ESTIMATE = int(os.getenv("GRAPHQL_LIST_SIZE_ESTIMATE", "20"))
+
+# Per-request tracing: SQL counts + slow-operation log, extensions.tracing
+# for requests sending X-Debug-Tracing: 1
+GRAPHQL_TRACING_ENABLED = os.getenv("GRAPHQL_TRACING_ENABLED", "False") == "True"
+GRAPHQL_TRACING_PATH = "/graphql/"
+GRAPHQL_SLOW_OPERATION_MS = int(os.getenv("GRAPHQL_SLOW_OPERATION_MS", "500"))
+
+# Parsed/validated documents kept per process (also the persisted query store)
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "512"))
+
+# Subscriptions over WebSockets (ASGI only, see pm_backend/websocket.py).
+# The in-memory broker only reaches subscribers of the same process.
+GRAPHQL_SUBSCRIPTION_BROKER = os.getenv("GRAPHQL_SUBSCRIPTION_BROKER", "projects.broker.InMemoryBroker")
+# Events buffered per subscriber; a slower client loses the oldest
+GRAPHQL_SUBSCRIPTION_QUEUE_SIZE = int(os.getenv("GRAPHQL_SUBSCRIPTION_QUEUE_SIZE", "100"))
+# Seconds a new connection has to send connection_init
+GRAPHQL_WS_INIT_TIMEOUT = int(os.getenv("GRAPHQL_WS_INIT_TIMEOUT", "10"))
+
+# /graphql/ response bodies from this size on are compressed (gzip, or
+# brotli when installed) for clients that accept it (pm_backend/response_encoding.py)
+GRAPHQL_COMPRESSION_MIN_BYTES = int(os.getenv("GRAPHQL_COMPRESSION_MIN_BYTES", "1024"))
+GRAPHQL_BROTLI_QUALITY = int(os.getenv("GRAPHQL_BROTLI_QUALITY", "5"))
+
+# --------------------------------------------------
+# ORGANIZATION CACHE (process-local slug -> Organization)
+# --------------------------------------------------
+ORG_CACHE_MAX_SIZE = int(os.getenv("ORG_CACHE_MAX_SIZE", "1024"))
+ORG_CACHE_TTL = int(os.getenv("ORG_CACHE_TTL", "60"))  # seconds
+
+# --------------------------------------------------
+# CACHES (locmem by default; e.g. FileBasedCache + CACHE_LOCATION=/tmp/pm-cache)
+# --------------------------------------------------
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "pm-backend"),
+    }
+}
+
+# Backends whose entries (and the org version counters) live in one process:
+# with several workers, a write in one never reaches another's cache
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+SHARED_CACHE = CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+# The replica pin must be seen by the worker serving the next request
+if DATABASE_REPLICA_URL and not SHARED_CACHE:
+    raise ImproperlyConfigured(
+        "DATABASE_REPLICA_URL needs a cache shared by all workers: set CACHE_BACKEND "
+        "(e.g. django.core.cache.backends.redis.RedisCache) and CACHE_LOCATION."
+    )
+
+# Query responses keyed by (org version, document hash, variables).
+# On by default only with a shared cache (Redis, Memcached, files, database)
+GRAPHQL_RESPONSE_CACHE_ENABLED = os.getenv("GRAPHQL_RESPONSE_CACHE_ENABLED", str(SHARED_CACHE)) == "True"
+GRAPHQL_RESPONSE_CACHE_ALIAS = "default"
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(os.getenv("GRAPHQL_RESPONSE_CACHE_TIMEOUT", "300"))  # seconds
+
+# orgStats aggregates, keyed by the same org version (0 disables).
+# Like the response cache, on by default only with a shared cache
+ORG_STATS_CACHE_TIMEOUT = int(os.getenv("ORG_STATS_CACHE_TIMEOUT", "300" if SHARED_CACHE else "0"))  # seconds
+
 # --------------------------------------------------
 # CORS
 # --------------------------------------------------
@@ -116,8 +222,31 @@ CORS_ALLOW_ALL_ORIGINS = True  # OK for now (tighten later)
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "X-ORG-SLUG",
+    "X-DEBUG-TRACING",
+    # Conditional GraphQL queries (ETag/304)
+    "IF-NONE-MATCH",
 ]
 
+CORS_EXPOSE_HEADERS = ["ETag"]
+
+# --------------------------------------------------
+# LOGGING (slow GraphQL operations as one JSON line each)
+# --------------------------------------------------
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "pm_backend.slow_operations": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 # --------------------------------------------------
 # I18N
 # --------------------------------------------------
@@ -0,0 +1,206 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+from inspect import isawaitable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+slow_operation_log = logging.getLogger("pm_backend.slow_operations")
+
+# Clients send this header to get extensions.tracing back
+TRACING_HEADER = "HTTP_X_DEBUG_TRACING"
+
+# Path of the resolver running right now, so SQL can be attributed to it.
+# A ContextVar follows sync_to_async into the ORM thread and stays per task
+# when async resolvers run concurrently.
+current_resolver_path = ContextVar("current_resolver_path", default=None)
+
+
+# --------------------
+# Per-request tracing (opt-in with GRAPHQL_TRACING_ENABLED)
+# --------------------
+
+
+class RequestTracer:
+    """
+    Collects timings for one /graphql/ request:
+    - wall time, SQL count and SQL time (always, for the slow-operation log)
+    - wall time per resolver path and every SQL statement with the resolver
+      path that issued it (only when the debug header asks for it)
+    """
+
+    def __init__(self, trace_resolvers=False):
+        self.trace_resolvers = trace_resolvers
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.operation_name = None
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.response_bytes = 0
+        self.resolvers = []
+        self.queries = []
+
+    def record_sql(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.sql_count += 1
+            self.sql_ms += duration_ms
+            if self.trace_resolvers:
+                self.queries.append(
+                    {
+                        "sql": sql,
+                        "path": current_resolver_path.get(),
+                        "durationMs": round(duration_ms, 3),
+                    }
+                )
+
+    def record_resolver(self, info, start):
+        self.resolvers.append(
+            {
+                "path": info.path.as_list(),
+                "parentType": info.parent_type.name,
+                "fieldName": info.field_name,
+                "durationMs": round((time.perf_counter() - start) * 1000, 3),
+            }
+        )
+
+    def finish(self, response_bytes):
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        self.response_bytes = response_bytes
+
+    def summary(self):
+        return {
+            "operationName": self.operation_name,
+            "durationMs": round(self.duration_ms, 3),
+            "sql": {"count": self.sql_count, "durationMs": round(self.sql_ms, 3)},
+            "responseBytes": self.response_bytes,
+        }
+
+    def as_extension(self):
+        return {**self.summary(), "resolvers": self.resolvers, "queries": self.queries}
+
+
+class TracingMiddleware:
+    """
+    Graphene middleware timing every resolver. PMGraphQLView only installs
+    it for requests whose tracer records resolvers.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def resolve(self, next, root, info, **args):
+        start = time.perf_counter()
+        token = current_resolver_path.set(info.path.as_list())
+        try:
+            result = next(root, info, **args)
+        finally:
+            current_resolver_path.reset(token)
+        if isawaitable(result):
+            return self._await(result, info, start)
+        self.tracer.record_resolver(info, start)
+        return result
+
+    async def _await(self, result, info, start):
+        # The coroutine body only runs once awaited, so set the path again here
+        token = current_resolver_path.set(info.path.as_list())
+        try:
+            return await result
+        finally:
+            current_resolver_path.reset(token)
+            self.tracer.record_resolver(info, start)
+
+
+def _add_execute_wrapper(wrapper):
+    # Every alias: query operations may read from the replica (db_router.py)
+    for conn in connections.all():
+        conn.execute_wrappers.append(wrapper)
+
+
+def _remove_execute_wrapper(wrapper):
+    for conn in connections.all():
+        conn.execute_wrappers.remove(wrapper)
+
+
+class GraphQLTracingMiddleware:
+    """
+    Django middleware around the GraphQL endpoint:
+    - counts SQL queries via execute_wrapper() on every database connection
+    - logs operations slower than GRAPHQL_SLOW_OPERATION_MS
+    - adds extensions.tracing to JSON responses when X-Debug-Tracing is sent
+    Removed from the stack (MiddlewareNotUsed) unless GRAPHQL_TRACING_ENABLED.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.GRAPHQL_TRACING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.path != settings.GRAPHQL_TRACING_PATH:
+            return self.get_response(request)
+
+        tracer = self.start(request)
+        _add_execute_wrapper(tracer.record_sql)
+        try:
+            response = self.get_response(request)
+        finally:
+            _remove_execute_wrapper(tracer.record_sql)
+        return self.finish(request, tracer, response)
+
+    async def __acall__(self, request):
+        if request.path != settings.GRAPHQL_TRACING_PATH:
+            return await self.get_response(request)
+
+        tracer = self.start(request)
+        # Connections are per thread: hook the one the async ORM runs queries on
+        await sync_to_async(_add_execute_wrapper)(tracer.record_sql)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_execute_wrapper)(tracer.record_sql)
+        return self.finish(request, tracer, response)
+
+    def start(self, request):
+        tracer = RequestTracer(trace_resolvers=bool(request.META.get(TRACING_HEADER)))
+        request.graphql_tracer = tracer
+        return tracer
+
+    def finish(self, request, tracer, response):
+        tracer.finish(len(getattr(response, "content", b"")))
+
+        if tracer.duration_ms >= settings.GRAPHQL_SLOW_OPERATION_MS:
+            org = getattr(request, "organization", None)
+            slow_operation_log.warning(
+                json.dumps(
+                    {
+                        "event": "slow_graphql_operation",
+                        "org": request.META.get("HTTP_X_ORG_SLUG") or getattr(org, "slug", None),
+                        "status": response.status_code,
+                        **tracer.summary(),
+                    }
+                )
+            )
+
+        if tracer.trace_resolvers and response.get("Content-Type", "").startswith("application/json"):
+            body = json.loads(response.content)
+            if isinstance(body, dict):
+                body.setdefault("extensions", {})["tracing"] = tracer.as_extension()
+                response.content = json.dumps(body)
+        return response
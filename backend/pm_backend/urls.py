@@ -1,13 +1,26 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
+from pm_backend.schema import async_schema
+from pm_backend.views import AsyncGraphQLView, PMGraphQLView, cache_stats, export_org_data
 
 
+if settings.GRAPHQL_ASYNC:
+    graphql_view = AsyncGraphQLView.as_view(schema=async_schema, graphiql=True)
+    # csrf_exempt() would hide the coroutine function on Django 4.2
+    graphql_view.csrf_exempt = True
+else:
+    graphql_view = csrf_exempt(PMGraphQLView.as_view(graphiql=True))
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql/", graphql_view),
+    path("graphql/stats/", cache_stats),
+    path("export/", export_org_data),
 ]
 
 # graphiql=True gives you a GraphQL playground in browser.
-# csrf_exempt makes it easier to test from tools / frontend later.
\ No newline at end of file
+# PMGraphQLView adds persisted queries + a parsed document cache (see views.py).
+# Under ASGI (asgi.py sets GRAPHQL_ASYNC) the same endpoint runs async resolvers.
+# csrf_exempt makes it easier to test from tools / frontend later.
@@ -0,0 +1,588 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, transaction
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBadRequest
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.utils.utils import set_rollback
+from graphene_django.views import GraphQLView, HttpError
+from graphql import (
+    ExecutionResult,
+    OperationType,
+    execute,
+    get_operation_ast,
+    parse,
+    validate_schema,
+)
+from graphql.error import GraphQLError
+from graphql.validation import validate
+
+from projects.loaders import AsyncRequestLoaders, RequestLoaders
+from projects.models import Organization
+from projects.org_data import CONTENT_TYPES, FORMATS, export_records, serialize
+from projects.org_cache import org_cache
+from projects.query_cost import check_query_cost
+from projects.response_cache import (
+    get_cached_response,
+    response_cache_key,
+    response_cache_stats,
+    set_cached_response,
+)
+from projects.schema import get_request_org
+
+from .db_router import pin_to_primary, read_from, replica_for_query
+from .response_encoding import dumps, encode_response
+from .tracing import TracingMiddleware
+
+
+# --------------------
+# Parsed/validated document cache (also the APQ store)
+# --------------------
+
+
+class DocumentCache:
+    """
+    LRU of sha256(query) -> (DocumentNode, validation errors).
+    - Repeat queries skip parse + validate
+    - Automatic persisted queries look documents up by the same hash
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+document_cache = DocumentCache(max_size=getattr(settings, "GRAPHQL_DOCUMENT_CACHE_SIZE", 512))
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+# Error shapes Apollo's persisted-queries link understands
+PERSISTED_QUERY_NOT_FOUND = GraphQLError(
+    "PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"}
+)
+PERSISTED_QUERY_HASH_MISMATCH = GraphQLError(
+    "provided sha does not match query", extensions={"code": "INTERNAL_SERVER_ERROR"}
+)
+
+
+# --------------------
+# GraphQL endpoint
+# --------------------
+
+
+class PMGraphQLView(GraphQLView):
+    """
+    GraphQLView with:
+    - Apollo-compatible automatic persisted queries
+      (extensions.persistedQuery.sha256Hash, query text optional once registered)
+    - parse/validate skipped for documents already in document_cache
+    - query responses cached per organization version (projects/response_cache.py)
+    - depth/cost limits checked before execution (projects/query_cost.py),
+      the computed cost reported in the response extensions
+    - resolver timings when GraphQLTracingMiddleware traces the request (tracing.py)
+    - query operations read from the replica, mutations pin the organization
+      to the primary for a few seconds (db_router.py)
+    - faster JSON encoding, gzip/brotli bodies and ETag/304 for queries
+      (response_encoding.py)
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        return encode_response(request, super().dispatch(request, *args, **kwargs))
+
+    def json_encode(self, request, d, pretty=False):
+        if self.pretty or pretty or request.GET.get("pretty"):
+            return super().json_encode(request, d, pretty=True)
+        return dumps(d)
+
+    def get_middleware(self, request):
+        tracer = getattr(request, "graphql_tracer", None)
+        if tracer is None or not tracer.trace_resolvers:
+            return self.middleware
+        return [TracingMiddleware(tracer), *(self.middleware or [])]
+
+    @staticmethod
+    def get_persisted_query_hash(request, data):
+        extensions = request.GET.get("extensions") or data.get("extensions")
+        if not extensions:
+            return None
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                raise HttpError(HttpResponseBadRequest("Extensions are invalid JSON."))
+        persisted = extensions.get("persistedQuery") or {}
+        return persisted.get("sha256Hash")
+
+    def get_document(self, request, data, query):
+        """
+        Returns (document, errors) for this request, from cache when possible.
+        Records the document hash on request.query_hash.
+        """
+        persisted_hash = self.get_persisted_query_hash(request, data)
+
+        memo = getattr(request, "_graphql_document", None)
+        if memo is not None and memo[0] == (query, persisted_hash):
+            return memo[1]
+        entry = self._get_document(request, query, persisted_hash)
+        request._graphql_document = ((query, persisted_hash), entry)
+        return entry
+
+    def _get_document(self, request, query, persisted_hash):
+
+        if not query:
+            entry = document_cache.get(persisted_hash)
+            if entry is None:
+                return None, [PERSISTED_QUERY_NOT_FOUND]
+            request.query_hash = persisted_hash
+            return entry
+
+        digest = query_hash(query)
+        if persisted_hash and persisted_hash != digest:
+            return None, [PERSISTED_QUERY_HASH_MISMATCH]
+
+        request.query_hash = digest
+        entry = document_cache.get(digest)
+        if entry is None:
+            try:
+                document = parse(query)
+            except GraphQLError as e:
+                # Syntax errors are not cached; they never reach a persisted hash
+                return None, [e]
+            errors = validate(
+                self.schema.graphql_schema,
+                document,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+            entry = (document, errors)
+            document_cache.set(digest, entry)
+        return entry
+
+    def get_response_cache_key(self, request, data, query, variables, operation_name):
+        """Cache key for read-only operations, None when the response must not be cached."""
+        if not settings.GRAPHQL_RESPONSE_CACHE_ENABLED or self.batch:
+            return None
+        tracer = getattr(request, "graphql_tracer", None)
+        if tracer is not None and tracer.trace_resolvers:
+            # Traced requests execute, so the trace shows real resolver timings
+            return None
+        if not query and not self.get_persisted_query_hash(request, data):
+            return None
+
+        document, errors = self.get_document(request, data, query)
+        if document is None or errors:
+            return None
+        operation_ast = get_operation_ast(document, operation_name)
+        if operation_ast is None or operation_ast.operation != OperationType.QUERY:
+            return None
+
+        try:
+            org = get_request_org(request)
+        except Exception:
+            # Let execution report the tenant error
+            return None
+        return response_cache_key(org.pk, request.query_hash, variables, operation_name)
+
+    def get_operation_type(self, request, data, query, operation_name):
+        if not query and not self.get_persisted_query_hash(request, data):
+            return None
+        document, errors = self.get_document(request, data, query)
+        if document is None or errors:
+            return None
+        operation_ast = get_operation_ast(document, operation_name)
+        return operation_ast.operation if operation_ast is not None else None
+
+    def prepare_routing(self, request, data, query, operation_name):
+        """Sets request.read_alias and request.graphql_operation (see db_router.py)."""
+        operation = self.get_operation_type(request, data, query, operation_name)
+        request.graphql_operation = operation
+        request.read_alias = None
+        if operation == OperationType.QUERY:
+            try:
+                request.read_alias = replica_for_query(get_request_org(request).pk)
+            except Exception:
+                # Execution reports the tenant error
+                pass
+
+    def pin_after_write(self, request):
+        org = getattr(request, "organization", None)
+        if request.graphql_operation == OperationType.MUTATION and org is not None:
+            pin_to_primary(org.pk)
+
+    def get_response(self, request, data, show_graphiql=False):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        self.prepare_routing(request, data, query, operation_name)
+
+        cache_key = None
+        if not show_graphiql:
+            cache_key = self.get_response_cache_key(
+                request, data, query, variables, operation_name
+            )
+            if cache_key is not None:
+                cached = get_cached_response(cache_key)
+                if cached is not None:
+                    return cached, 200
+
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        self.pin_after_write(request)
+
+        result, status_code = self.build_response(request, execution_result, id, show_graphiql)
+        if cache_key is not None and execution_result and not execution_result.errors:
+            set_cached_response(cache_key, result)
+        return result, status_code
+
+    def build_response(self, request, execution_result, id, show_graphiql=False):
+        """Serialize an ExecutionResult the way GraphQLView.get_response does."""
+        if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+            set_rollback()
+
+        status_code = 200
+        if execution_result:
+            response = {}
+
+            if execution_result.errors:
+                set_rollback()
+                response["errors"] = [
+                    self.format_error(e) for e in execution_result.errors
+                ]
+
+            if execution_result.errors and any(
+                not getattr(e, "path", None) for e in execution_result.errors
+            ):
+                status_code = 400
+            else:
+                response["data"] = execution_result.data
+
+            query_cost = getattr(request, "query_cost", None)
+            if query_cost is not None:
+                response["extensions"] = {"cost": query_cost}
+
+            if self.batch:
+                response["id"] = id
+                response["status"] = status_code
+
+            result = self.json_encode(request, response, pretty=show_graphiql)
+        else:
+            result = None
+
+        return result, status_code
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        request.query_cost = None
+        if not query and not self.get_persisted_query_hash(request, data):
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        document, errors = self.get_document(request, data, query)
+        if document is None or errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        operation_ast = get_operation_ast(document, operation_name)
+
+        tracer = getattr(request, "graphql_tracer", None)
+        if tracer is not None and operation_ast is not None:
+            tracer.operation_name = operation_ast.name.value if operation_ast.name else None
+
+        if (
+            request.method.lower() == "get"
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["POST"],
+                    "Can only perform a {} operation from a POST request.".format(
+                        operation_ast.operation.value
+                    ),
+                )
+            )
+
+        if operation_ast is not None and operation_ast.operation == OperationType.SUBSCRIPTION:
+            return ExecutionResult(
+                data=None,
+                errors=[GraphQLError("Subscriptions are served over WebSockets (graphql-transport-ws).")],
+            )
+
+        if operation_ast is not None:
+            error = self.check_query_cost(request, document, operation_ast, variables)
+            if error is not None:
+                return ExecutionResult(data=None, errors=[error])
+
+        with read_from(getattr(request, "read_alias", None)):
+            return self.execute_document(
+                request, document, operation_ast, variables, operation_name
+            )
+
+    def check_query_cost(self, request, document, operation_ast, variables):
+        """Records request.query_cost; returns a GraphQLError if over the org's limits."""
+        try:
+            org = get_request_org(request)
+        except Exception:
+            # Default limits; execution reports the tenant error
+            org = None
+        request.query_cost, error = check_query_cost(
+            self.schema.graphql_schema, document, operation_ast, variables, org
+        )
+        return error
+
+    def execute_document(self, request, document, operation_ast, variables, operation_name):
+        # Same execution path as GraphQLView, minus parse/validate
+        schema = self.schema.graphql_schema
+        try:
+            execute_options = {
+                "root_value": self.get_root_value(request),
+                "context_value": self.get_context(request),
+                "variable_values": variables,
+                "operation_name": operation_name,
+                "middleware": self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                execute_options["execution_context_class"] = self.execution_context_class
+
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            return execute(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+
+class AsyncGraphQLView(PMGraphQLView):
+    """
+    PMGraphQLView for the ASGI application, used with pm_backend.schema.async_schema:
+    - query resolvers and nested loaders use the async ORM on the event loop;
+      independent root fields run concurrently
+    - mutation operations run the sync execution path in one worker thread,
+      ATOMIC_MUTATIONS included (Django has no async transactions)
+    - cache/tenant lookups run through sync_to_async
+    - GraphiQL is rendered by the sync view
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            if request.method.lower() not in ("get", "post"):
+                raise HttpError(
+                    HttpResponseNotAllowed(
+                        ["GET", "POST"], "GraphQL only supports GET and POST requests."
+                    )
+                )
+
+            data = self.parse_body(request)
+            if self.graphiql and self.can_display_graphiql(request, data):
+                return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+            request.loaders = AsyncRequestLoaders()
+            if self.batch:
+                responses = [await self.aget_response(request, entry) for entry in data]
+                result = "[{}]".format(",".join([response[0] for response in responses]))
+                status_code = max((response[1] for response in responses), default=200)
+            else:
+                result, status_code = await self.aget_response(request, data)
+
+            return encode_response(
+                request, HttpResponse(status=status_code, content=result, content_type="application/json")
+            )
+
+        except HttpError as e:
+            response = e.response
+            response["Content-Type"] = "application/json"
+            response.content = self.json_encode(request, {"errors": [self.format_error(e)]})
+            return response
+
+    def get_cached_lookup(self, request, data, query, variables, operation_name):
+        try:
+            # Memoized on the request for the cost limits and the resolvers
+            get_request_org(request)
+        except Exception:
+            pass
+        self.prepare_routing(request, data, query, operation_name)
+        cache_key = self.get_response_cache_key(request, data, query, variables, operation_name)
+        if cache_key is None:
+            return None, None
+        return cache_key, get_cached_response(cache_key)
+
+    async def aget_response(self, request, data):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        cache_key, cached = await sync_to_async(self.get_cached_lookup)(
+            request, data, query, variables, operation_name
+        )
+        if cached is not None:
+            return cached, 200
+
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name
+        )
+        if isawaitable(execution_result):
+            try:
+                # Async resolvers run here, not inside execute_graphql_request
+                with read_from(request.read_alias):
+                    execution_result = await execution_result
+            except Exception as e:
+                execution_result = ExecutionResult(errors=[e])
+        await sync_to_async(self.pin_after_write)(request)
+
+        result, status_code = self.build_response(request, execution_result, id)
+        if cache_key is not None and execution_result and not execution_result.errors:
+            await sync_to_async(set_cached_response)(cache_key, result)
+        return result, status_code
+
+    def execute_document(self, request, document, operation_ast, variables, operation_name):
+        if operation_ast is not None and operation_ast.operation == OperationType.MUTATION:
+            # Sync loaders: the whole operation, nested fields too, runs in the thread
+            request.loaders = RequestLoaders()
+            return sync_to_async(super().execute_document)(
+                request, document, operation_ast, variables, operation_name
+            )
+
+        execute_options = {
+            "root_value": self.get_root_value(request),
+            "context_value": self.get_context(request),
+            "variable_values": variables,
+            "operation_name": operation_name,
+            "middleware": self.get_middleware(request),
+        }
+        if self.execution_context_class:
+            execute_options["execution_context_class"] = self.execution_context_class
+        try:
+            return execute(self.schema.graphql_schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+
+def cache_stats(request):
+    """
+    Process-local cache counters for load testing.
+    Only served with DEBUG=True since it exposes internals.
+    """
+    if not settings.DEBUG:
+        raise Http404
+    return JsonResponse(
+        {
+            "org_cache": org_cache.stats(),
+            "document_cache": document_cache.stats(),
+            "response_cache": response_cache_stats.stats(),
+        }
+    )
+
+
+def export_org_data(request):
+    """
+    Streams an organization's projects, tasks and comments as NDJSON
+    (default) or CSV (?format=csv), for staff users only.
+    - organization from X-ORG-SLUG, or ?org= for browser downloads
+    - rows are read in chunks, so memory stays flat on large tenants
+    - under ASGI the lines are handed over one at a time (see _aiter_lines)
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required."}, status=401)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Staff access required."}, status=403)
+
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return JsonResponse({"error": f"format must be one of {', '.join(FORMATS)}."}, status=400)
+    slug = request.META.get("HTTP_X_ORG_SLUG") or request.GET.get("org")
+    org = Organization.objects.filter(slug=slug).first() if slug else None
+    if org is None:
+        raise Http404("Organization not found.")
+
+    lines = serialize(export_records(org), fmt)
+    if isinstance(request, ASGIRequest):
+        lines = _aiter_lines(lines)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{org.slug}.{fmt}"'
+    return response
+
+
+async def _aiter_lines(lines):
+    """
+    Async iterator over a sync generator, one next() per line in the
+    thread-sensitive executor (the generator's DB cursor stays on one thread).
+    Django 4.2 would otherwise list() a sync iterator before sending it
+    under ASGI, holding the whole export in memory.
+    """
+    done = object()
+    while (line := await sync_to_async(next)(lines, done)) is not done:
+        yield line
@@ -0,0 +1,219 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from graphene_django.settings import graphene_settings
+from graphql import ExecutionResult, GraphQLError, OperationType, get_operation_ast, parse, subscribe
+from graphql.validation import validate
+
+from projects.async_schema import aget_request_org
+from projects.query_cost import check_query_cost
+
+from .views import document_cache, query_hash
+
+
+# --------------------
+# GraphQL subscriptions over WebSockets (ASGI)
+# --------------------
+# Speaks graphql-transport-ws, the protocol of the graphql-ws client
+# (https://github.com/enisdenjo/graphql-ws/blob/master/PROTOCOL.md):
+# connection_init (payload {"orgSlug": ...} or the X-Org-Slug handshake
+# header) -> connection_ack, then any number of subscribe/complete pairs.
+# Queries and mutations stay on POST /graphql/.
+
+PROTOCOL = "graphql-transport-ws"
+
+
+class CloseConnection(Exception):
+    def __init__(self, code, reason):
+        super().__init__(reason)
+        self.code = code
+        self.reason = reason
+
+
+class SubscriptionContext:
+    """info.context of one subscription: the parts of a request resolvers read."""
+
+    def __init__(self, meta, organization):
+        self.META = meta
+        self.organization = organization
+        self.loaders = None
+
+
+def _handshake_meta(scope):
+    meta = {}
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin1").upper().replace("-", "_")
+        meta[key if key in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{key}"] = value.decode("latin1")
+    return meta
+
+
+def _format_errors(errors):
+    return [error.formatted if isinstance(error, GraphQLError) else {"message": str(error)} for error in errors]
+
+
+class GraphQLWebSocket:
+    """One WebSocket connection; each subscription runs in its own task."""
+
+    def __init__(self, schema, scope, receive, send):
+        self.schema = schema
+        self.scope = scope
+        self.receive = receive
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self.meta = _handshake_meta(scope)
+        self.organization = None
+        self.operations = {}
+
+    async def send(self, message):
+        async with self._send_lock:
+            await self._send(message)
+
+    async def send_json(self, message):
+        await self.send({"type": "websocket.send", "text": json.dumps(message, cls=DjangoJSONEncoder)})
+
+    async def run(self):
+        if (await self.receive())["type"] != "websocket.connect":
+            return
+        if PROTOCOL not in self.scope.get("subprotocols", []):
+            await self.send({"type": "websocket.close", "code": 4406})
+            return
+        await self.send({"type": "websocket.accept", "subprotocol": PROTOCOL})
+
+        try:
+            while True:
+                timeout = None if self.organization else settings.GRAPHQL_WS_INIT_TIMEOUT
+                try:
+                    message = await asyncio.wait_for(self.receive(), timeout)
+                except asyncio.TimeoutError:
+                    raise CloseConnection(4408, "Connection initialisation timeout")
+                if message["type"] == "websocket.disconnect":
+                    return
+                await self.handle(message.get("text") or (message.get("bytes") or b"").decode())
+        except CloseConnection as e:
+            await self.send({"type": "websocket.close", "code": e.code, "reason": e.reason})
+        finally:
+            for task in self.operations.values():
+                task.cancel()
+
+    async def handle(self, text):
+        try:
+            message = json.loads(text)
+            kind = message["type"]
+        except (ValueError, TypeError, KeyError):
+            raise CloseConnection(4400, "Invalid message")
+
+        if kind == "connection_init":
+            await self.init(message.get("payload") or {})
+        elif kind == "ping":
+            await self.send_json({"type": "pong"})
+        elif kind == "pong":
+            pass
+        elif kind == "subscribe":
+            if self.organization is None:
+                raise CloseConnection(4401, "Unauthorized")
+            id = message.get("id")
+            if not isinstance(id, str) or not isinstance(message.get("payload"), dict):
+                raise CloseConnection(4400, "Invalid message")
+            if id in self.operations:
+                raise CloseConnection(4409, f"Subscriber for {id} already exists")
+            self.operations[id] = asyncio.create_task(self.run_operation(id, message["payload"]))
+        elif kind == "complete":
+            task = self.operations.pop(message.get("id"), None)
+            if task is not None:
+                task.cancel()
+        else:
+            raise CloseConnection(4400, "Invalid message")
+
+    async def init(self, payload):
+        if self.organization is not None:
+            raise CloseConnection(4429, "Too many initialisation requests")
+        meta = dict(self.meta)
+        if payload.get("orgSlug"):
+            meta["HTTP_X_ORG_SLUG"] = payload["orgSlug"]
+        try:
+            self.organization = await aget_request_org(SubscriptionContext(meta, None))
+        except Exception:
+            raise CloseConnection(4403, "Forbidden")
+        self.meta = meta
+        await self.send_json({"type": "connection_ack"})
+
+    def get_document(self, query):
+        """(document, errors), sharing the HTTP view's parsed document cache."""
+        digest = query_hash(query)
+        entry = document_cache.get(digest)
+        if entry is None:
+            try:
+                document = parse(query)
+            except GraphQLError as e:
+                return None, [e]
+            errors = validate(
+                self.schema.graphql_schema, document, max_errors=graphene_settings.MAX_VALIDATION_ERRORS
+            )
+            entry = (document, errors)
+            document_cache.set(digest, entry)
+        return entry
+
+    async def run_operation(self, id, payload):
+        try:
+            result = await self.start(payload)
+            if isinstance(result, ExecutionResult):
+                await self.send_json({"id": id, "type": "error", "payload": _format_errors(result.errors)})
+                return
+            try:
+                async for event in result:
+                    await self.send_json({"id": id, "type": "next", "payload": event.formatted})
+            except Exception as e:
+                await self.send_json({"id": id, "type": "error", "payload": _format_errors([e])})
+                return
+            finally:
+                await result.aclose()
+            await self.send_json({"id": id, "type": "complete"})
+        finally:
+            if self.operations.get(id) is asyncio.current_task():
+                del self.operations[id]
+
+    async def start(self, payload):
+        """The event stream, or an ExecutionResult with the errors that prevented it."""
+        document, errors = self.get_document(payload.get("query") or "")
+        if document is None or errors:
+            return ExecutionResult(errors=errors)
+
+        variables = payload.get("variables")
+        operation_name = payload.get("operationName")
+        operation_ast = get_operation_ast(document, operation_name)
+        if operation_ast is None or operation_ast.operation != OperationType.SUBSCRIPTION:
+            return ExecutionResult(
+                errors=[GraphQLError("Only subscriptions are served over WebSockets; POST other operations.")]
+            )
+        _, error = check_query_cost(
+            self.schema.graphql_schema, document, operation_ast, variables, self.organization
+        )
+        if error is not None:
+            return ExecutionResult(errors=[error])
+
+        return await subscribe(
+            self.schema.graphql_schema,
+            document,
+            context_value=SubscriptionContext(self.meta, self.organization),
+            variable_values=variables,
+            operation_name=operation_name,
+        )
+
+
+def websocket_router(http_application, path="/graphql/"):
+    """ASGI app: WebSockets on `path` get GraphQL subscriptions, HTTP goes to Django."""
+    from pm_backend.schema import async_schema
+
+    async def application(scope, receive, send):
+        if scope["type"] != "websocket":
+            return await http_application(scope, receive, send)
+        if scope["path"] != path:
+            await receive()
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        await GraphQLWebSocket(async_schema, scope, receive, send).run()
+
+    return application
+
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Organization, Project, Task, TaskComment
+from .models import Organization, Project, ProjectPurgeJob, Task, TaskComment
 
 
 @admin.register(Organization)
@@ -10,7 +10,16 @@ class OrganizationAdmin(admin.ModelAdmin):
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ("name", "organization", "status", "due_date", "created_at")
+    list_display = (
+        "name",
+        "organization",
+        "status",
+        "task_count",
+        "done_count",
+        "due_date",
+        "created_at",
+        "deleted_at",
+    )
     list_filter = ("status", "organization")
     search_fields = ("name", "description")
 
@@ -26,3 +35,19 @@ class TaskAdmin(admin.ModelAdmin):
 class TaskCommentAdmin(admin.ModelAdmin):
     list_display = ("task", "author_email", "created_at")
     search_fields = ("content", "author_email")
+
+
+@admin.register(ProjectPurgeJob)
+class ProjectPurgeJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "project_id",
+        "organization_id",
+        "status",
+        "stage",
+        "comments_deleted",
+        "tasks_deleted",
+        "attempts",
+        "updated_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = [field.name for field in ProjectPurgeJob._meta.fields]
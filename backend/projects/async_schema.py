@@ -0,0 +1,171 @@
+from asgiref.sync import sync_to_async
+
+from .changes import DEFAULT_CHANGES_LIMIT, changes_since
+from .loaders import get_loaders, only_columns
+from .models import Project, Task, TaskComment
+from .pagination import apaginate
+from .search import search
+from .stats import DEFAULT_WEEKS, get_org_stats
+from .schema import (
+    ProjectConnection,
+    Query,
+    SearchConnection,
+    TaskConnection,
+    filter_projects,
+    filter_tasks,
+    get_request_org,
+    select_project_fields,
+    select_task_fields,
+)
+
+
+# --------------------
+# Async form of projects/schema.py, served by the ASGI view.
+# Same fields, arguments and type names; root resolvers use Django's async
+# ORM over the shared querysets (filter_*/select_*_fields), so graphql-core
+# runs independent root fields concurrently. Mutations have no async form:
+# the ASGI view runs them through the sync path in a worker thread
+# (AsyncGraphQLView.execute_document).
+# --------------------
+
+
+async def aget_request_org(request):
+    org = getattr(request, "organization", None)
+    if org is None:
+        org = await sync_to_async(get_request_org)(request)
+    return org
+
+
+# --------------------
+# Queries
+# --------------------
+
+
+class AsyncQuery(Query):
+    class Meta:
+        name = "Query"
+
+    # ----- Project resolvers -----
+
+    async def resolve_projects(self, info, status=None):
+        org = await aget_request_org(info.context)
+
+        qs = select_project_fields(filter_projects(org, status), info)
+
+        projects = [project async for project in qs]
+        get_loaders(info).add_projects(projects)
+        return projects
+
+    async def resolve_project(self, info, id):
+        org = await aget_request_org(info.context)
+
+        qs = select_project_fields(Project.objects.visible(), info)
+
+        project = await qs.aget(
+            pk=id,
+            organization=org,
+        )
+        get_loaders(info).add_projects([project])
+        return project
+
+    async def resolve_projects_connection(
+        self, info, status=None, first=None, after=None, last=None, before=None
+    ):
+        org = await aget_request_org(info.context)
+
+        qs = filter_projects(org, status)
+
+        page_qs = select_project_fields(qs, info)
+        projects, page_info = await apaginate(page_qs, first, after, last, before)
+        get_loaders(info).add_projects(projects)
+        return ProjectConnection.from_queryset(qs, projects, page_info)
+
+    # ----- Task resolvers -----
+
+    async def resolve_tasks(self, info, project_id=None, status=None):
+        org = await aget_request_org(info.context)
+
+        qs = select_task_fields(filter_tasks(org, project_id, status), info)
+
+        tasks = [task async for task in qs]
+        get_loaders(info).add_tasks(tasks)
+        return tasks
+
+    async def resolve_task(self, info, id):
+        org = await aget_request_org(info.context)
+
+        task = await select_task_fields(Task.objects.visible(), info).aget(
+            pk=id,
+            organization=org,
+        )
+        get_loaders(info).add_tasks([task])
+        return task
+
+    async def resolve_tasks_connection(
+        self,
+        info,
+        project_id=None,
+        status=None,
+        first=None,
+        after=None,
+        last=None,
+        before=None,
+    ):
+        org = await aget_request_org(info.context)
+
+        qs = filter_tasks(org, project_id, status)
+
+        page_qs = select_task_fields(qs, info)
+        tasks, page_info = await apaginate(page_qs, first, after, last, before)
+        get_loaders(info).add_tasks(tasks)
+        return TaskConnection.from_queryset(qs, tasks, page_info)
+
+    # ----- Stats resolver -----
+
+    async def resolve_org_stats(self, info, weeks=DEFAULT_WEEKS):
+        org = await aget_request_org(info.context)
+
+        # A handful of aggregate queries plus the cache: run them in one thread
+        return await sync_to_async(get_org_stats)(org, weeks)
+
+    # ----- Sync resolver -----
+
+    async def resolve_changes_since(self, info, cursor=None, limit=DEFAULT_CHANGES_LIMIT):
+        org = await aget_request_org(info.context)
+
+        loaders = get_loaders(info)
+        # The log page and up to three row queries, in one thread
+        changes = await sync_to_async(changes_since)(
+            org,
+            cursor,
+            limit,
+            projects=select_project_fields(Project.objects.all(), info),
+            tasks=select_task_fields(Task.objects.all(), info),
+            comments=only_columns(TaskComment.objects.all(), loaders.columns),
+        )
+        loaders.add_projects(changes["projects"])
+        loaders.add_tasks(changes["tasks"])
+        return changes
+
+    # ----- Search resolver -----
+
+    async def resolve_search(
+        self,
+        info,
+        query,
+        project_id=None,
+        status=None,
+        first=None,
+        after=None,
+        last=None,
+        before=None,
+    ):
+        org = await aget_request_org(info.context)
+
+        if last is not None or before:
+            raise Exception("Search results only page forward (first/after).")
+
+        # Raw SQL cursor: no async interface in Django 4.2
+        hits, page_info = await sync_to_async(search)(org, query, project_id, status, first, after)
+        get_loaders(info).add_tasks(hit["task"] for hit in hits)
+        return SearchConnection.from_hits(hits, page_info)
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------
+# Pub/sub behind GraphQL subscriptions (see subscriptions.py)
+# --------------------
+# Mutations publish after their transaction commits; every subscription
+# reads one channel. Channel names start with the organization id, so
+# fan-out never crosses tenants.
+# The broker class is the GRAPHQL_SUBSCRIPTION_BROKER setting. The in-memory
+# broker only reaches subscribers in this process (single node, tests); more
+# than one ASGI process needs a broker backed by e.g. Redis pub/sub.
+
+
+def task_channel(org_id, project_id):
+    return f"org:{org_id}:project:{project_id}:tasks"
+
+
+def comment_channel(org_id, task_id):
+    return f"org:{org_id}:task:{task_id}:comments"
+
+
+def model_payload(instance):
+    """Column values of a saved row: subscribers rebuild it without a query."""
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+class Broker:
+    """
+    Interface:
+    - publish(channel, payload) may be called from any thread
+    - subscribe(channel) is an async iterator of the payloads published
+      after it started; closing it unsubscribes
+    """
+
+    def publish(self, channel, payload):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """
+    Fan-out to asyncio queues in this process.
+    - publish() wakes each subscribed event loop once per payload, however
+      many of its subscribers are on the channel
+    - a subscriber more than queue_size payloads behind loses the oldest
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or settings.GRAPHQL_SUBSCRIPTION_QUEUE_SIZE
+        self._lock = threading.Lock()
+        # channel -> event loop -> subscriber queues
+        self._channels = defaultdict(lambda: defaultdict(set))
+
+    def publish(self, channel, payload):
+        """Returns the number of subscribers the payload was handed to."""
+        with self._lock:
+            loops = {loop: list(queues) for loop, queues in self._channels.get(channel, {}).items()}
+        for loop, queues in loops.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, queues, payload)
+            except RuntimeError:
+                # Loop closed under a subscriber that did not unsubscribe
+                pass
+        return sum(len(queues) for queues in loops.values())
+
+    def _deliver(self, queues, payload):
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            channels = [self._channels.get(channel, {})] if channel else list(self._channels.values())
+            return sum(len(queues) for loops in channels for queues in loops.values())
+
+    async def subscribe(self, channel):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._channels[channel][loop].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            with self._lock:
+                loops = self._channels.get(channel, {})
+                loops.get(loop, set()).discard(queue)
+                if not loops.get(loop):
+                    loops.pop(loop, None)
+                if not loops:
+                    self._channels.pop(channel, None)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.GRAPHQL_SUBSCRIPTION_BROKER)()
+        return _broker
+
+
+def publish_on_commit(messages):
+    """
+    Publishes [(channel, payload)] once the current transaction commits
+    (at once outside a transaction). A broker error never fails the write.
+    messages may be a callable returning them, to read rows after the commit.
+    """
+    if not callable(messages):
+        messages = list(messages)
+        if not messages:
+            return
+
+    def publish():
+        broker = get_broker()
+        for channel, payload in messages() if callable(messages) else messages:
+            try:
+                broker.publish(channel, payload)
+            except Exception:
+                logger.exception("Publishing to %s failed", channel)
+
+    transaction.on_commit(publish)
+
+
+def publish_tasks_changed(org_id, tasks):
+    publish_on_commit((task_channel(org_id, task.project_id), model_payload(task)) for task in tasks)
+
+
+def publish_tasks_changed_by_id(org_id, task_ids):
+    """For bulk UPDATEs, which leave no instances: one SELECT after the commit."""
+    if task_ids:
+        publish_on_commit(
+            lambda: [
+                (task_channel(org_id, task.project_id), model_payload(task))
+                for task in Task.objects.filter(pk__in=task_ids)
+            ]
+        )
+
+
+def publish_comment_added(org_id, comment):
+    publish_on_commit([(comment_channel(org_id, comment.task_id), model_payload(comment))])
@@ -0,0 +1,339 @@
+from collections import defaultdict
+from functools import partial
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count
+from graphene.utils.dataloader import DataLoader as AsyncDataLoader
+from graphene.utils.str_converters import to_snake_case
+
+from .models import Organization, Project, Task, TaskComment
+from .pagination import page_per_group
+from .selection import get_selected_fields_by_type
+
+
+# --------------------
+# Column projection (only() from the selection set)
+# --------------------
+
+# GraphQL type -> model its rows come from
+TYPE_MODELS = {"ProjectType": Project, "TaskType": Task, "TaskCommentType": TaskComment}
+
+# Fields that are not model fields, and the columns their resolvers read
+COMPUTED_FIELD_COLUMNS = {
+    "ProjectType": {
+        "taskCount": ("task_count",),
+        "completedTasks": ("done_count",),
+        "statusBreakdown": ("todo_count", "in_progress_count", "done_count"),
+    },
+    "TaskType": {"commentCount": ()},
+    "TaskCommentType": {"cursor": ("created_at",)},
+}
+
+# Always loaded: loader keys and the keyset cursor column (pk is implicit)
+REQUIRED_COLUMNS = {
+    Project: ("organization", "created_at"),
+    Task: ("project", "created_at"),
+    TaskComment: ("task", "created_at"),
+}
+
+
+def selected_columns(info):
+    """
+    Model -> field names for only(), from the fields selected on the
+    model's type anywhere in the operation:
+    - one projection per model, since loaders share rows between positions
+      (a project from projects { } is reused by task { project { } })
+    - None (every column) if a selected field is neither a model field nor
+      listed in COMPUTED_FIELD_COLUMNS
+    """
+    selected = get_selected_fields_by_type(info)
+    columns = {}
+    for type_name, model in TYPE_MODELS.items():
+        names = set(REQUIRED_COLUMNS[model])
+        computed = COMPUTED_FIELD_COLUMNS.get(type_name, {})
+        for field_name in selected.get(type_name, ()):
+            if field_name in computed:
+                names.update(computed[field_name])
+                continue
+            try:
+                field = model._meta.get_field(to_snake_case(field_name))
+            except FieldDoesNotExist:
+                names = None
+                break
+            if field.concrete:
+                names.add(field.name)
+        columns[model] = None if names is None else sorted(names)
+    return columns
+
+
+def only_columns(qs, columns):
+    """Applies the projection of qs's model (None: every column)."""
+    names = (columns or {}).get(qs.model)
+    if names is None:
+        return qs
+    return qs.only(*names)
+
+
+# --------------------
+# Per-request batching
+# --------------------
+
+
+class DataLoader:
+    """
+    Synchronous DataLoader:
+    - Keys are queued as soon as their parent rows are known
+    - The first load() flushes every queued key in one batch call
+    - Results are cached for the rest of the request
+    """
+
+    def __init__(self, batch_load_fn, default=None):
+        self.batch_load_fn = batch_load_fn
+        self.default = default
+        self._cache = {}
+        self._queue = []
+
+    def queue(self, keys):
+        self._queue.extend(key for key in keys if key not in self._cache)
+
+    def prime(self, key, value):
+        self._cache.setdefault(key, value)
+
+    def load(self, key):
+        if key not in self._cache:
+            keys = list(dict.fromkeys(
+                k for k in [key, *self._queue] if k not in self._cache
+            ))
+            self._queue = []
+            results = self.batch_load_fn(keys)
+            for k in keys:
+                self._cache[k] = results.get(k, self._default_value())
+        return self._cache[key]
+
+    def clear(self):
+        self._cache = {}
+        self._queue = []
+
+    def _default_value(self):
+        return self.default() if callable(self.default) else self.default
+
+
+class RequestLoaders:
+    """
+    One set of loaders per request. Each loader primes the next level
+    (tasks -> comments, comments -> task) so siblings share one query.
+    """
+
+    def __init__(self):
+        # Set from the operation by get_loaders()
+        self.columns = None
+        self.organization_by_id = DataLoader(self._load_organizations)
+        self.project_by_id = DataLoader(self._load_projects)
+        self.task_by_id = DataLoader(self._load_tasks)
+        self.tasks_by_project = DataLoader(self._load_tasks_by_project, default=list)
+        self.comment_count_by_task = DataLoader(self._load_comment_counts, default=0)
+        # (first, after) -> loader of that comment page, see comments_page()
+        self.comment_pages = {}
+        self._task_ids = {}
+
+    def clear(self):
+        for loader in (
+            self.organization_by_id,
+            self.project_by_id,
+            self.task_by_id,
+            self.tasks_by_project,
+            self.comment_count_by_task,
+        ):
+            loader.clear()
+        self.comment_pages = {}
+        self._task_ids = {}
+
+    def comments_page(self, first=None, after=None):
+        """
+        Loader of the comment page with these arguments, keyed by task id.
+        Starts with every task seen so far queued, so one windowed query
+        serves the whole list of tasks.
+        """
+        key = (first, after)
+        if key not in self.comment_pages:
+            loader = DataLoader(partial(self._load_comment_page, first=first, after=after), default=list)
+            loader.queue(self._task_ids)
+            self.comment_pages[key] = loader
+        return self.comment_pages[key]
+
+    # ----- priming helpers (called by root resolvers) -----
+
+    def add_projects(self, projects):
+        projects = list(projects)
+        for project in projects:
+            self.project_by_id.prime(project.pk, project)
+            if Project.organization.is_cached(project):
+                self.organization_by_id.prime(project.organization_id, project.organization)
+        self.tasks_by_project.queue(project.pk for project in projects)
+        self.organization_by_id.queue(project.organization_id for project in projects)
+
+    def add_tasks(self, tasks):
+        tasks = list(tasks)
+        self.add_projects(
+            {task.project_id: task.project for task in tasks if Task.project.is_cached(task)}.values()
+        )
+        for task in tasks:
+            self.task_by_id.prime(task.pk, task)
+        task_ids = [task.pk for task in tasks]
+        self._task_ids.update(dict.fromkeys(task_ids))
+        for loader in self.comment_pages.values():
+            loader.queue(task_ids)
+        self.comment_count_by_task.queue(task_ids)
+        self.project_by_id.queue(task.project_id for task in tasks)
+
+    # ----- batch functions -----
+
+    def _load_organizations(self, ids):
+        return Organization.objects.in_bulk(ids)
+
+    def _load_projects(self, ids):
+        projects = only_columns(Project.objects.all(), self.columns).in_bulk(ids)
+        self.add_projects(projects.values())
+        return projects
+
+    def _load_tasks(self, ids):
+        tasks = only_columns(Task.objects.all(), self.columns).in_bulk(ids)
+        self.add_tasks(tasks.values())
+        return tasks
+
+    def _load_tasks_by_project(self, project_ids):
+        grouped = defaultdict(list)
+        tasks = list(only_columns(Task.objects.filter(project_id__in=project_ids), self.columns))
+        for task in tasks:
+            grouped[task.project_id].append(task)
+        self.add_tasks(tasks)
+        return grouped
+
+    def _load_comment_page(self, task_ids, first, after):
+        grouped = defaultdict(list)
+        qs = page_per_group(
+            only_columns(TaskComment.objects.filter(task_id__in=task_ids), self.columns),
+            "task_id",
+            first,
+            after,
+        )
+        for comment in qs:
+            grouped[comment.task_id].append(comment)
+        for comments in grouped.values():
+            # Newest `first` comments, shown oldest first
+            comments.reverse()
+        return grouped
+
+    def _load_comment_counts(self, task_ids):
+        return dict(
+            TaskComment.objects.filter(task_id__in=task_ids)
+            .order_by()
+            .values("task_id")
+            .annotate(count=Count("pk"))
+            .values_list("task_id", "count")
+        )
+
+
+class AsyncRequestLoaders:
+    """
+    Async counterpart used by the ASGI view: same attributes and priming
+    helpers, built on graphene's asyncio DataLoader. Sibling loads in one
+    event-loop tick are batched, so no explicit queueing is needed.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.organization_by_id = AsyncDataLoader(self._by_pk(Organization))
+        self.project_by_id = AsyncDataLoader(self._by_pk(Project, self.add_projects))
+        self.task_by_id = AsyncDataLoader(self._by_pk(Task, self.add_tasks))
+        self.tasks_by_project = AsyncDataLoader(self._load_tasks_by_project)
+        self.comment_count_by_task = AsyncDataLoader(self._load_comment_counts)
+        self.comment_pages = {}
+
+    def clear(self):
+        for loader in (
+            self.organization_by_id,
+            self.project_by_id,
+            self.task_by_id,
+            self.tasks_by_project,
+            self.comment_count_by_task,
+        ):
+            loader.clear_all()
+        self.comment_pages = {}
+
+    def comments_page(self, first=None, after=None):
+        key = (first, after)
+        if key not in self.comment_pages:
+            self.comment_pages[key] = AsyncDataLoader(
+                partial(self._load_comment_page, first=first, after=after)
+            )
+        return self.comment_pages[key]
+
+    def add_projects(self, projects):
+        for project in projects:
+            self.project_by_id.prime(project.pk, project)
+            if Project.organization.is_cached(project):
+                self.organization_by_id.prime(project.organization_id, project.organization)
+
+    def add_tasks(self, tasks):
+        tasks = list(tasks)
+        self.add_projects(
+            {task.project_id: task.project for task in tasks if Task.project.is_cached(task)}.values()
+        )
+        for task in tasks:
+            self.task_by_id.prime(task.pk, task)
+
+    def _by_pk(self, model, on_load=None):
+        async def batch_load(ids):
+            qs = only_columns(model.objects.filter(pk__in=ids), self.columns)
+            rows = {row.pk: row async for row in qs}
+            if on_load is not None:
+                on_load(rows.values())
+            return [rows.get(pk) for pk in ids]
+
+        return batch_load
+
+    async def _load_tasks_by_project(self, project_ids):
+        grouped = defaultdict(list)
+        async for task in only_columns(Task.objects.filter(project_id__in=project_ids), self.columns):
+            grouped[task.project_id].append(task)
+        self.add_tasks(task for tasks in grouped.values() for task in tasks)
+        return [grouped[pk] for pk in project_ids]
+
+    async def _load_comment_page(self, task_ids, first, after):
+        grouped = defaultdict(list)
+        qs = page_per_group(
+            only_columns(TaskComment.objects.filter(task_id__in=task_ids), self.columns),
+            "task_id",
+            first,
+            after,
+        )
+        async for comment in qs:
+            grouped[comment.task_id].append(comment)
+        return [grouped[pk][::-1] for pk in task_ids]
+
+    async def _load_comment_counts(self, task_ids):
+        qs = (
+            TaskComment.objects.filter(task_id__in=task_ids)
+            .order_by()
+            .values("task_id")
+            .annotate(count=Count("pk"))
+            .values_list("task_id", "count")
+        )
+        counts = {task_id: count async for task_id, count in qs}
+        return [counts.get(pk, 0) for pk in task_ids]
+
+
+def get_loaders(info):
+    """
+    Return the loaders attached to this request, creating them on first use.
+    The column projection is computed once, from the first resolver's info.
+    """
+    context = info.context
+    loaders = getattr(context, "loaders", None)
+    if loaders is None:
+        loaders = RequestLoaders()
+        context.loaders = loaders
+    if loaders.columns is None:
+        loaders.columns = selected_columns(info)
+    return loaders
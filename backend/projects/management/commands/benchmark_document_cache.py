@@ -0,0 +1,126 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from graphene_django.views import GraphQLView
+
+from pm_backend.views import PMGraphQLView, document_cache, query_hash
+from projects.models import Organization, Project, Task, TaskComment
+from projects.operations import GET_PROJECT_DETAIL, GET_PROJECTS
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare p50/p99 latency of GetProjects and GetProjectDetail through the "
+        "stock GraphQLView, PMGraphQLView (document cache) and persisted-query hashes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=300)
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument("--tasks", type=int, default=10, help="Tasks per project")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        results = []
+        try:
+            # Measure parse/validate savings only, not response cache hits
+            with override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False), transaction.atomic():
+                org, project = self.seed(options)
+                for name, query, variables in [
+                    ("GetProjects", GET_PROJECTS, {}),
+                    ("GetProjectDetail", GET_PROJECT_DETAIL, {"id": str(project.pk)}),
+                ]:
+                    results += self.run_operation(org, name, query, variables, options["iterations"])
+                raise Rollback
+        except Rollback:
+            pass
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'operation':<18} {'mode':<10} {'p50 ms':>8} {'p99 ms':>8}")
+        for row in results:
+            self.stdout.write(
+                f"{row['operation']:<18} {row['mode']:<10} {row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+            )
+
+    def seed(self, options):
+        org = Organization.objects.create(name="Bench Org", slug="bench-org")
+        projects = Project.objects.bulk_create(
+            Project(organization=org, name=f"Project {i}") for i in range(options["projects"])
+        )
+        tasks = Task.objects.bulk_create(
+            Task(project=project, title=f"Task {i}", assignee_email="u@example.com")
+            for project in projects
+            for i in range(options["tasks"])
+        )
+        TaskComment.objects.bulk_create(
+            TaskComment(task=task, content="Comment", author_email="a@example.com")
+            for task in tasks
+        )
+        return org, projects[0]
+
+    def run_operation(self, org, name, query, variables, iterations):
+        factory = RequestFactory()
+        digest = query_hash(query)
+        modes = [
+            ("stock", GraphQLView.as_view(), {"query": query}),
+            ("cached", PMGraphQLView.as_view(), {"query": query}),
+            (
+                "persisted",
+                PMGraphQLView.as_view(),
+                {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": digest}}},
+            ),
+        ]
+
+        document_cache.clear()
+        rows = []
+        for mode, view, body in modes:
+            payload = json.dumps({**body, "variables": variables, "operationName": name})
+            if mode == "cached":
+                # Warm the document cache; the first request parses + validates
+                self.request(factory, view, org, json.dumps({"query": query, "variables": variables}))
+
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                self.request(factory, view, org, payload)
+                samples.append((time.perf_counter() - start) * 1000)
+
+            rows.append(
+                {
+                    "operation": name,
+                    "mode": mode,
+                    "iterations": iterations,
+                    "p50_ms": percentile(samples, 50),
+                    "p99_ms": percentile(samples, 99),
+                    "mean_ms": statistics.mean(samples),
+                }
+            )
+        return rows
+
+    def request(self, factory, view, org, payload):
+        request = factory.post(
+            "/graphql/",
+            data=payload,
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org.slug,
+        )
+        response = view(request)
+        assert response.status_code == 200, response.content
+        return response
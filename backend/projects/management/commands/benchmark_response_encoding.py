@@ -0,0 +1,154 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from pm_backend import response_encoding
+from pm_backend.views import PMGraphQLView
+from projects.models import Organization, Project, Task, TaskComment
+from projects.operations import GET_PROJECT_DETAIL
+
+from .benchmark_document_cache import Rollback, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialization time and bytes on the wire of a large GetProjectDetail response: "
+        "stdlib json vs the view's encoder, identity vs gzip/brotli, and ETag revalidation (304)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--tasks", type=int, default=200, help="Tasks in the project")
+        parser.add_argument("--comments", type=int, default=3, help="Comments per task")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                org, project = self.seed(options)
+                response = self.run_view(org, project)
+                raise Rollback
+        except Rollback:
+            pass
+
+        payload = json.loads(response["body"])
+        results = {
+            "encoder": "orjson" if response_encoding.orjson is not None else "stdlib (compact)",
+            "serialization": self.serialization(payload, options["iterations"]),
+            "compression": self.compression(response["body"], options["iterations"]),
+            "revalidation": response["revalidation"],
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"JSON encoder: {results['encoder']}")
+        self.stdout.write(f"{'serializer':<18} {'bytes':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for row in results["serialization"]:
+            self.stdout.write(f"{row['mode']:<18} {row['bytes']:>10} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}")
+        self.stdout.write(f"{'coding':<18} {'bytes':>10} {'p50 ms':>8} {'ratio':>8}")
+        for row in results["compression"]:
+            self.stdout.write(f"{row['coding']:<18} {row['bytes']:>10} {row['p50_ms']:>8.3f} {row['ratio']:>8.2f}")
+        revalidation = results["revalidation"]
+        self.stdout.write(
+            f"revalidation: {revalidation['first_status']} ({revalidation['first_bytes']} bytes), "
+            f"then {revalidation['repeat_status']} ({revalidation['repeat_bytes']} bytes)"
+        )
+
+    def seed(self, options):
+        org = Organization.objects.create(name="Encoding Bench Org", slug="encoding-bench-org")
+        project = Project.objects.create(organization=org, name="Big project", description="Project " * 20)
+        tasks = Task.objects.bulk_create(
+            Task(
+                project=project,
+                title=f"Task {i}: follow up on the release checklist",
+                description="Details of the task " * 5,
+                assignee_email=f"user{i % 17}@example.com",
+            )
+            for i in range(options["tasks"])
+        )
+        TaskComment.objects.bulk_create(
+            TaskComment(task=task, content="Looks good to me, merging after review.", author_email="a@example.com")
+            for task in tasks
+            for _ in range(options["comments"])
+        )
+        return org, project
+
+    def run_view(self, org, project):
+        """The view's body, then a revalidation with its ETag."""
+        factory = RequestFactory()
+        view = PMGraphQLView.as_view()
+        payload = json.dumps({"query": GET_PROJECT_DETAIL, "variables": {"id": str(project.pk)}})
+
+        def request(**headers):
+            return view(
+                factory.post(
+                    "/graphql/",
+                    data=payload,
+                    content_type="application/json",
+                    HTTP_X_ORG_SLUG=org.slug,
+                    **headers,
+                )
+            )
+
+        with override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False):
+            first = request(HTTP_ACCEPT_ENCODING="gzip")
+            repeat = request(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert first.status_code == 200, first.content
+        return {
+            "body": gzip.decompress(first.content),
+            "revalidation": {
+                "first_status": first.status_code,
+                "first_bytes": len(first.content),
+                "repeat_status": repeat.status_code,
+                "repeat_bytes": len(repeat.content),
+            },
+        }
+
+    def serialization(self, payload, iterations):
+        encoders = [
+            # What GraphQLView does
+            ("stdlib json", lambda data: json.dumps(data, separators=(",", ":"))),
+            ("view encoder", response_encoding.dumps),
+        ]
+        rows = []
+        for mode, encode in encoders:
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                body = encode(payload).encode()
+                samples.append((time.perf_counter() - start) * 1000)
+            rows.append(
+                {
+                    "mode": mode,
+                    "bytes": len(body),
+                    "p50_ms": percentile(samples, 50),
+                    "p99_ms": percentile(samples, 99),
+                    "mean_ms": statistics.mean(samples),
+                }
+            )
+        return rows
+
+    def compression(self, body, iterations):
+        rows = [{"coding": "identity", "bytes": len(body), "p50_ms": 0.0, "ratio": 1.0}]
+        for coding in reversed(response_encoding.available_encodings()):
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                compressed = response_encoding.compress(body, coding)
+                samples.append((time.perf_counter() - start) * 1000)
+            rows.append(
+                {
+                    "coding": coding,
+                    "bytes": len(compressed),
+                    "p50_ms": percentile(samples, 50),
+                    "ratio": len(body) / len(compressed),
+                }
+            )
+        return rows
@@ -0,0 +1,161 @@
+import random
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from projects.models import Organization, Project, Task, TaskComment, task_status_counts
+from projects.pagination import encode_cursor, page_per_group, page_queryset
+from projects.schema import filter_projects, filter_tasks
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway dataset, run EXPLAIN on every resolver/loader queryset "
+        "and report whether each one uses an index or a sequential scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orgs", type=int, default=5)
+        parser.add_argument("--projects", type=int, default=200, help="Projects per org")
+        parser.add_argument("--tasks", type=int, default=20, help="Tasks per project")
+        parser.add_argument("--comments", type=int, default=2, help="Comments per task")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print full plans")
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit non-zero if any queryset falls back to a sequential scan",
+        )
+
+    def handle(self, *args, **options):
+        seq_scans = []
+        try:
+            with transaction.atomic():
+                org = self.seed(options)
+                for name, qs in self.querysets(org):
+                    plan = explain(qs)
+                    verdict = classify_plan(plan)
+                    if verdict == "SEQ SCAN":
+                        seq_scans.append(name)
+                    style = self.style.SUCCESS if verdict == "INDEX" else self.style.WARNING
+                    self.stdout.write(f"{name:<40} {style(verdict)}")
+                    if options["verbose_plans"]:
+                        self.stdout.write(plan + "\n")
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            pass
+
+        if seq_scans and options["fail_on_seq_scan"]:
+            raise CommandError(f"Sequential scans: {', '.join(seq_scans)}")
+
+    # ----- dataset -----
+
+    def seed(self, options):
+        rng = random.Random(42)
+        orgs = Organization.objects.bulk_create(
+            Organization(name=f"Explain Org {i}", slug=f"explain-org-{i}")
+            for i in range(options["orgs"])
+        )
+        projects = Project.objects.bulk_create(
+            Project(organization=org, name=f"Project {i}", status=rng.choice(Project.Status.values))
+            for org in orgs
+            for i in range(options["projects"])
+        )
+        tasks = Task.objects.bulk_create(
+            (
+                Task(
+                    project=project,
+                    title=f"Task {i}",
+                    status=rng.choice(Task.Status.values),
+                    assignee_email=f"user{rng.randrange(50)}@example.com",
+                )
+                for project in projects
+                for i in range(options["tasks"])
+            ),
+            batch_size=1000,
+        )
+        TaskComment.objects.bulk_create(
+            (
+                TaskComment(task=task, content="Looks good", author_email="a@example.com")
+                for task in tasks
+                for _ in range(options["comments"])
+            ),
+            batch_size=1000,
+        )
+
+        # Fresh planner statistics (same statement on PostgreSQL and SQLite)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        return orgs[0]
+
+    # ----- querysets mirrored from projects/schema.py and projects/loaders.py -----
+
+    def querysets(self, org):
+        project = Project.objects.filter(organization=org).first()
+        task = Task.objects.filter(project=project).first()
+        project_ids = list(Project.objects.filter(organization=org).values_list("pk", flat=True)[:20])
+        task_ids = list(Task.objects.filter(project=project).values_list("pk", flat=True))
+
+        return [
+            ("projects", filter_projects(org)),
+            ("projects(status)", filter_projects(org, Project.Status.ACTIVE)),
+            ("project(id)", Project.objects.filter(pk=project.pk, organization=org)),
+            ("projectsConnection(after)", page_queryset(filter_projects(org), after=encode_cursor(project))),
+            ("tasks", filter_tasks(org)),
+            ("tasks(status)", filter_tasks(org, status=Task.Status.DONE)),
+            ("tasks(projectId, status)", filter_tasks(org, project.pk, Task.Status.DONE)),
+            ("task(id)", Task.objects.filter(pk=task.pk, organization=org)),
+            ("tasksConnection(projectId)", page_queryset(filter_tasks(org, project.pk))),
+            ("tasks by assignee", Task.objects.filter(organization=org, assignee_email=task.assignee_email)),
+            ("loader: tasks_by_project", Task.objects.filter(project_id__in=project_ids)),
+            (
+                "loader: comments page",
+                page_per_group(TaskComment.objects.filter(task_id__in=task_ids), "task_id"),
+            ),
+            (
+                "recompute_project_counters",
+                Task.objects.filter(project_id__in=project_ids)
+                .values("project_id")
+                .annotate(**task_status_counts()),
+            ),
+        ]
+
+
+def explain(qs):
+    """
+    QuerySet.explain() for any queryset. Django 4.2 wraps filters on window
+    functions in a subquery and puts the EXPLAIN prefix inside it, so the
+    prefix is added to the compiled SQL here instead.
+    """
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+        return "\n".join(
+            row if isinstance(row, str) else " ".join(str(c) for c in row)
+            for row in cursor.fetchall()
+        )
+
+
+def classify_plan(plan):
+    """
+    Reduce an EXPLAIN plan to INDEX / SEQ SCAN:
+    - PostgreSQL: "Seq Scan on <table>" vs Index/Bitmap scans
+    - SQLite: "SCAN <table>" without an index vs "SEARCH ... USING INDEX";
+      scans of subqueries and co-routines (e.g. window filters) are ignored
+    """
+    coroutines = set(re.findall(r"CO-ROUTINE (\S+)", plan))
+    seq_scan = False
+    for line in plan.splitlines():
+        if "Seq Scan" in line:
+            seq_scan = True
+        elif " SCAN " in f" {line} " and "INDEX" not in line and "SUBQUERY" not in line.upper():
+            if line.split(" SCAN ", 1)[-1].split()[0] not in coroutines:
+                seq_scan = True
+    return "SEQ SCAN" if seq_scan else "INDEX"
@@ -0,0 +1,169 @@
+import http.client
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.management.commands.benchmark_document_cache import percentile
+from projects.models import Organization, Project, Task
+from projects.operations import GET_PROJECTS
+
+LOADTEST_ORG_SLUG = "loadtest-org"
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the WSGI app under gunicorn (sync workers, as in render.yaml) and the "
+        "ASGI app under uvicorn against the configured database, then compare "
+        "throughput and p50/p99 latency of the same GraphQL operation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per server")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--workers", type=int, default=1, help="Processes per server")
+        parser.add_argument("--wsgi-port", type=int, default=8101)
+        parser.add_argument("--asgi-port", type=int, default=8102)
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument("--tasks", type=int, default=10, help="Tasks per project")
+        parser.add_argument(
+            "--query",
+            default=GET_PROJECTS,
+            help="GraphQL document to send (defaults to the frontend GetProjects)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        for module in ("gunicorn", "uvicorn"):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f"{module} is not installed (pip install -r requirements.txt).")
+
+        # The servers are separate processes: the dataset must be committed
+        self.seed(options)
+
+        servers = [
+            (
+                "wsgi/gunicorn",
+                options["wsgi_port"],
+                ["gunicorn", "pm_backend.wsgi:application", "--workers", str(options["workers"]),
+                 "--bind", f"127.0.0.1:{options['wsgi_port']}"],
+            ),
+            (
+                "asgi/uvicorn",
+                options["asgi_port"],
+                ["uvicorn", "pm_backend.asgi:application", "--workers", str(options["workers"]),
+                 "--port", str(options["asgi_port"]), "--no-access-log"],
+            ),
+        ]
+        results = [self.run_server(name, port, command, options) for name, port, command in servers]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'server':<14} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['server']:<14} {row['requests_per_second']:>8.1f} "
+                f"{row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['errors']:>7}"
+            )
+
+    def seed(self, options):
+        org, created = Organization.objects.get_or_create(
+            slug=LOADTEST_ORG_SLUG, defaults={"name": "Load Test Org"}
+        )
+        if not created:
+            return
+        projects = Project.objects.bulk_create(
+            Project(organization=org, name=f"Project {i}") for i in range(options["projects"])
+        )
+        Task.objects.bulk_create(
+            Task(project=project, title=f"Task {i}", assignee_email="u@example.com")
+            for project in projects
+            for i in range(options["tasks"])
+        )
+
+    def run_server(self, name, port, command, options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "pm_backend.settings"),
+            # Measure execution, not response cache hits
+            "GRAPHQL_RESPONSE_CACHE_ENABLED": "False",
+            # Set explicitly so the WSGI server never inherits it
+            "GRAPHQL_ASYNC": "True" if name.startswith("asgi") else "False",
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", *command],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            self.wait_until_ready(process, port)
+            return self.load(name, port, options)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    def wait_until_ready(self, process, port, timeout=20):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(process.stderr.read().decode("utf-8", "replace"))
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/graphql/stats/")
+                conn.getresponse().read()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise CommandError(f"Server on port {port} did not start within {timeout}s.")
+
+    def load(self, name, port, options):
+        body = json.dumps({"query": options["query"]})
+        headers = {"Content-Type": "application/json", "X-Org-Slug": LOADTEST_ORG_SLUG}
+
+        def send(_):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/graphql/", body=body, headers=headers)
+                response = conn.getresponse()
+                ok = response.status == 200 and "errors" not in json.loads(response.read())
+            except OSError:
+                ok = False
+            finally:
+                conn.close()
+            return (time.perf_counter() - start) * 1000, ok
+
+        # Warm up connections, imports and the document cache
+        for _ in range(5):
+            send(None)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            samples = list(pool.map(send, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        latencies = [ms for ms, _ in samples]
+        return {
+            "server": name,
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "workers": options["workers"],
+            "requests_per_second": options["requests"] / elapsed,
+            "p50_ms": percentile(latencies, 50),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": statistics.mean(latencies),
+            "errors": sum(1 for _, ok in samples if not ok),
+        }
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from pm_backend.websocket import websocket_router
+from projects.broker import get_broker, publish_tasks_changed
+from projects.models import Organization, Project, Task
+from projects.tests.websocket_client import InProcessConnection
+
+from .benchmark_document_cache import percentile
+
+
+TASK_CHANGED = """
+subscription LoadTest($projectId: ID!) { taskChanged(projectId: $projectId) { id status updatedAt } }
+"""
+
+
+async def _no_http(scope, receive, send):
+    raise AssertionError("loadtest_subscriptions only opens WebSockets")
+
+
+class Command(BaseCommand):
+    help = (
+        "Open thousands of in-process graphql-transport-ws subscribers to taskChanged, "
+        "publish real task updates from another thread and report delivery latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=2000)
+        parser.add_argument("--projects", type=int, default=20, help="Subscribers are spread over these")
+        parser.add_argument("--events", type=int, default=100, help="Task updates, round-robin over projects")
+        parser.add_argument("--interval", type=float, default=0.1, help="Seconds between updates")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        # Publishes happen on commit, so the data is committed, then deleted
+        org = Organization.objects.create(name="Subscription Load Org", slug=f"ws-load-{time.time_ns()}")
+        try:
+            projects = Project.objects.bulk_create(
+                Project(organization=org, name=f"Project {i}") for i in range(options["projects"])
+            )
+            tasks = Task.objects.bulk_create(
+                Task(project=project, title="Watched", assignee_email="u@example.com") for project in projects
+            )
+            result = asyncio.run(self.run(org, tasks, options))
+        finally:
+            Organization.objects.filter(pk=org.pk).delete()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for key, value in result.items():
+            self.stdout.write(f"{key:<22} {value:.2f}" if isinstance(value, float) else f"{key:<22} {value}")
+
+    async def run(self, org, tasks, options):
+        application = websocket_router(_no_http)
+        subscribers = options["subscribers"]
+        events = options["events"]
+        # publish_times[i][k]: when the k-th update of tasks[i] was published
+        publish_times = [[] for _ in tasks]
+        expected = [len(range(i, events, len(tasks))) for i in range(len(tasks))]
+
+        start = time.perf_counter()
+        clients = await asyncio.gather(
+            *(self.subscribe(application, org, tasks[n % len(tasks)], str(n)) for n in range(subscribers))
+        )
+        while get_broker().subscriber_count() < subscribers:
+            await asyncio.sleep(0.01)
+        connect_s = time.perf_counter() - start
+
+        receivers = [
+            asyncio.create_task(self.receive(client, publish_times[n % len(tasks)], expected[n % len(tasks)]))
+            for n, client in enumerate(clients)
+        ]
+        start = time.perf_counter()
+        await asyncio.to_thread(self.publish, org, tasks, publish_times, events, options["interval"])
+        results = await asyncio.gather(*receivers)
+        elapsed = time.perf_counter() - start
+        await asyncio.gather(*(client.close(timeout=10) for client in clients))
+
+        latencies = [latency for received in results for latency in received]
+        total = sum(expected[n % len(tasks)] for n in range(subscribers))
+        return {
+            "subscribers": subscribers,
+            "events": events,
+            "connect_s": connect_s,
+            "deliveries": len(latencies),
+            "missed": total - len(latencies),
+            "deliveries_per_s": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50) if latencies else 0.0,
+            "p95_ms": percentile(latencies, 95) if latencies else 0.0,
+            "max_ms": max(latencies, default=0.0),
+            "mean_ms": statistics.mean(latencies) if latencies else 0.0,
+        }
+
+    async def subscribe(self, application, org, task, id):
+        client = InProcessConnection(application)
+        await client.connect(timeout=30)
+        await client.send_json({"type": "connection_init", "payload": {"orgSlug": org.slug}})
+        assert (await client.receive_json(timeout=30))["type"] == "connection_ack"
+        payload = {"query": TASK_CHANGED, "variables": {"projectId": str(task.project_id)}}
+        await client.send_json({"id": id, "type": "subscribe", "payload": payload})
+        return client
+
+    async def receive(self, client, publish_times, expected):
+        latencies = []
+        while len(latencies) < expected:
+            try:
+                message = await client.receive_json(timeout=10)
+            except asyncio.TimeoutError:
+                break
+            assert message["type"] == "next", message
+            latencies.append((time.perf_counter() - publish_times[len(latencies)]) * 1000)
+        return latencies
+
+    def publish(self, org, tasks, publish_times, events, interval):
+        """The mutation write path: save, then publish (at once, in autocommit)."""
+        statuses = [Task.Status.IN_PROGRESS, Task.Status.DONE]
+        try:
+            for k in range(events):
+                i = k % len(tasks)
+                task = tasks[i]
+                task.status = statuses[k % 2]
+                task.save(update_fields=["status"])
+                publish_times[i].append(time.perf_counter())
+                publish_tasks_changed(org.pk, [task])
+                time.sleep(interval)
+        finally:
+            connections.close_all()
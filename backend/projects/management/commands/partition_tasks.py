@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from projects.models import Organization, Task
+from projects.partitioning import convert_task_table, create_tenant_partition, is_partitioned, tenant_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "PostgreSQL: partition projects_task by organization (in batches, while it stays in "
+        "use), or move large tenants into partitions of their own with --tenant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", action="append", default=[], help="Organization slug (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=settings.TASK_PARTITIONING_BATCH_SIZE)
+        parser.add_argument("--list", action="store_true", help="List tenant partitions")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Task partitioning needs PostgreSQL.")
+
+        if not is_partitioned(connection):
+            if options["list"]:
+                raise CommandError("projects_task is not partitioned.")
+            with connection.schema_editor(atomic=False) as schema_editor:
+                convert_task_table(schema_editor, Task, options["batch_size"], log=self.stdout.write)
+            self.stdout.write(self.style.SUCCESS("projects_task is partitioned by organization."))
+
+        if options["list"]:
+            slugs = dict(Organization.objects.values_list("pk", "slug"))
+            for org_id, name in sorted(tenant_partitions(connection).items()):
+                self.stdout.write(f"{name}  {slugs.get(org_id, org_id)}")
+            return
+
+        for slug in options["tenant"]:
+            try:
+                org = Organization.objects.get(slug=slug)
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization '{slug}' not found.")
+            name = create_tenant_partition(connection, Task, org.pk)
+            if name is None:
+                self.stdout.write(f"{slug} already has its own partition.")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Moved the tasks of {slug} to {name}."))
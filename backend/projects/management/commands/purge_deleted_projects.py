@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.purge import DEFAULT_CHUNK_SIZE, claim_job, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker for DeleteProject: purges soft-deleted projects (comments, then tasks, "
+        "then the project) in bounded chunks, one short transaction per chunk. "
+        "Jobs interrupted by a crash resume where they stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is None:
+                if not options["loop"]:
+                    return
+                time.sleep(options["sleep"])
+                continue
+
+            started = time.perf_counter()
+            try:
+                run_job(job, options["chunk_size"])
+            except Exception as e:
+                # Recorded on the job (retried later); keep serving the others
+                self.stderr.write(f"Purge of project {job.project_id} failed: {e}")
+                continue
+            self.stdout.write(
+                f"Purged project {job.project_id}: {job.comments_deleted} comments, "
+                f"{job.tasks_deleted} tasks in {time.perf_counter() - started:.1f}s."
+            )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Organization, Project, recompute_project_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount tasks per project and repair drifted task_count / *_count columns. "
+        "Runs in batches of projects, one short transaction per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--org", help="Only projects of this organization slug")
+
+    def handle(self, *args, **options):
+        qs = Project.objects.order_by("pk")
+        if options["org"]:
+            try:
+                qs = qs.filter(organization=Organization.objects.get(slug=options["org"]))
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization '{options['org']}' not found.")
+
+        checked = fixed = 0
+        last_pk = 0
+        while True:
+            # Keyset batches: no OFFSET scans, and each batch locks few rows
+            ids = list(
+                qs.filter(pk__gt=last_pk).values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            fixed += recompute_project_counters(ids)
+            checked += len(ids)
+            last_pk = ids[-1]
+
+        self.stdout.write(f"Checked {checked} projects, repaired {fixed}.")
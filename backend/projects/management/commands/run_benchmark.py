@@ -0,0 +1,315 @@
+import http.client
+import json
+import random
+import statistics
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from projects.management.commands.benchmark_document_cache import percentile
+from projects.models import Organization, Project, Task
+from projects.operations import (
+    ADD_TASK_COMMENT,
+    CREATE_TASK,
+    GET_ORG_STATS,
+    GET_PROJECT_DETAIL,
+    GET_PROJECTS,
+    LATENCY_BUDGETS_MS,
+    UPDATE_TASK_STATUS,
+)
+
+OPERATIONS = {
+    "GetProjects": GET_PROJECTS,
+    "GetProjectDetail": GET_PROJECT_DETAIL,
+    "CreateTask": CREATE_TASK,
+    "UpdateTaskStatus": UPDATE_TASK_STATUS,
+    "AddTaskComment": ADD_TASK_COMMENT,
+    "GetOrgStats": GET_ORG_STATS,
+}
+
+# Roughly what the client sends: mostly board/detail reads, then status moves
+DEFAULT_MIX = "GetProjects=20,GetProjectDetail=45,CreateTask=10,UpdateTaskStatus=20,AddTaskComment=5"
+
+# Task ids sampled up front for UpdateTaskStatus / AddTaskComment
+TASK_SAMPLE_SIZE = 5_000
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise CommandError(f"Unknown operation '{name}'. Choose from {', '.join(OPERATIONS)}.")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise CommandError(f"Invalid weight for {name}: '{weight}'.")
+    return mix
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the frontend's GraphQL operations concurrently against the Django test "
+        "client (default) or a running server (--url) and print throughput, "
+        "p50/p95/p99 latency and SQL query counts per operation as JSON. "
+        "Mutations write to the dataset: reseed with seed_benchmark_data --clear "
+        "before runs you want to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", default="bench-0", help="Organization slug to send as X-ORG-SLUG")
+        parser.add_argument("--url", help="Base URL of a running server, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--requests", type=int, default=1_000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--warmup", type=int, default=20, help="Untimed requests before the run")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation=weight pairs")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the request plan")
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Keep the response cache on (test client only; off by default to measure execution)",
+        )
+        parser.add_argument(
+            "--check-latency",
+            action="store_true",
+            help="Exit non-zero if an operation's p95 exceeds its LATENCY_BUDGETS_MS entry",
+        )
+        parser.add_argument("--label", help="Free-form label stored in the report")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+        try:
+            org = Organization.objects.get(slug=options["org"])
+        except Organization.DoesNotExist:
+            raise CommandError(
+                f"Organization '{options['org']}' not found. Run seed_benchmark_data first."
+            )
+
+        plan = self.plan(org, parse_mix(options["mix"]), options)
+        warmup, plan = plan[: options["warmup"]], plan[options["warmup"] :]
+
+        if options["url"]:
+            send = self.server_sender(options["url"], org.slug)
+            samples, elapsed = self.run(send, warmup, plan, options["concurrency"])
+        else:
+            with override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=options["response_cache"]):
+                samples, elapsed = self.run(
+                    self.client_sender(org.slug), warmup, plan, options["concurrency"]
+                )
+
+        report = self.report(samples, elapsed, org, options)
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+        if options["check_latency"]:
+            over = [
+                f"{name} p95 {report['operations'][name]['p95_ms']}ms > {budget}ms"
+                for name, budget in LATENCY_BUDGETS_MS.items()
+                if name in report["operations"] and report["operations"][name]["p95_ms"] > budget
+            ]
+            if over:
+                raise CommandError(f"Over latency budget: {'; '.join(over)}")
+
+    # ----- request plan -----
+
+    def plan(self, org, mix, options):
+        """The same seed and dataset always give the same sequence of requests."""
+        rng = random.Random(options["seed"])
+        project_ids = list(
+            Project.objects.visible()
+            .filter(organization=org)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        task_ids = list(
+            Task.objects.visible()
+            .filter(organization=org)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:TASK_SAMPLE_SIZE]
+        )
+        if not project_ids:
+            raise CommandError(f"Organization '{org.slug}' has no projects.")
+        if not task_ids:
+            # Nothing to update or comment on yet
+            mix = {name: w for name, w in mix.items() if name not in ("UpdateTaskStatus", "AddTaskComment")}
+
+        names = list(mix)
+        weights = list(mix.values())
+        statuses = Task.Status.values
+        plan = []
+        for i in range(options["warmup"] + options["requests"]):
+            name = rng.choices(names, weights=weights)[0]
+            if name in ("GetProjects", "GetOrgStats"):
+                variables = {}
+            elif name == "GetProjectDetail":
+                variables = {"id": str(rng.choice(project_ids))}
+            elif name == "CreateTask":
+                variables = {
+                    "projectId": str(rng.choice(project_ids)),
+                    "title": f"Benchmark task {i}",
+                    "status": Task.Status.TODO.value,
+                    "assigneeEmail": "bench@example.com",
+                }
+            elif name == "UpdateTaskStatus":
+                variables = {"taskId": str(rng.choice(task_ids)), "status": rng.choice(statuses)}
+            else:
+                variables = {
+                    "taskId": str(rng.choice(task_ids)),
+                    "content": f"Benchmark comment {i}",
+                    "authorEmail": "bench@example.com",
+                }
+            plan.append((name, variables))
+        return plan
+
+    # ----- transports -----
+
+    def client_sender(self, org_slug):
+        local = threading.local()
+
+        def send(name, variables):
+            if not hasattr(local, "client"):
+                local.client = Client()
+            body = json.dumps({"query": OPERATIONS[name], "variables": variables, "operationName": name})
+            # Connections are per thread, so this only sees this request's queries
+            with CaptureQueriesContext(connection) as queries:
+                response = local.client.post(
+                    "/graphql/", data=body, content_type="application/json", HTTP_X_ORG_SLUG=org_slug
+                )
+            ok = response.status_code == 200 and "errors" not in json.loads(response.content)
+            return ok, len(queries)
+
+        return send
+
+    def server_sender(self, url, org_slug):
+        parts = urlsplit(url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        path = parts.path.rstrip("/") + "/graphql/"
+        headers = {
+            "Content-Type": "application/json",
+            "X-Org-Slug": org_slug,
+            # Servers running with GRAPHQL_TRACING_ENABLED report SQL counts back
+            "X-Debug-Tracing": "1",
+        }
+        local = threading.local()
+
+        def send(name, variables):
+            if not hasattr(local, "conn"):
+                local.conn = connection_class(parts.hostname, parts.port, timeout=60)
+            body = json.dumps({"query": OPERATIONS[name], "variables": variables, "operationName": name})
+            try:
+                local.conn.request("POST", path, body=body, headers=headers)
+                response = local.conn.getresponse()
+                data = json.loads(response.read())
+            except (OSError, http.client.HTTPException, ValueError):
+                local.conn.close()
+                del local.conn
+                return False, None
+            tracing = data.get("extensions", {}).get("tracing") if isinstance(data, dict) else None
+            ok = response.status == 200 and "errors" not in data
+            return ok, tracing["sql"]["count"] if tracing else None
+
+        return send
+
+    # ----- run + report -----
+
+    def run(self, send, warmup, plan, concurrency):
+        """Returns ([(operation, ms, ok, queries)], elapsed seconds)."""
+        for name, variables in warmup:
+            send(name, variables)
+
+        samples = []
+        lock = threading.Lock()
+        pending = iter(plan)
+
+        def worker(close_connection):
+            try:
+                while True:
+                    with lock:
+                        item = next(pending, None)
+                    if item is None:
+                        return
+                    start = time.perf_counter()
+                    ok, queries = send(*item)
+                    ms = (time.perf_counter() - start) * 1000
+                    with lock:
+                        samples.append((item[0], ms, ok, queries))
+            finally:
+                if close_connection:
+                    connection.close()
+
+        start = time.perf_counter()
+        if concurrency <= 1:
+            # Same thread (and DB connection) as the caller
+            worker(close_connection=False)
+        else:
+            threads = [threading.Thread(target=worker, args=(True,)) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return samples, time.perf_counter() - start
+
+    def report(self, samples, elapsed, org, options):
+        operations = {}
+        for name in OPERATIONS:
+            rows = [row for row in samples if row[0] == name]
+            if rows:
+                operations[name] = summarize(rows, elapsed)
+
+        return {
+            "label": options["label"],
+            "commit": git_commit(),
+            "target": options["url"] or "test-client",
+            "org": org.slug,
+            "projects": Project.objects.visible().filter(organization=org).count(),
+            "requests": len(samples),
+            "concurrency": options["concurrency"],
+            "elapsed_s": round(elapsed, 3),
+            **summarize(samples, elapsed),
+            "operations": operations,
+        }
+
+
+def summarize(rows, elapsed):
+    latencies = [ms for _, ms, _, _ in rows]
+    queries = [count for _, _, _, count in rows if count is not None]
+    return {
+        "count": len(rows),
+        "errors": sum(1 for _, _, ok, _ in rows if not ok),
+        "requests_per_second": round(len(rows) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "queries": (
+            {"mean": round(statistics.mean(queries), 2), "max": max(queries)} if queries else None
+        ),
+    }
@@ -0,0 +1,189 @@
+import datetime
+import itertools
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from projects.models import Organization, Project, Task, TaskComment
+
+# (orgs, projects, tasks, comments), all totals across the dataset
+SCALES = {
+    "small": (3, 30, 1_000, 2_000),
+    "medium": (10, 1_000, 100_000, 200_000),
+    "large": (20, 10_000, 1_000_000, 2_000_000),
+}
+
+PROJECT_STATUS_WEIGHTS = {
+    Project.Status.ACTIVE.value: 6,
+    Project.Status.COMPLETED.value: 3,
+    Project.Status.ON_HOLD.value: 1,
+}
+TASK_STATUS_WEIGHTS = {
+    Task.Status.TODO.value: 3,
+    Task.Status.IN_PROGRESS.value: 2,
+    Task.Status.DONE.value: 5,
+}
+
+WORDS = (
+    "login redirect header footer billing invoice export import search filter "
+    "dashboard report chart email webhook cache timeout crash flaky test deploy "
+    "migration index permission role audit sidebar modal upload avatar onboarding"
+).split()
+
+
+def zipf_weights(n, s=1.1):
+    """Weights for n buckets where bucket k gets 1/k^s of the mass (a few big, a long tail)."""
+    return [1 / (rank**s) for rank in range(1, n + 1)]
+
+
+def split_skewed(rng, total, buckets, s=1.1):
+    """Distributes total items over buckets with a Zipf skew; every bucket gets at least one."""
+    if buckets == 0:
+        return []
+    counts = [1] * buckets if total >= buckets else [0] * buckets
+    remaining = total - sum(counts)
+    weights = zipf_weights(buckets, s)
+    # Big buckets are not always the first ones
+    rng.shuffle(weights)
+    for index in rng.choices(range(buckets), weights=weights, k=remaining):
+        counts[index] += 1
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset for benchmarks: organizations, projects, tasks "
+        "and comments with skewed sizes (a few huge projects, a long tail of small "
+        "ones), inserted with batched bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=SCALES, default="small")
+        parser.add_argument("--orgs", type=int, help="Overrides the scale preset")
+        parser.add_argument("--projects", type=int, help="Total projects (overrides the preset)")
+        parser.add_argument("--tasks", type=int, help="Total tasks (overrides the preset)")
+        parser.add_argument("--comments", type=int, help="Total comments (overrides the preset)")
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data)")
+        parser.add_argument("--prefix", default="bench", help="Organization slug prefix")
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete organizations with this prefix first"
+        )
+
+    def handle(self, *args, **options):
+        orgs, projects, tasks, comments = SCALES[options["scale"]]
+        orgs = options["orgs"] or orgs
+        projects = max(options["projects"] or projects, orgs)
+        tasks = options["tasks"] if options["tasks"] is not None else tasks
+        comments = options["comments"] if options["comments"] is not None else comments
+        prefix = options["prefix"]
+        self.batch_size = options["batch_size"]
+        self.verbosity = options["verbosity"]
+        self.rng = random.Random(options["seed"])
+
+        existing = Organization.objects.filter(slug__startswith=f"{prefix}-")
+        if existing.exists():
+            if not options["clear"]:
+                raise CommandError(
+                    f"Organizations with prefix '{prefix}-' already exist; pass --clear to replace them."
+                )
+            existing.delete()
+
+        started = time.perf_counter()
+        org_rows = Organization.objects.bulk_create(
+            Organization(name=f"Benchmark Org {i}", slug=f"{prefix}-{i}") for i in range(orgs)
+        )
+        project_rows = self.create_projects(org_rows, split_skewed(self.rng, projects, orgs))
+        task_total, comment_total = self.create_tasks(project_rows, tasks, comments)
+
+        self.stdout.write(
+            f"Created {len(org_rows)} organizations, {len(project_rows)} projects, "
+            f"{task_total} tasks and {comment_total} comments in "
+            f"{time.perf_counter() - started:.1f}s."
+        )
+        if org_rows:
+            self.stdout.write(f"Largest organization: {org_rows[0].slug}")
+
+    def create_projects(self, org_rows, per_org):
+        today = datetime.date.today()
+        # Largest org first, so "<prefix>-0" is the heaviest tenant
+        per_org.sort(reverse=True)
+        rows = (
+            Project(
+                organization=org,
+                name=f"{self.rng.choice(WORDS).title()} {self.rng.choice(WORDS)} {i}",
+                description=self.sentence(12),
+                status=self.weighted(PROJECT_STATUS_WEIGHTS),
+                due_date=today + datetime.timedelta(days=self.rng.randint(-60, 180)),
+            )
+            for org, count in zip(org_rows, per_org)
+            for i in range(count)
+        )
+        created = []
+        for batch in batched(rows, self.batch_size):
+            created += Project.objects.bulk_create(batch)
+        return created
+
+    def create_tasks(self, project_rows, tasks, comments):
+        per_project = split_skewed(self.rng, tasks, len(project_rows))
+        mean_comments = comments / tasks if tasks else 0
+        today = datetime.date.today()
+
+        rows = (
+            Task(
+                project=project,
+                title=self.sentence(4).capitalize(),
+                description=self.sentence(self.rng.randint(0, 30)),
+                status=self.weighted(TASK_STATUS_WEIGHTS),
+                # A handful of busy assignees per org
+                assignee_email=f"user{min(int(self.rng.paretovariate(1.2)), 200)}@example.com",
+                due_date=(
+                    today + datetime.timedelta(days=self.rng.randint(-30, 90))
+                    if self.rng.random() < 0.7
+                    else None
+                ),
+            )
+            for project, count in zip(project_rows, per_project)
+            for _ in range(count)
+        )
+
+        task_total = comment_total = 0
+        now = timezone.now()
+        for batch in batched(rows, self.batch_size):
+            for task in batch:
+                if task.status == Task.Status.DONE:
+                    # Completions spread over the last 12 weeks (orgStats)
+                    task.completed_at = now - datetime.timedelta(days=self.rng.uniform(0, 84))
+            with transaction.atomic():
+                created = Task.objects.bulk_create(batch)
+                comment_rows = [
+                    TaskComment(
+                        task=task,
+                        content=self.sentence(self.rng.randint(3, 25)),
+                        author_email=f"user{min(int(self.rng.paretovariate(1.2)), 200)}@example.com",
+                    )
+                    for task in created
+                    # Most tasks have no or few comments, some have long threads
+                    for _ in range(round(self.rng.expovariate(1 / mean_comments)) if mean_comments else 0)
+                ]
+                TaskComment.objects.bulk_create(comment_rows, batch_size=self.batch_size)
+            task_total += len(created)
+            comment_total += len(comment_rows)
+            if self.verbosity > 1:
+                self.stdout.write(f"  {task_total} tasks, {comment_total} comments")
+        return task_total, comment_total
+
+    def sentence(self, words):
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def weighted(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
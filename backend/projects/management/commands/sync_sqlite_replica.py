@@ -0,0 +1,37 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database file over the replica file, standing in "
+        "for replication when DATABASE_URL and DATABASE_REPLICA_URL are two local "
+        "SQLite files. With --interval, keeps copying (replica lag = the interval)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="Seconds between copies; runs until stopped")
+
+    def handle(self, *args, **options):
+        replica = settings.DATABASE_READ_REPLICA
+        if not replica:
+            raise CommandError("No replica configured. Set DATABASE_REPLICA_URL.")
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite" or connections[replica].vendor != "sqlite":
+            raise CommandError("Only SQLite files can be copied; use the database's own replication.")
+
+        source = primary.settings_dict["NAME"]
+        target = connections[replica].settings_dict["NAME"]
+        while True:
+            # Django's replica connection may hold the file open
+            connections[replica].close()
+            with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+                src.backup(dst)
+            self.stdout.write(f"Copied {source} to {target}.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:41
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Task = apps.get_model("projects", "Task")
+    counts = (
+        Task.objects.order_by()
+        .values("project_id")
+        .annotate(
+            task_count=Count("id"),
+            todo_count=Count("id", filter=Q(status="TODO")),
+            in_progress_count=Count("id", filter=Q(status="IN_PROGRESS")),
+            done_count=Count("id", filter=Q(status="DONE")),
+        )
+    )
+    for row in counts.iterator():
+        Project.objects.filter(pk=row.pop("project_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,130 @@
+from django.db import migrations
+
+
+# Search storage is vendor specific and invisible to the models:
+# - PostgreSQL: generated tsvector columns + GIN indexes
+# - SQLite: an FTS5 table kept in sync by triggers (queried by projects/search.py)
+# The SQL lives here, not in runtime code, so this migration never changes.
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE projects_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX task_search_vector_idx ON projects_task USING gin (search_vector)",
+    """
+    ALTER TABLE projects_taskcomment ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX comment_search_vector_idx ON projects_taskcomment USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "ALTER TABLE projects_taskcomment DROP COLUMN search_vector",
+    "ALTER TABLE projects_task DROP COLUMN search_vector",
+]
+
+SQLITE_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER projects_task_search_insert AFTER INSERT ON projects_task BEGIN
+        INSERT INTO projects_search_fts (rowid, title, body, task_id)
+        VALUES (new.id * 2, new.title, new.description, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_task_search_update AFTER UPDATE OF title, description ON projects_task BEGIN
+        UPDATE projects_search_fts SET title = new.title, body = new.description
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER projects_task_search_delete AFTER DELETE ON projects_task BEGIN
+        DELETE FROM projects_search_fts WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER projects_comment_search_insert AFTER INSERT ON projects_taskcomment BEGIN
+        INSERT INTO projects_search_fts (rowid, title, body, task_id)
+        VALUES (new.id * 2 + 1, '', new.content, new.task_id);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_comment_search_update AFTER UPDATE OF content, task_id ON projects_taskcomment BEGIN
+        UPDATE projects_search_fts SET body = new.content, task_id = new.task_id
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER projects_comment_search_delete AFTER DELETE ON projects_taskcomment BEGIN
+        DELETE FROM projects_search_fts WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+SQLITE_FTS_REBUILD = [
+    "DELETE FROM projects_search_fts",
+    """
+    INSERT INTO projects_search_fts (rowid, title, body, task_id)
+    SELECT id * 2, title, description, id FROM projects_task
+    """,
+    """
+    INSERT INTO projects_search_fts (rowid, title, body, task_id)
+    SELECT id * 2 + 1, '', content, task_id FROM projects_taskcomment
+    """,
+]
+
+SQLITE_FTS_REVERSE = [
+    "DROP TRIGGER IF EXISTS projects_task_search_insert",
+    "DROP TRIGGER IF EXISTS projects_task_search_update",
+    "DROP TRIGGER IF EXISTS projects_task_search_delete",
+    "DROP TRIGGER IF EXISTS projects_comment_search_insert",
+    "DROP TRIGGER IF EXISTS projects_comment_search_update",
+    "DROP TRIGGER IF EXISTS projects_comment_search_delete",
+    "DROP TABLE IF EXISTS projects_search_fts",
+]
+
+
+def sqlite_fts_forward():
+    """
+    Statements that (re)create the FTS5 table, its triggers and contents.
+    SQLite migrations that rebuild projects_task/projects_taskcomment drop
+    the triggers, so those migrations (0008, 0010) run this again.
+    """
+    return [
+        *SQLITE_FTS_REVERSE,
+        """
+        CREATE VIRTUAL TABLE projects_search_fts USING fts5(
+            title, body, task_id UNINDEXED, tokenize = 'porter unicode61'
+        )
+        """,
+        *SQLITE_FTS_TRIGGERS,
+        *SQLITE_FTS_REBUILD[1:],
+    ]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        sql = statements.get(schema_editor.connection.vendor, [])
+        for statement in sql:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_task_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": sqlite_fts_forward()}),
+            _run({"postgresql": POSTGRES_REVERSE, "sqlite": SQLITE_FTS_REVERSE}),
+        ),
+    ]
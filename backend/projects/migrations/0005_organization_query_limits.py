@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='max_query_cost',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='max_query_depth',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:14
+
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The FTS5 SQL of 0004, frozen with it (not the runtime search module)
+sqlite_fts_forward = import_module("projects.migrations.0004_search_index").sqlite_fts_forward
+
+
+# Log every existing entity once, projects first, so a client syncing from
+# an empty cursor gets the whole organization
+BACKFILL_CHANGE_LOG = [
+    """
+    INSERT INTO projects_changelogentry (organization_id, entity, entity_id, seq, deleted, changed_at)
+    SELECT organization_id, entity, entity_id,
+           ROW_NUMBER() OVER (PARTITION BY organization_id ORDER BY kind, entity_id),
+           deleted, CURRENT_TIMESTAMP
+    FROM (
+        SELECT p.organization_id, 'PROJECT' AS entity, p.id AS entity_id,
+               p.deleted_at IS NOT NULL AS deleted, 1 AS kind
+        FROM projects_project p
+        UNION ALL
+        SELECT p.organization_id, 'TASK', t.id, FALSE, 2
+        FROM projects_task t JOIN projects_project p ON p.id = t.project_id
+        WHERE p.deleted_at IS NULL
+        UNION ALL
+        SELECT p.organization_id, 'COMMENT', c.id, FALSE, 3
+        FROM projects_taskcomment c
+        JOIN projects_task t ON t.id = c.task_id
+        JOIN projects_project p ON p.id = t.project_id
+        WHERE p.deleted_at IS NULL
+    ) entities
+    """,
+    """
+    INSERT INTO projects_changesequence (organization_id, value)
+    SELECT organization_id, MAX(seq) FROM projects_changelogentry GROUP BY organization_id
+    """,
+]
+
+
+def restore_sqlite_search(apps, schema_editor):
+    # Adding updated_at rebuilds the SQLite tables, dropping the FTS triggers
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in sqlite_fts_forward():
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequence',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='projects.organization')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='taskcomment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('PROJECT', 'Project'), ('TASK', 'Task'), ('COMMENT', 'Comment')], max_length=20)),
+                ('entity_id', models.BigIntegerField()),
+                ('seq', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField()),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.organization')),
+            ],
+            options={
+                'ordering': ['organization', 'seq'],
+                'indexes': [models.Index(fields=['organization', 'seq'], name='changelog_org_seq_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='changelogentry',
+            constraint=models.UniqueConstraint(fields=('organization', 'entity', 'entity_id'), name='changelog_entity_uniq'),
+        ),
+        migrations.RunPython(restore_sqlite_search, migrations.RunPython.noop),
+        migrations.RunSQL(BACKFILL_CHANGE_LOG, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+
+# Copy project.organization onto tasks, then task.organization onto
+# comments, one id range per transaction so no lock is held for long.
+# The columns become NOT NULL in 0010 once every row has a value.
+
+BACKFILL_BATCH_SIZE = 5000
+
+BACKFILL = [
+    (
+        "projects_task",
+        """
+        UPDATE projects_task SET organization_id = (
+            SELECT p.organization_id FROM projects_project p WHERE p.id = projects_task.project_id
+        )
+        WHERE id > %s AND id <= %s AND organization_id IS NULL
+        """,
+    ),
+    (
+        "projects_taskcomment",
+        """
+        UPDATE projects_taskcomment SET organization_id = (
+            SELECT t.organization_id FROM projects_task t WHERE t.id = projects_taskcomment.task_id
+        )
+        WHERE id > %s AND id <= %s AND organization_id IS NULL
+        """,
+    ),
+]
+
+
+def backfill_organizations(apps, schema_editor):
+    connection = schema_editor.connection
+    for table, sql in BACKFILL:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(id), MAX(id) FROM {table}")
+            low, high = cursor.fetchone()
+        if low is None:
+            continue
+        for start in range(low - 1, high, BACKFILL_BATCH_SIZE):
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(sql, [start, start + BACKFILL_BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('projects', '0008_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='projects.organization'),
+        ),
+        migrations.AddField(
+            model_name='taskcomment',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_comments', to='projects.organization'),
+        ),
+        migrations.RunPython(backfill_organizations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The FTS5 SQL of 0004, frozen with it (not the runtime search module)
+sqlite_fts_forward = import_module("projects.migrations.0004_search_index").sqlite_fts_forward
+
+
+def restore_sqlite_search(apps, schema_editor):
+    # NOT NULL rebuilds the SQLite tables, dropping the FTS triggers
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in sqlite_fts_forward():
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_task_organization'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='projects.organization'),
+        ),
+        migrations.AlterField(
+            model_name='taskcomment',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_comments', to='projects.organization'),
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_assignee_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_due_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_completed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'status', '-created_at'], name='task_org_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', '-created_at', '-id'], name='task_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'assignee_email', 'status'], name='task_org_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'due_date'], name='task_org_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'completed_at'], name='task_org_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['organization', 'task'], name='comment_org_task_idx'),
+        ),
+        migrations.RunPython(restore_sqlite_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,190 @@
+from django.conf import settings
+from django.db import migrations, transaction
+
+
+# Conversion of projects_task to PARTITION BY LIST (organization_id), as
+# projects/partitioning.py did when this migration was written. Copied, not
+# imported: later changes to the runtime module must not alter it.
+
+TABLE = "projects_task"
+NEW_TABLE = "projects_task_partitioned"
+DEFAULT_PARTITION = "projects_task_default"
+SEQUENCE = "projects_task_id_seq_partitioned"
+COMMENT_TABLE = "projects_taskcomment"
+COMMENT_FK = "projects_taskcomment_task_org_fk"
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Rows written this long before the copy started are copied again at the
+# swap: updated_at comes from the application servers' clocks
+CLOCK_SKEW_MARGIN = "5 minutes"
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = %s::regclass", [TABLE])
+        return cursor.fetchone()[0]
+
+
+def _columns(connection, model):
+    # Every model column; search_vector is generated, so never inserted
+    return ", ".join(connection.ops.quote_name(field.column) for field in model._meta.concrete_fields)
+
+
+def _referencing_fks(connection):
+    """[(table, constraint name)] of every foreign key that references projects_task."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = %s::regclass
+            ORDER BY 1, 2
+            """,
+            [TABLE],
+        )
+        return cursor.fetchall()
+
+
+def _comment_fk_names(connection):
+    """
+    The comment foreign keys, which the swap re-creates on (task_id,
+    organization_id). Any other reference would block DROP TABLE, and with
+    the (id, organization_id) key a single-column one has nothing to target.
+    """
+    fks = _referencing_fks(connection)
+    others = [f"{name} on {table}" for table, name in fks if table != COMMENT_TABLE]
+    if others:
+        raise Exception(
+            f"{TABLE} is referenced by {', '.join(others)}. Partitioning needs every foreign key "
+            "to a task to be on (id, organization_id): change or drop those first."
+        )
+    return [name for table, name in fks if table == COMMENT_TABLE]
+
+
+def convert_task_table(schema_editor, model, batch_size=DEFAULT_BATCH_SIZE, log=None):
+    """
+    Rebuilds projects_task as a partitioned table while it stays in use:
+    - copies the rows in id order, one batch per transaction
+    - then, with writes blocked (reads go on), re-copies rows written
+      since the copy started, drops deleted ones and swaps the tables
+    Returns False if the table is partitioned already; raises if a table
+    other than projects_taskcomment references it.
+    model is the Task model (the historical one in migrations).
+    """
+    connection = schema_editor.connection
+    log = log or (lambda message: None)
+    if is_partitioned(connection):
+        return False
+    # Refuse before copying anything; checked again under the swap's lock
+    _comment_fk_names(connection)
+    columns = _columns(connection, model)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {NEW_TABLE}")
+        cursor.execute(f"DROP SEQUENCE IF EXISTS {SEQUENCE}")
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE}")
+        cursor.execute(
+            f"""
+            CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)
+            PARTITION BY LIST (organization_id)
+            """
+        )
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} ADD PRIMARY KEY (id, organization_id)")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {NEW_TABLE} DEFAULT")
+        cursor.execute(f"SELECT now() - interval '{CLOCK_SKEW_MARGIN}'")
+        since = cursor.fetchone()[0]
+
+    last_id, copied = 0, 0
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH copied AS (
+                    INSERT INTO {NEW_TABLE} ({columns})
+                    SELECT {columns} FROM {TABLE} WHERE id > %s ORDER BY id LIMIT %s
+                    RETURNING id
+                )
+                SELECT MAX(id), COUNT(*) FROM copied
+                """,
+                [last_id, batch_size],
+            )
+            batch_last, n = cursor.fetchone()
+        if not n:
+            break
+        last_id, copied = batch_last, copied + n
+        log(f"Copied {copied} tasks")
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # Writers wait until the swap commits
+        cursor.execute(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(
+            f"""
+            DELETE FROM {NEW_TABLE} n
+            WHERE NOT EXISTS (SELECT 1 FROM {TABLE} t WHERE t.id = n.id)
+               OR n.id IN (SELECT id FROM {TABLE} WHERE updated_at >= %s)
+            """,
+            [since],
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {NEW_TABLE} ({columns})
+            SELECT {columns} FROM {TABLE} WHERE id > %s OR updated_at >= %s
+            """,
+            [last_id, since],
+        )
+        log(f"Re-copied {cursor.rowcount} tasks written during the copy")
+        cursor.execute(f"SELECT setval('{SEQUENCE}', nextval(pg_get_serial_sequence('{TABLE}', 'id')))")
+
+        for name in _comment_fk_names(connection):
+            cursor.execute(f"ALTER TABLE {COMMENT_TABLE} DROP CONSTRAINT {connection.ops.quote_name(name)}")
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {NEW_TABLE}_pkey TO {TABLE}_pkey")
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+
+        # Indexes and foreign keys of the model, as the old table had them
+        for statement in schema_editor._model_indexes_sql(model):
+            cursor.execute(str(statement))
+        cursor.execute(f"CREATE INDEX task_search_vector_idx ON {TABLE} USING gin (search_vector)")
+        for field in (model._meta.get_field("project"), model._meta.get_field("organization")):
+            cursor.execute(str(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s")))
+        # NOT VALID: checking every comment would hold the lock longer
+        cursor.execute(
+            f"""
+            ALTER TABLE {COMMENT_TABLE} ADD CONSTRAINT {COMMENT_FK}
+            FOREIGN KEY (task_id, organization_id) REFERENCES {TABLE} (id, organization_id)
+            DEFERRABLE INITIALLY DEFERRED NOT VALID
+            """
+        )
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {COMMENT_TABLE} VALIDATE CONSTRAINT {COMMENT_FK}")
+    return True
+
+
+def partition_tasks(apps, schema_editor):
+    # Opt-in; manage.py partition_tasks converts the table later on
+    if schema_editor.connection.vendor == "postgresql" and settings.TASK_PARTITIONING:
+        convert_task_table(
+            schema_editor, apps.get_model("projects", "Task"), settings.TASK_PARTITIONING_BATCH_SIZE
+        )
+
+
+def check_not_partitioned(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql" and is_partitioned(schema_editor.connection):
+        raise Exception("projects_task is partitioned; converting it back is not supported.")
+
+
+class Migration(migrations.Migration):
+
+    # The copy commits batch by batch
+    atomic = False
+
+    dependencies = [
+        ('projects', '0010_task_organization_not_null'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tasks, check_not_partitioned),
+    ]
@@ -1,6 +1,13 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import connections, models, router, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .response_cache import bump_org_version
+
 
 class Organization(models.Model):
     name = models.CharField(max_length=255)
@@ -8,6 +15,10 @@ class Organization(models.Model):
     contact_email = models.EmailField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # GraphQL limits for this tenant (empty = GRAPHQL_MAX_QUERY_* settings)
+    max_query_depth = models.PositiveIntegerField(blank=True, null=True)
+    max_query_cost = models.PositiveIntegerField(blank=True, null=True)
+
     class Meta:
         ordering = ["name"]
 
@@ -21,6 +32,29 @@ class Organization(models.Model):
         super().save(*args, **kwargs)
 
 
+class ProjectQuerySet(models.QuerySet):
+    def visible(self):
+        """Projects not soft-deleted (DeleteProject hides them until purged)."""
+        return self.filter(deleted_at__isnull=True)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            record_changes(changed=[(obj.organization_id, ChangeLogEntry.Entity.PROJECT, obj.pk) for obj in objs])
+        return objs
+
+    def delete(self):
+        # Admin bulk deletes; tasks and comments go with their project
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(self.values_list("pk", "organization_id"))
+            result = super().delete()
+            record_changes(deleted=[(org_id, ChangeLogEntry.Entity.PROJECT, pk) for pk, org_id in rows])
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Project(models.Model):
     class Status(models.TextChoices):
         ACTIVE = "ACTIVE", "Active"
@@ -41,13 +75,141 @@ class Project(models.Model):
     )
     due_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set by DeleteProject; a ProjectPurgeJob then deletes the rows (purge.py)
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = ProjectQuerySet.as_manager()
+
+    # Denormalized task counters, maintained by Task/TaskQuerySet writes
+    # (see update_project_counters); repaired by recompute_project_counters
+    task_count = models.IntegerField(default=0, editable=False)
+    todo_count = models.IntegerField(default=0, editable=False)
+    in_progress_count = models.IntegerField(default=0, editable=False)
+    done_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # projects(status) filter and keyset pages, scoped to one org
+            models.Index(fields=["organization", "status"], name="project_org_status_idx"),
+            models.Index(fields=["organization", "-created_at", "-id"], name="project_org_created_idx"),
+            # Soft-deleted projects awaiting their purge (TaskQuerySet.visible)
+            models.Index(fields=["deleted_at"], condition=Q(deleted_at__isnull=False), name="project_deleted_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.organization.slug})"
 
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(Project, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            record_changes(changed=[(self.organization_id, ChangeLogEntry.Entity.PROJECT, self.pk)])
+
+    def delete(self, *args, **kwargs):
+        # Tasks and comments go with it: clients drop them with the project
+        using = kwargs.get("using") or router.db_for_write(Project, instance=self)
+        pk = self.pk
+        with transaction.atomic(using=using, savepoint=False):
+            result = super().delete(*args, **kwargs)
+            record_changes(deleted=[(self.organization_id, ChangeLogEntry.Entity.PROJECT, pk)])
+        return result
+
+
+class TaskQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep Project counters and the change log in step (admin
+    actions, bulk mutations). Affected rows are locked first so the counter
+    deltas match what is written.
+    """
+
+    def visible(self):
+        """
+        Tasks whose project is not soft-deleted. A NOT IN over the few
+        soft-deleted projects (project_deleted_idx), not a join to projects.
+        """
+        return self.exclude(project__in=Project.objects.filter(deleted_at__isnull=False).values("pk"))
+
+    def _locked_rows(self):
+        return list(
+            self.select_for_update(of=("self",)).values_list("pk", "project_id", "status", "organization_id")
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        orgs = {obj.project_id: obj.project.organization_id for obj in objs if Task.project.is_cached(obj)}
+        orgs.update(project_organization_ids({obj.project_id for obj in objs} - orgs.keys()))
+        for obj in objs:
+            obj.sync_completed_at()
+            obj.organization_id = orgs[obj.project_id]
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            update_project_counters(Counter((obj.project_id, obj.status) for obj in objs))
+            record_changes(
+                changed=[
+                    *((obj.organization_id, ChangeLogEntry.Entity.TASK, obj.pk) for obj in objs),
+                    *((orgs[pk], ChangeLogEntry.Entity.PROJECT, pk) for pk in {obj.project_id for obj in objs}),
+                ]
+            )
+        return objs
+
+    def update(self, **kwargs):
+        # auto_now is only applied by save()
+        kwargs.setdefault("updated_at", timezone.now())
+        tracked = {"status", "project", "project_id"} & kwargs.keys()
+        status = kwargs.get("status")
+        if kwargs.keys() & {"project", "project_id"} and "organization" not in kwargs:
+            # Moved rows take the organization of their new project
+            project = kwargs.get("project_id", kwargs.get("project"))
+            project_id = project.pk if isinstance(project, Project) else project
+            kwargs["organization_id"] = project_organization_ids([project_id]).get(project_id)
+        if "status" in kwargs and "completed_at" not in kwargs and not hasattr(status, "resolve_expression"):
+            # Rows already DONE keep their completion time
+            kwargs["completed_at"] = (
+                Coalesce(F("completed_at"), Value(timezone.now()))
+                if status == Task.Status.DONE
+                else None
+            )
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = self._locked_rows()
+            updated = super().update(**kwargs)
+            changed = [(org_id, ChangeLogEntry.Entity.TASK, pk) for pk, _, _, org_id in rows]
+            if not tracked:
+                pass
+            elif kwargs.keys() & {"project", "project_id"} or hasattr(status, "resolve_expression"):
+                # Moved between projects or computed status: recount what was touched
+                # (the recount logs the projects whose counters changed)
+                moved_to = Task.objects.filter(pk__in=[row[0] for row in rows])
+                recompute_project_counters(
+                    {row[1] for row in rows}
+                    | set(moved_to.values_list("project_id", flat=True))
+                )
+            else:
+                deltas = Counter()
+                for _, project_id, old_status, org_id in rows:
+                    deltas[project_id, old_status] -= 1
+                    deltas[project_id, status] += 1
+                    changed.append((org_id, ChangeLogEntry.Entity.PROJECT, project_id))
+                update_project_counters(deltas)
+            record_changes(changed=changed)
+        return updated
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = self._locked_rows()
+            result = super().delete()
+            update_project_counters(Counter((row[1], row[2]) for row in rows), sign=-1)
+            record_changes(
+                changed=[(org_id, ChangeLogEntry.Entity.PROJECT, project_id) for _, project_id, _, org_id in rows],
+                deleted=[(org_id, ChangeLogEntry.Entity.TASK, pk) for pk, _, _, org_id in rows],
+            )
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class Task(models.Model):
     class Status(models.TextChoices):
@@ -60,6 +222,14 @@ class Task(models.Model):
         on_delete=models.CASCADE,
         related_name="tasks",
     )
+    # Copy of project.organization, set on every write that sets the project:
+    # tenant filters need no join through projects
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name="tasks",
+        editable=False,
+    )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     status = models.CharField(
@@ -70,13 +240,125 @@ class Task(models.Model):
     assignee_email = models.EmailField()
     due_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # When the task last moved to DONE; empty for other statuses (and for
+    # tasks completed before the column existed)
+    completed_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # tasks(projectId, status) and per-project task lists, newest first
+            models.Index(fields=["project", "status", "-created_at"], name="task_project_status_idx"),
+            models.Index(fields=["project", "-created_at", "-id"], name="task_project_created_idx"),
+            # tasks(status), org-wide task pages and assignee lists
+            models.Index(fields=["organization", "status", "-created_at"], name="task_org_status_idx"),
+            models.Index(fields=["organization", "-created_at", "-id"], name="task_org_created_idx"),
+            models.Index(fields=["organization", "assignee_email", "status"], name="task_org_assignee_idx"),
+            # orgStats: overdue tasks and completions per week
+            models.Index(fields=["organization", "due_date"], name="task_org_due_idx"),
+            models.Index(fields=["organization", "completed_at"], name="task_org_completed_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} [{self.get_status_display()}]"
 
+    def _locked_counter_key(self, using):
+        # (project_id, status) as stored, read under a row lock
+        return (
+            Task.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("project_id", "status")
+            .first()
+        )
+
+    def sync_organization(self):
+        self.organization_id = self.project.organization_id
+
+    def sync_completed_at(self):
+        if self.status != Task.Status.DONE:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        update_fields = kwargs.get("update_fields")
+        tracked = update_fields is None or {"status", "project", "project_id"} & set(update_fields)
+        moved = update_fields is None or {"project", "project_id"} & set(update_fields)
+        if update_fields is None or "status" in update_fields:
+            self.sync_completed_at()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "completed_at"}
+
+        with transaction.atomic(using=using, savepoint=False):
+            old = None
+            if tracked and not self._state.adding and self.pk is not None:
+                old = self._locked_counter_key(using)
+            if self.organization_id is None or (moved and old is not None and old[0] != self.project_id):
+                self.sync_organization()
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*kwargs["update_fields"], "organization"}
+            super().save(*args, **kwargs)
+            org_id = self.organization_id
+            changed = [(org_id, ChangeLogEntry.Entity.TASK, self.pk)]
+            if tracked:
+                deltas = Counter({(self.project_id, self.status): 1})
+                if old is not None:
+                    deltas[old] -= 1
+                update_project_counters(deltas)
+                changed += [
+                    (org_id, ChangeLogEntry.Entity.PROJECT, project_id)
+                    for (project_id, _), n in deltas.items()
+                    if n
+                ]
+            record_changes(changed=changed)
+
+    def delete(self, *args, **kwargs):
+        # Its comments go with it: clients drop them with the task
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        pk = self.pk
+        with transaction.atomic(using=using, savepoint=False):
+            old = self._locked_counter_key(using)
+            result = super().delete(*args, **kwargs)
+            if old is not None:
+                update_project_counters(Counter({old: -1}))
+                org_id = self.organization_id
+                record_changes(
+                    changed=[(org_id, ChangeLogEntry.Entity.PROJECT, old[0])],
+                    deleted=[(org_id, ChangeLogEntry.Entity.TASK, pk)],
+                )
+        return result
+
+
+class TaskCommentQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        orgs = {obj.task_id: obj.task.organization_id for obj in objs if TaskComment.task.is_cached(obj)}
+        orgs.update(
+            Task.objects.filter(pk__in={obj.task_id for obj in objs} - orgs.keys())
+            .values_list("pk", "organization_id")
+        )
+        for obj in objs:
+            obj.organization_id = orgs[obj.task_id]
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            record_changes(changed=[(obj.organization_id, ChangeLogEntry.Entity.COMMENT, obj.pk) for obj in objs])
+        return objs
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(self.values_list("pk", "organization_id"))
+            result = super().delete()
+            record_changes(deleted=[(org_id, ChangeLogEntry.Entity.COMMENT, pk) for pk, org_id in rows])
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class TaskComment(models.Model):
     task = models.ForeignKey(
@@ -84,12 +366,283 @@ class TaskComment(models.Model):
         on_delete=models.CASCADE,
         related_name="comments",
     )
+    # Copy of task.organization, set when the comment is created
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name="task_comments",
+        editable=False,
+    )
     content = models.TextField()
     author_email = models.EmailField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TaskCommentQuerySet.as_manager()
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="comment_task_created_idx"),
+            # Tenant-scoped look-ups by id; the (organization_id, task_id)
+            # reference of a partitioned task table (see partitioning.py)
+            models.Index(fields=["organization", "task"], name="comment_org_task_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Comment by {self.author_email} on {self.task_id}"
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(TaskComment, instance=self)
+        if self.organization_id is None or TaskComment.task.is_cached(self):
+            self.organization_id = self.task.organization_id
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            record_changes(changed=[(self.organization_id, ChangeLogEntry.Entity.COMMENT, self.pk)])
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(TaskComment, instance=self)
+        pk = self.pk
+        with transaction.atomic(using=using, savepoint=False):
+            result = super().delete(*args, **kwargs)
+            record_changes(deleted=[(self.organization_id, ChangeLogEntry.Entity.COMMENT, pk)])
+        return result
+
+
+class ProjectPurgeJob(models.Model):
+    """
+    Deletes a soft-deleted project in the background (see purge.py):
+    comments, then tasks, then the project row, in bounded chunks.
+    Progress is committed with every chunk, so a crashed worker's job
+    is picked up again where it stopped once its lease expires.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    class Stage(models.TextChoices):
+        COMMENTS = "COMMENTS", "Comments"
+        TASKS = "TASKS", "Tasks"
+        PROJECT = "PROJECT", "Project"
+
+    # Plain ids: the project row is gone once the job is done
+    project_id = models.BigIntegerField(unique=True)
+    organization_id = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    stage = models.CharField(max_length=20, choices=Stage.choices, default=Stage.COMMENTS)
+    comments_deleted = models.PositiveBigIntegerField(default=0)
+    tasks_deleted = models.PositiveBigIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # A RUNNING job whose lease has expired belongs to a dead worker
+    locked_until = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="purge_job_status_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Purge of project {self.project_id} [{self.status} {self.stage}]"
+
+
+class ChangeSequence(models.Model):
+    """Last change sequence number handed out in an organization (see record_changes)."""
+
+    organization = models.OneToOneField(Organization, on_delete=models.CASCADE, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Change sequence of {self.organization_id}: {self.value}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    The latest change of one project, task or comment, for incremental sync
+    (changesSince, see changes.py):
+    - one row per entity, re-stamped with a new sequence number on every write
+    - deleted=True rows are tombstones; children of a deleted project or task
+      are not logged separately
+    """
+
+    class Entity(models.TextChoices):
+        PROJECT = "PROJECT", "Project"
+        TASK = "TASK", "Task"
+        COMMENT = "COMMENT", "Comment"
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="+")
+    entity = models.CharField(max_length=20, choices=Entity.choices)
+    entity_id = models.BigIntegerField()
+    seq = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["organization", "seq"]
+        constraints = [
+            models.UniqueConstraint(fields=["organization", "entity", "entity_id"], name="changelog_entity_uniq"),
+        ]
+        indexes = [
+            # changesSince: seq > cursor within one organization
+            models.Index(fields=["organization", "seq"], name="changelog_org_seq_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.entity} {self.entity_id} @{self.seq}{' (deleted)' if self.deleted else ''}"
+
+
+def task_status_counts(prefix=""):
+    """
+    Conditional Count() aggregates for a project's tasks, computed in one pass:
+    - prefix="tasks__" when aggregating from Project
+    - prefix="" when grouping Task rows by project_id
+    """
+    counts = {"tasks_total": Count(f"{prefix}id")}
+    for status in Task.Status:
+        counts[f"tasks_{status.value.lower()}"] = Count(
+            f"{prefix}id", filter=Q(**{f"{prefix}status": status})
+        )
+    return counts
+
+
+# Project counter column per task status
+PROJECT_COUNTER_FIELDS = {status.value: f"{status.value.lower()}_count" for status in Task.Status}
+
+
+def update_project_counters(deltas, sign=1):
+    """
+    Apply {(project_id, status): n} task deltas to the Project counter columns.
+    - One UPDATE for all projects: column = column + CASE pk WHEN ... END
+    - Runs inside the caller's transaction, next to the task write
+    """
+    per_project = defaultdict(Counter)
+    for (project_id, status), n in deltas.items():
+        if n:
+            per_project[project_id][PROJECT_COUNTER_FIELDS[status]] += sign * n
+            per_project[project_id]["task_count"] += sign * n
+
+    updates = {}
+    for field in ["task_count", *PROJECT_COUNTER_FIELDS.values()]:
+        whens = [
+            When(pk=project_id, then=Value(counts[field]))
+            for project_id, counts in per_project.items()
+            if counts[field]
+        ]
+        if whens:
+            updates[field] = F(field) + Case(*whens, default=Value(0))
+
+    if updates:
+        Project.objects.filter(pk__in=per_project).update(**updates, updated_at=timezone.now())
+
+
+def recompute_project_counters(project_ids):
+    """
+    Recount tasks for the given projects and fix drifted counter columns.
+    Returns the number of projects that were corrected.
+    """
+    with transaction.atomic(savepoint=False):
+        projects = list(
+            Project.objects.select_for_update()
+            .filter(pk__in=project_ids)
+            .only("pk", "organization_id", "task_count", *PROJECT_COUNTER_FIELDS.values())
+        )
+        counts = {
+            row.pop("project_id"): row
+            for row in Task.objects.filter(project_id__in=[p.pk for p in projects])
+            .order_by()
+            .values("project_id")
+            .annotate(**task_status_counts())
+        }
+
+        drifted = []
+        for project in projects:
+            row = counts.get(project.pk, {})
+            expected = {"task_count": row.get("tasks_total", 0)}
+            for status, field in PROJECT_COUNTER_FIELDS.items():
+                expected[field] = row.get(f"tasks_{status.lower()}", 0)
+            if any(getattr(project, field) != value for field, value in expected.items()):
+                for field, value in expected.items():
+                    setattr(project, field, value)
+                project.updated_at = timezone.now()
+                drifted.append(project)
+
+        Project.objects.bulk_update(drifted, ["task_count", *PROJECT_COUNTER_FIELDS.values(), "updated_at"])
+        record_changes(changed=[(p.organization_id, ChangeLogEntry.Entity.PROJECT, p.pk) for p in drifted])
+    return len(drifted)
+
+
+def project_organization_ids(project_ids):
+    """{project_id: organization_id}, in one query."""
+    if not project_ids:
+        return {}
+    return dict(Project.objects.filter(pk__in=project_ids).values_list("pk", "organization_id"))
+
+
+def _next_change_seqs(organization_id, n):
+    """
+    Reserves n sequence numbers and returns the last one. The upsert locks
+    the organization's ChangeSequence row until the transaction ends.
+    """
+    table = ChangeSequence._meta.db_table
+    with connections[router.db_for_write(ChangeSequence)].cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (organization_id, value) VALUES (%s, %s)
+            ON CONFLICT (organization_id) DO UPDATE SET value = {table}.value + excluded.value
+            RETURNING value
+            """,
+            [organization_id, n],
+        )
+        return cursor.fetchone()[0]
+
+
+def record_changes(changed=(), deleted=()):
+    """
+    Stamps entities with the next numbers of their organization's change sequence.
+    - changed / deleted: (organization_id, entity, pk) triples; deleted wins
+    - Two statements per organization, inside the caller's transaction: the
+      sequence row stays locked until commit, so an organization's changes
+      become visible in sequence order and no cursor skips one in flight
+    - Also bumps each organization's response cache version: every write
+      path (model saves/deletes, queryset bulk writes, counter repairs,
+      imports) goes through here
+    """
+    entries = {}
+    for triples, is_deleted in ((changed, False), (deleted, True)):
+        for org_id, entity, pk in triples:
+            entries[org_id, entity, pk] = is_deleted
+    if not entries:
+        return
+
+    per_org = defaultdict(list)
+    for (org_id, entity, pk), is_deleted in entries.items():
+        per_org[org_id].append((entity, pk, is_deleted))
+
+    now = timezone.now()
+    log = []
+    with transaction.atomic(using=router.db_for_write(ChangeLogEntry), savepoint=False):
+        # Fixed order, so two multi-organization writes cannot deadlock
+        for org_id in sorted(per_org):
+            bump_org_version(org_id)
+            rows = per_org[org_id]
+            first = _next_change_seqs(org_id, len(rows)) - len(rows) + 1
+            log += [
+                ChangeLogEntry(
+                    organization_id=org_id, entity=entity, entity_id=pk,
+                    seq=first + i, deleted=is_deleted, changed_at=now,
+                )
+                for i, (entity, pk, is_deleted) in enumerate(rows)
+            ]
+        ChangeLogEntry.objects.bulk_create(
+            log,
+            update_conflicts=True,
+            unique_fields=["organization", "entity", "entity_id"],
+            update_fields=["seq", "deleted", "changed_at"],
+        )
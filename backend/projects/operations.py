@@ -0,0 +1,195 @@
+# GraphQL documents sent by the React client (frontend/src/components).
+# Kept verbatim so benchmarks and query-budget tests exercise real traffic.
+
+GET_PROJECTS = """
+  query GetProjects {
+    projects {
+      id
+      name
+      description
+      status
+      dueDate
+      tasks {
+        id
+        title
+        status
+      }
+    }
+  }
+"""
+
+GET_PROJECT_DETAIL = """
+  query GetProjectDetail($id: ID!) {
+    project(id: $id) {
+      id
+      name
+      description
+      status
+      tasks {
+        id
+        title
+        description
+        status
+        assigneeEmail
+        dueDate
+        comments(first: 20) {
+          id
+          content
+          authorEmail
+          createdAt
+        }
+      }
+    }
+  }
+"""
+
+CREATE_PROJECT = """
+  mutation CreateProject(
+    $name: String!
+    $description: String
+    $status: String!
+    $dueDate: Date
+  ) {
+    createProject(
+      name: $name
+      description: $description
+      status: $status
+      dueDate: $dueDate
+    ) {
+      project {
+        id
+        name
+        status
+        dueDate
+      }
+    }
+  }
+"""
+
+CREATE_TASK = """
+  mutation CreateTask(
+    $projectId: ID!
+    $title: String!
+    $description: String
+    $status: String
+    $assigneeEmail: String!
+    $dueDate: Date
+  ) {
+    createTask(
+      projectId: $projectId
+      title: $title
+      description: $description
+      status: $status
+      assigneeEmail: $assigneeEmail
+      dueDate: $dueDate
+    ) {
+      task {
+        id
+      }
+    }
+  }
+"""
+
+UPDATE_TASK_STATUS = """
+  mutation UpdateTaskStatus($taskId: ID!, $status: String!) {
+    updateTaskStatus(taskId: $taskId, status: $status) {
+      task {
+        id
+      }
+    }
+  }
+"""
+
+DELETE_TASK = """
+  mutation DeleteTask($taskId: ID!) {
+    deleteTask(taskId: $taskId) {
+      ok
+    }
+  }
+"""
+
+DELETE_PROJECT = """
+  mutation DeleteProject($projectId: ID!) {
+    deleteProject(projectId: $projectId) {
+      ok
+    }
+  }
+"""
+
+# The client has no comment form wired up yet; this mirrors the addTaskComment
+# mutation so benchmarks cover comment writes.
+ADD_TASK_COMMENT = """
+  mutation AddTaskComment($taskId: ID!, $content: String!, $authorEmail: String!) {
+    addTaskComment(taskId: $taskId, content: $content, authorEmail: $authorEmail) {
+      comment {
+        id
+        content
+        authorEmail
+        createdAt
+      }
+    }
+  }
+"""
+
+# Dashboard aggregates; no client screen uses them yet.
+GET_ORG_STATS = """
+  query GetOrgStats($weeks: Int) {
+    orgStats(weeks: $weeks) {
+      taskCount
+      overdueCount
+      statusBreakdown { todo inProgress done }
+      projects {
+        projectId
+        name
+        taskCount
+        overdueCount
+        statusBreakdown { todo inProgress done }
+      }
+      assignees {
+        assigneeEmail
+        taskCount
+        overdueCount
+        statusBreakdown { todo inProgress done }
+      }
+      weeks { weekStart created completed }
+    }
+  }
+"""
+
+# Incremental sync poll (changes.py); no client screen uses it yet.
+GET_CHANGES = """
+  query GetChanges($cursor: String, $limit: Int) {
+    changesSince(cursor: $cursor, limit: $limit) {
+      cursor
+      hasMore
+      deleted { entity id }
+      projects { id name description status dueDate taskCount updatedAt }
+      tasks { id title description status assigneeEmail dueDate updatedAt project { id } }
+      comments { id content authorEmail createdAt task { id } }
+    }
+  }
+"""
+
+# Maximum SQL queries per operation, tenant lookup included. The count must
+# not grow with the number of projects, tasks or comments
+# (see projects/tests/tests_query_budgets.py). Writes include the change
+# sequence and change log statements (record_changes).
+QUERY_BUDGETS = {
+    "GetProjects": 3,
+    "GetProjectDetail": 4,
+    "CreateProject": 4,
+    "CreateTask": 6,
+    "UpdateTaskStatus": 7,
+    "AddTaskComment": 5,
+    "DeleteTask": 8,
+    "DeleteProject": 8,
+    "GetOrgStats": 6,
+    "GetChanges": 6,
+}
+
+# p95 latency (ms) per operation on the largest tenant of
+# "seed_benchmark_data --scale large", checked by run_benchmark --check-latency.
+# GetOrgStats is measured uncached: mix it with writes, which invalidate it.
+LATENCY_BUDGETS_MS = {
+    "GetOrgStats": 300,
+}
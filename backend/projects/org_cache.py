@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+# --------------------
+# Process-local tenant cache
+# --------------------
+
+
+class OrganizationCache:
+    """
+    slug -> Organization cache shared by all requests in this process:
+    - LRU, bounded to max_size entries
+    - Entries expire after ttl seconds, which bounds staleness for writes
+      made by other workers (signals only reach this process)
+    - Cleared on Organization post_save/post_delete (see signals.py)
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, load):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            # Skip the store if an invalidation raced with the load
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+org_cache = OrganizationCache(
+    max_size=getattr(settings, "ORG_CACHE_MAX_SIZE", 1024),
+    ttl=getattr(settings, "ORG_CACHE_TTL", 60),
+)
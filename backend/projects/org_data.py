@@ -0,0 +1,346 @@
+import csv
+import itertools
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date
+
+from .models import Organization, Project, Task, TaskComment
+
+
+# --------------------
+# Organization export / import (NDJSON or CSV)
+# --------------------
+# One record per line, parents before children:
+#   organization, then every project, then tasks in chunks, each chunk
+#   followed by the comments of its tasks.
+# "ref" is the row's id in the exporting database. Tasks point at their
+# project's ref and comments at their task's ref. created_at is exported
+# for reference only; imported rows get the import time.
+
+FORMATS = ("ndjson", "csv")
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+RECORD_FIELDS = {
+    "organization": ("name", "slug", "contact_email"),
+    "project": ("ref", "name", "description", "status", "due_date", "created_at"),
+    "task": (
+        "ref",
+        "project",
+        "title",
+        "description",
+        "status",
+        "assignee_email",
+        "due_date",
+        "created_at",
+    ),
+    "comment": ("task", "content", "author_email", "created_at"),
+}
+
+# CSV rows share one header; columns a record type does not use stay empty
+CSV_COLUMNS = ("type", *dict.fromkeys(f for fields in RECORD_FIELDS.values() for f in fields))
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+# ----- export -----
+
+
+def export_records(org, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the organization's rows as dicts. Rows are streamed with
+    .iterator(chunk_size), so memory does not depend on the tenant size.
+    """
+    yield {
+        "type": "organization",
+        "name": org.name,
+        "slug": org.slug,
+        "contact_email": org.contact_email,
+    }
+
+    projects = (
+        Project.objects.visible()
+        .filter(organization=org)
+        .order_by("pk")
+        .values_list("pk", "name", "description", "status", "due_date", "created_at")
+    )
+    for row in projects.iterator(chunk_size=chunk_size):
+        yield {"type": "project", **dict(zip(RECORD_FIELDS["project"], row))}
+
+    tasks = (
+        Task.objects.visible()
+        .filter(organization=org)
+        .order_by("pk")
+        .values_list(
+            "pk",
+            "project_id",
+            "title",
+            "description",
+            "status",
+            "assignee_email",
+            "due_date",
+            "created_at",
+        )
+    )
+    for chunk in batched(tasks.iterator(chunk_size=chunk_size), chunk_size):
+        for row in chunk:
+            yield {"type": "task", **dict(zip(RECORD_FIELDS["task"], row))}
+        # One query per chunk keeps comments next to their tasks
+        comments = (
+            TaskComment.objects.filter(task_id__in=[row[0] for row in chunk])
+            .order_by("task_id", "pk")
+            .values_list("task_id", "content", "author_email", "created_at")
+        )
+        for row in comments.iterator(chunk_size=chunk_size):
+            yield {"type": "comment", **dict(zip(RECORD_FIELDS["comment"], row))}
+
+
+def serialize(records, fmt):
+    """Yields the records as NDJSON lines or CSV rows (with a header)."""
+    if fmt == "ndjson":
+        for record in records:
+            yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for record in records:
+        yield writer.writerow([_csv_value(record.get(column)) for column in CSV_COLUMNS])
+
+
+class _Echo:
+    """File-like object for csv.writer: writerow() returns the line."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+# ----- import -----
+
+
+def parse(lines, fmt):
+    """Yields (line number, record dict) from NDJSON or CSV text lines."""
+    if fmt == "ndjson":
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {number}: invalid JSON ({e}).")
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {number}: expected a JSON object.")
+            yield number, record
+        return
+
+    reader = csv.DictReader(lines)
+    for record in reader:
+        # Empty CSV cells mean "no value", like null in NDJSON
+        yield reader.line_num, {k: v for k, v in record.items() if k and v != ""}
+
+
+class OrgImporter:
+    """
+    Writes records into one organization with chunked bulk_create:
+    - task.project is a project ref from the same stream, or the id of a
+      project already in the organization (looked up once per batch)
+    - comment.task is a task ref from the same stream, after that task
+    Project refs are kept for the whole import; task refs only until the
+    next task after a run of comments, so memory stays flat on exports.
+    """
+
+    def __init__(self, org, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.org = org
+        self.chunk_size = chunk_size
+        self.counts = {"projects": 0, "tasks": 0, "comments": 0}
+        self.project_ids = {}
+        self.task_ids = {}
+        self.pending_projects = []
+        self.pending_tasks = []
+        self.pending_comments = []
+        self.after_comments = False
+
+    def add(self, number, record):
+        kind = record.get("type")
+        if kind not in RECORD_FIELDS:
+            raise ValueError(f"Line {number}: unknown record type {kind!r}.")
+        if kind == "organization":
+            return
+
+        if kind == "project":
+            project = Project(
+                organization=self.org,
+                name=_required(record, "name", number),
+                description=record.get("description") or "",
+                status=_choice(record, Project.Status, number),
+                due_date=_date(record, number),
+            )
+            self.pending_projects.append((_ref(record.get("ref")), project))
+            if len(self.pending_projects) >= self.chunk_size:
+                self.flush_projects()
+
+        elif kind == "task":
+            if self.after_comments:
+                # A new group of tasks: earlier task refs are no longer needed
+                self.flush_comments()
+                self.task_ids.clear()
+                self.after_comments = False
+            task = Task(
+                title=_required(record, "title", number),
+                description=record.get("description") or "",
+                status=_choice(record, Task.Status, number),
+                assignee_email=_required(record, "assignee_email", number),
+                due_date=_date(record, number),
+            )
+            project_ref = _ref(_required(record, "project", number))
+            self.pending_tasks.append((_ref(record.get("ref")), project_ref, task, number))
+            if len(self.pending_tasks) >= self.chunk_size:
+                self.flush_tasks()
+
+        else:
+            self.after_comments = True
+            task_ref = _ref(_required(record, "task", number))
+            if task_ref not in self.task_ids:
+                # Its task may still be waiting in the current batch
+                self.flush_tasks()
+            if task_ref not in self.task_ids:
+                raise ValueError(
+                    f"Line {number}: comment refers to unknown task {task_ref!r} "
+                    "(comments must follow their task)."
+                )
+            self.pending_comments.append(
+                TaskComment(
+                    task_id=self.task_ids[task_ref],
+                    content=_required(record, "content", number),
+                    author_email=_required(record, "author_email", number),
+                )
+            )
+            if len(self.pending_comments) >= self.chunk_size:
+                self.flush_comments()
+
+    def flush_projects(self):
+        if not self.pending_projects:
+            return
+        created = Project.objects.bulk_create([project for _, project in self.pending_projects])
+        for (ref, _), project in zip(self.pending_projects, created):
+            if ref is not None:
+                self.project_ids[ref] = project.pk
+        self.counts["projects"] += len(created)
+        self.pending_projects = []
+
+    def flush_tasks(self):
+        if not self.pending_tasks:
+            return
+        self.flush_projects()
+        self.resolve_projects({project_ref for _, project_ref, _, _ in self.pending_tasks})
+        for _, project_ref, task, number in self.pending_tasks:
+            if project_ref not in self.project_ids:
+                raise ValueError(f"Line {number}: unknown project {project_ref!r}.")
+            task.project_id = self.project_ids[project_ref]
+
+        created = Task.objects.bulk_create([task for _, _, task, _ in self.pending_tasks])
+        for (ref, _, _, _), task in zip(self.pending_tasks, created):
+            if ref is not None:
+                self.task_ids[ref] = task.pk
+        self.counts["tasks"] += len(created)
+        self.pending_tasks = []
+
+    def resolve_projects(self, refs):
+        """Maps refs not defined in the stream to existing projects of the org."""
+        ids = [int(ref) for ref in refs - self.project_ids.keys() if ref.isdigit()]
+        if ids:
+            for pk in (
+                Project.objects.visible()
+                .filter(organization=self.org, pk__in=ids)
+                .values_list("pk", flat=True)
+            ):
+                self.project_ids[str(pk)] = pk
+
+    def flush_comments(self):
+        if not self.pending_comments:
+            return
+        TaskComment.objects.bulk_create(self.pending_comments)
+        self.counts["comments"] += len(self.pending_comments)
+        self.pending_comments = []
+
+    def finish(self):
+        self.flush_tasks()
+        self.flush_comments()
+        self.flush_projects()
+        return self.counts
+
+
+def import_records(records, org=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Imports (line number, record) pairs. Without an org, the stream's
+    organization record names it (created if missing).
+    Returns (org, counts). Callers wrap this in a transaction.
+    """
+    importer = None
+    for number, record in records:
+        if importer is None:
+            if org is None:
+                if record.get("type") != "organization":
+                    raise ValueError(
+                        f"Line {number}: no organization given and the data does not start with one."
+                    )
+                slug = _required(record, "slug", number)
+                org, _ = Organization.objects.get_or_create(
+                    slug=slug,
+                    defaults={
+                        "name": record.get("name") or slug,
+                        "contact_email": record.get("contact_email"),
+                    },
+                )
+            importer = OrgImporter(org, chunk_size)
+        importer.add(number, record)
+
+    if importer is None:
+        raise ValueError("No records to import.")
+    return org, importer.finish()
+
+
+def _ref(value):
+    return None if value is None else str(value)
+
+
+def _required(record, field, number):
+    value = record.get(field)
+    if value is None or value == "":
+        raise ValueError(f"Line {number}: {record.get('type')} is missing {field!r}.")
+    return value
+
+
+def _choice(record, choices, number):
+    value = record.get("status") or choices.values[0]
+    if value not in choices.values:
+        raise ValueError(f"Line {number}: invalid status {value!r}.")
+    return value
+
+
+def _date(record, number):
+    value = record.get("due_date")
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"Line {number}: invalid due_date {value!r}.")
+    return parsed
@@ -0,0 +1,123 @@
+import base64
+from datetime import datetime
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+
+# --------------------
+# Keyset (cursor) pagination over (created_at, id)
+# --------------------
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, pk = raw.split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except ValueError:
+        raise Exception("Invalid cursor.")
+
+
+def _seek(qs, cursor, older):
+    created_at, pk = decode_cursor(cursor)
+    if older:
+        return qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    return qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+
+
+def _page_sizes(first, last):
+    for size in (first, last):
+        if size is not None and not 0 <= size <= MAX_PAGE_SIZE:
+            raise Exception(f"Page size must be between 0 and {MAX_PAGE_SIZE}.")
+
+    if first is None and last is None:
+        first = DEFAULT_PAGE_SIZE
+    return first, last
+
+
+def page_queryset(qs, first=None, after=None, last=None, before=None):
+    """The single seek query paginate() runs (exposed for EXPLAIN)."""
+    first, last = _page_sizes(first, last)
+
+    if after:
+        qs = _seek(qs, after, older=True)
+    if before:
+        qs = _seek(qs, before, older=False)
+
+    if first is None:
+        return qs.order_by("created_at", "pk")[: last + 1]
+    return qs.order_by("-created_at", "-pk")[: first + 1]
+
+
+def page_per_group(qs, group_by, first=None, after=None):
+    """
+    The newest `first` rows of every group in one windowed query:
+    ROW_NUMBER() OVER (PARTITION BY group_by ORDER BY created_at DESC, id DESC)
+    - after seeks past a cursor, for every group alike
+    - rows come back grouped, newest first within each group
+    """
+    first, _ = _page_sizes(first, None)
+    if after:
+        qs = _seek(qs, after, older=True)
+    return (
+        qs.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F(group_by),
+                order_by=[F("created_at").desc(), F("pk").desc()],
+            )
+        )
+        .filter(row_number__lte=first)
+        .order_by(group_by, "-created_at", "-pk")
+    )
+
+
+def paginate(qs, first=None, after=None, last=None, before=None):
+    """
+    Page through qs newest-first, the same order as Project/Task Meta.ordering.
+    - after/before become WHERE seeks, never OFFSET, so every page costs the same
+    - One extra row is fetched to know whether another page exists
+    Returns (rows, page_info) where page_info matches relay.PageInfo fields.
+    """
+    rows = list(page_queryset(qs, first, after, last, before))
+    return build_page(rows, first, after, last, before)
+
+
+async def apaginate(qs, first=None, after=None, last=None, before=None):
+    """paginate() for async resolvers."""
+    rows = [row async for row in page_queryset(qs, first, after, last, before)]
+    return build_page(rows, first, after, last, before)
+
+
+def build_page(rows, first, after, last, before):
+    first, last = _page_sizes(first, last)
+
+    if first is None:
+        # Walked backwards from `before`, restore newest-first order
+        has_previous_page = len(rows) > last
+        rows = rows[:last][::-1]
+        has_next_page = bool(before)
+    else:
+        has_next_page = len(rows) > first
+        rows = rows[:first]
+        has_previous_page = bool(after)
+        if last is not None and len(rows) > last:
+            rows = rows[len(rows) - last:]
+            has_previous_page = True
+
+    page_info = {
+        "has_next_page": has_next_page,
+        "has_previous_page": has_previous_page,
+        "start_cursor": encode_cursor(rows[0]) if rows else None,
+        "end_cursor": encode_cursor(rows[-1]) if rows else None,
+    }
+    return rows, page_info
@@ -0,0 +1,226 @@
+from django.db import transaction
+
+
+# --------------------
+# PostgreSQL declarative partitioning of projects_task by organization
+# --------------------
+# Optional (TASK_PARTITIONING, migration 0011 or manage.py partition_tasks).
+# projects_task becomes PARTITION BY LIST (organization_id):
+# - projects_task_default holds every tenant without a partition of its own
+# - partition_tasks --tenant gives a very large tenant its own partition
+# Every resolver filters on organization_id, so its queries touch one
+# partition. PostgreSQL wants the partition key in every unique constraint:
+# - the primary key is (id, organization_id); ids still come from one
+#   sequence, and the key still serves look-ups by id alone
+# - comments reference (task_id, organization_id) instead of task_id
+# - no other table may reference projects_task: the conversion refuses to
+#   run while one does, and a later foreign key to Task must be on
+#   (id, organization_id) too
+# Django knows nothing of this: a later migration that alters
+# TaskComment.task must drop and recreate the composite foreign key itself.
+
+TABLE = "projects_task"
+NEW_TABLE = "projects_task_partitioned"
+DEFAULT_PARTITION = "projects_task_default"
+SEQUENCE = "projects_task_id_seq_partitioned"
+COMMENT_TABLE = "projects_taskcomment"
+COMMENT_FK = "projects_taskcomment_task_org_fk"
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Rows written this long before the copy started are copied again at the
+# swap: updated_at comes from the application servers' clocks
+CLOCK_SKEW_MARGIN = "5 minutes"
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = %s::regclass", [TABLE])
+        return cursor.fetchone()[0]
+
+
+def tenant_partitions(connection):
+    """{organization_id: partition name} of tenants with their own partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [TABLE],
+        )
+        rows = cursor.fetchall()
+    # Bounds read "FOR VALUES IN ('42')" (or "DEFAULT")
+    return {
+        int(bound.split("(")[1].strip("')")): name
+        for name, bound in rows
+        if bound != "DEFAULT"
+    }
+
+
+def _columns(connection, model):
+    # Every model column; search_vector is generated, so never inserted
+    return ", ".join(connection.ops.quote_name(field.column) for field in model._meta.concrete_fields)
+
+
+def _referencing_fks(connection):
+    """[(table, constraint name)] of every foreign key that references projects_task."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = %s::regclass
+            ORDER BY 1, 2
+            """,
+            [TABLE],
+        )
+        return cursor.fetchall()
+
+
+def _comment_fk_names(connection):
+    """
+    The comment foreign keys, which the swap re-creates on (task_id,
+    organization_id). Any other reference would block DROP TABLE, and with
+    the (id, organization_id) key a single-column one has nothing to target.
+    """
+    fks = _referencing_fks(connection)
+    others = [f"{name} on {table}" for table, name in fks if table != COMMENT_TABLE]
+    if others:
+        raise Exception(
+            f"{TABLE} is referenced by {', '.join(others)}. Partitioning needs every foreign key "
+            "to a task to be on (id, organization_id): change or drop those first."
+        )
+    return [name for table, name in fks if table == COMMENT_TABLE]
+
+
+def convert_task_table(schema_editor, model, batch_size=DEFAULT_BATCH_SIZE, log=None):
+    """
+    Rebuilds projects_task as a partitioned table while it stays in use:
+    - copies the rows in id order, one batch per transaction
+    - then, with writes blocked (reads go on), re-copies rows written
+      since the copy started, drops deleted ones and swaps the tables
+    Returns False if the table is partitioned already; raises if a table
+    other than projects_taskcomment references it.
+    model is the Task model (the historical one in migrations).
+    """
+    connection = schema_editor.connection
+    log = log or (lambda message: None)
+    if is_partitioned(connection):
+        return False
+    # Refuse before copying anything; checked again under the swap's lock
+    _comment_fk_names(connection)
+    columns = _columns(connection, model)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {NEW_TABLE}")
+        cursor.execute(f"DROP SEQUENCE IF EXISTS {SEQUENCE}")
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE}")
+        cursor.execute(
+            f"""
+            CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)
+            PARTITION BY LIST (organization_id)
+            """
+        )
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} ADD PRIMARY KEY (id, organization_id)")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {NEW_TABLE} DEFAULT")
+        cursor.execute(f"SELECT now() - interval '{CLOCK_SKEW_MARGIN}'")
+        since = cursor.fetchone()[0]
+
+    last_id, copied = 0, 0
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH copied AS (
+                    INSERT INTO {NEW_TABLE} ({columns})
+                    SELECT {columns} FROM {TABLE} WHERE id > %s ORDER BY id LIMIT %s
+                    RETURNING id
+                )
+                SELECT MAX(id), COUNT(*) FROM copied
+                """,
+                [last_id, batch_size],
+            )
+            batch_last, n = cursor.fetchone()
+        if not n:
+            break
+        last_id, copied = batch_last, copied + n
+        log(f"Copied {copied} tasks")
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # Writers wait until the swap commits
+        cursor.execute(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(
+            f"""
+            DELETE FROM {NEW_TABLE} n
+            WHERE NOT EXISTS (SELECT 1 FROM {TABLE} t WHERE t.id = n.id)
+               OR n.id IN (SELECT id FROM {TABLE} WHERE updated_at >= %s)
+            """,
+            [since],
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {NEW_TABLE} ({columns})
+            SELECT {columns} FROM {TABLE} WHERE id > %s OR updated_at >= %s
+            """,
+            [last_id, since],
+        )
+        log(f"Re-copied {cursor.rowcount} tasks written during the copy")
+        cursor.execute(f"SELECT setval('{SEQUENCE}', nextval(pg_get_serial_sequence('{TABLE}', 'id')))")
+
+        for name in _comment_fk_names(connection):
+            cursor.execute(f"ALTER TABLE {COMMENT_TABLE} DROP CONSTRAINT {connection.ops.quote_name(name)}")
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {NEW_TABLE}_pkey TO {TABLE}_pkey")
+        cursor.execute(f"ALTER SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+
+        # Indexes and foreign keys of the model, as the old table had them
+        for statement in schema_editor._model_indexes_sql(model):
+            cursor.execute(str(statement))
+        cursor.execute(f"CREATE INDEX task_search_vector_idx ON {TABLE} USING gin (search_vector)")
+        for field in (model._meta.get_field("project"), model._meta.get_field("organization")):
+            cursor.execute(str(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s")))
+        # NOT VALID: checking every comment would hold the lock longer
+        cursor.execute(
+            f"""
+            ALTER TABLE {COMMENT_TABLE} ADD CONSTRAINT {COMMENT_FK}
+            FOREIGN KEY (task_id, organization_id) REFERENCES {TABLE} (id, organization_id)
+            DEFERRABLE INITIALLY DEFERRED NOT VALID
+            """
+        )
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {COMMENT_TABLE} VALIDATE CONSTRAINT {COMMENT_FK}")
+    return True
+
+
+def create_tenant_partition(connection, model, organization_id):
+    """
+    Moves one tenant's tasks out of the default partition into their own.
+    One transaction: task writes wait for it, reads go on.
+    Returns the partition name, or None if the tenant already has one.
+    """
+    if organization_id in tenant_partitions(connection):
+        return None
+    columns = _columns(connection, model)
+    name = f"projects_task_org_{int(organization_id)}"
+    check = f"{name}_org_check"
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # A task of this tenant written to the default partition now would
+        # make the ATTACH fail
+        cursor.execute(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)")
+        cursor.execute(
+            f"""
+            WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE organization_id = %s RETURNING {columns})
+            INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            """,
+            [organization_id],
+        )
+        # Lets ATTACH skip scanning the new partition
+        cursor.execute(f"ALTER TABLE {name} ADD CONSTRAINT {check} CHECK (organization_id = {int(organization_id)})")
+        cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES IN ({int(organization_id)})")
+        cursor.execute(f"ALTER TABLE {name} DROP CONSTRAINT {check}")
+    return name
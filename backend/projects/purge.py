@@ -0,0 +1,146 @@
+import datetime
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ChangeLogEntry, Project, ProjectPurgeJob, Task, TaskComment, record_changes
+
+
+# --------------------
+# Soft delete + chunked background purge of projects
+# --------------------
+# DeleteProject only sets Project.deleted_at (every resolver filters on it)
+# and queues a ProjectPurgeJob. The purge_deleted_projects command then
+# deletes the rows with raw SQL, one chunk of rows per short transaction:
+# no deletion collector loading a whole project into memory, and no lock
+# held for longer than one chunk.
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# A worker renews its lease with every chunk; after this long without
+# progress the job is handed to another worker
+LEASE = datetime.timedelta(minutes=5)
+
+MAX_ATTEMPTS = 5
+
+# Stage -> (DELETE of up to %(limit)s rows of project %(project)s, progress counter).
+# {comment}/{task} are filled in with the models' quoted db_table names.
+STAGE_SQL = {
+    ProjectPurgeJob.Stage.COMMENTS: (
+        """
+        DELETE FROM {comment} WHERE organization_id = %(organization)s AND id IN (
+            SELECT c.id FROM {comment} c
+            JOIN {task} t ON t.id = c.task_id AND t.organization_id = c.organization_id
+            WHERE c.organization_id = %(organization)s AND t.project_id = %(project)s
+            LIMIT %(limit)s
+        )
+        """,
+        "comments_deleted",
+    ),
+    ProjectPurgeJob.Stage.TASKS: (
+        """
+        DELETE FROM {task} WHERE organization_id = %(organization)s AND id IN (
+            SELECT id FROM {task}
+            WHERE organization_id = %(organization)s AND project_id = %(project)s
+            LIMIT %(limit)s
+        )
+        """,
+        "tasks_deleted",
+    ),
+}
+
+NEXT_STAGE = {
+    ProjectPurgeJob.Stage.COMMENTS: ProjectPurgeJob.Stage.TASKS,
+    ProjectPurgeJob.Stage.TASKS: ProjectPurgeJob.Stage.PROJECT,
+}
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def soft_delete_project(project):
+    """Hides the project from every resolver at once and queues its purge."""
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(deleted_at=timezone.now(), updated_at=timezone.now())
+        ProjectPurgeJob.objects.create(project_id=project.pk, organization_id=project.organization_id)
+        # Sync clients drop the project's tasks and comments with it
+        record_changes(deleted=[(project.organization_id, ChangeLogEntry.Entity.PROJECT, project.pk)])
+
+
+def claim_job():
+    """Marks the oldest pending (or abandoned) job RUNNING for this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            ProjectPurgeJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ProjectPurgeJob.Status.PENDING)
+                | Q(status=ProjectPurgeJob.Status.RUNNING, locked_until__lt=now)
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ProjectPurgeJob.Status.RUNNING
+        job.locked_until = now + LEASE
+        job.attempts += 1
+        job.save(update_fields=["status", "locked_until", "attempts", "updated_at"])
+    return job
+
+
+def purge_chunk(job, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Runs one chunk of the job's current stage in its own transaction.
+    Returns False once the project row itself is gone.
+    """
+    with transaction.atomic():
+        if job.stage == ProjectPurgeJob.Stage.PROJECT:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {_table(Project)} WHERE id = %s", [job.project_id])
+            job.status = ProjectPurgeJob.Status.DONE
+            job.finished_at = timezone.now()
+            job.locked_until = None
+            job.save(update_fields=["status", "finished_at", "locked_until", "updated_at"])
+            return False
+
+        sql, counter = STAGE_SQL[job.stage]
+        sql = sql.format(comment=_table(TaskComment), task=_table(Task))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql, {"organization": job.organization_id, "project": job.project_id, "limit": chunk_size}
+            )
+            deleted = cursor.rowcount
+
+        updates = {
+            counter: F(counter) + deleted,
+            "locked_until": timezone.now() + LEASE,
+            "updated_at": timezone.now(),
+        }
+        if deleted < chunk_size:
+            updates["stage"] = NEXT_STAGE[job.stage]
+        ProjectPurgeJob.objects.filter(pk=job.pk).update(**updates)
+    job.refresh_from_db()
+    return True
+
+
+def run_job(job, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Purges until done. On error the job is retried later, up to MAX_ATTEMPTS."""
+    try:
+        while purge_chunk(job, chunk_size):
+            pass
+    except Exception as e:
+        failed = job.attempts >= MAX_ATTEMPTS
+        ProjectPurgeJob.objects.filter(pk=job.pk).update(
+            status=ProjectPurgeJob.Status.FAILED if failed else ProjectPurgeJob.Status.PENDING,
+            # Stages are idempotent: start over in case a comment raced in
+            # after the COMMENTS stage (its task can then not be deleted)
+            stage=ProjectPurgeJob.Stage.COMMENTS,
+            last_error=f"{type(e).__name__}: {e}",
+            locked_until=None,
+            updated_at=timezone.now(),
+        )
+        raise
+    return job
@@ -0,0 +1,140 @@
+from django.conf import settings
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLInt,
+    Undefined,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+    value_from_ast,
+)
+
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+# --------------------
+# Static query cost (computed from the document, before execution)
+# --------------------
+# - every object field costs its weight (default 1), scalars cost 0
+# - the weight is multiplied by the estimated size of every enclosing list:
+#   first/last when given, clamped to 0..MAX_PAGE_SIZE (connections default
+#   to DEFAULT_PAGE_SIZE; a negative size must not cancel out its siblings),
+#   GRAPHQL_LIST_SIZE_ESTIMATE for unbounded lists such as Project.tasks
+# - depth counts nested fields; introspection (__schema, __type) is free
+
+# (type name, field name) -> weight, for fields that cost more than a join
+FIELD_WEIGHTS = {
+    ("Query", "search"): 10,
+    ("Query", "orgStats"): 10,
+    ("Query", "changesSince"): 10,
+    ("Mutation", "bulkCreateTasks"): 10,
+    ("Mutation", "bulkUpdateTaskStatus"): 10,
+    ("Mutation", "bulkDeleteTasks"): 10,
+}
+
+PAGE_SIZE_ARGS = ("first", "last")
+
+
+def _list_size(parent_type, field_name, field, node, variables):
+    if any(arg in field.args for arg in PAGE_SIZE_ARGS):
+        for argument in node.arguments:
+            if argument.name.value in PAGE_SIZE_ARGS:
+                size = value_from_ast(argument.value, GraphQLInt, variables)
+                if size is not Undefined and size is not None:
+                    return min(max(size, 0), MAX_PAGE_SIZE)
+        return DEFAULT_PAGE_SIZE
+
+    if is_list_type(get_nullable_type(field.type)):
+        if field_name == "edges" and parent_type.name.endswith("Connection"):
+            # Already multiplied by the connection's page size
+            return 1
+        return settings.GRAPHQL_LIST_SIZE_ESTIMATE
+    return 1
+
+
+class _CostWalker:
+    def __init__(self, schema, fragments, variables):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables or {}
+
+    def walk(self, selection_set, parent_type, multiplier, depth):
+        """Returns (cost, max depth) of a selection set."""
+        cost, max_depth = 0, depth
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                fields = getattr(parent_type, "fields", {})
+                if name.startswith("__") or name not in fields:
+                    continue
+                field = fields[name]
+                max_depth = max(max_depth, depth + 1)
+                if selection.selection_set is None:
+                    cost += FIELD_WEIGHTS.get((parent_type.name, name), 0) * multiplier
+                    continue
+
+                cost += FIELD_WEIGHTS.get((parent_type.name, name), 1) * multiplier
+                size = _list_size(parent_type, name, field, selection, self.variables)
+                child_cost, child_depth = self.walk(
+                    selection.selection_set, get_named_type(field.type), multiplier * size, depth + 1
+                )
+                cost += child_cost
+                max_depth = max(max_depth, child_depth)
+            else:
+                if isinstance(selection, FragmentSpreadNode):
+                    fragment = self.fragments.get(selection.name.value)
+                    if fragment is None:
+                        continue
+                else:
+                    fragment = selection
+                fragment_type = parent_type
+                if fragment.type_condition is not None:
+                    fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                child_cost, child_depth = self.walk(
+                    fragment.selection_set, fragment_type, multiplier, depth
+                )
+                cost += child_cost
+                max_depth = max(max_depth, child_depth)
+        return cost, max_depth
+
+
+def analyze_query(schema, document, operation_ast, variables=None):
+    """{"cost": ..., "depth": ...} of one operation of a validated document."""
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    root_type = schema.get_root_type(operation_ast.operation)
+    cost, depth = _CostWalker(schema, fragments, variables).walk(
+        operation_ast.selection_set, root_type, 1, 0
+    )
+    return {"cost": cost, "depth": depth}
+
+
+def get_query_limits(org=None):
+    """(max depth, max cost): the organization's overrides, else the settings."""
+    max_depth = getattr(org, "max_query_depth", None) or settings.GRAPHQL_MAX_QUERY_DEPTH
+    max_cost = getattr(org, "max_query_cost", None) or settings.GRAPHQL_MAX_QUERY_COST
+    return max_depth, max_cost
+
+
+def check_query_cost(schema, document, operation_ast, variables=None, org=None):
+    """
+    Returns (cost info, error). The error is a GraphQLError when the
+    operation exceeds the depth or cost limit, otherwise None.
+    """
+    analysis = analyze_query(schema, document, operation_ast, variables)
+    max_depth, max_cost = get_query_limits(org)
+    info = {**analysis, "maxDepth": max_depth, "maxCost": max_cost}
+
+    if analysis["depth"] > max_depth:
+        message = f"Query depth {analysis['depth']} exceeds the limit of {max_depth}."
+    elif analysis["cost"] > max_cost:
+        message = f"Query cost {analysis['cost']} exceeds the limit of {max_cost}."
+    else:
+        return info, None
+    return info, GraphQLError(message, extensions={"code": "QUERY_TOO_COMPLEX", "cost": info})
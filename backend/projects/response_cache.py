@@ -0,0 +1,114 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+# --------------------
+# Tenant-versioned GraphQL response cache
+# --------------------
+# Every cached response key embeds the organization's current version.
+# Writes bump the version (after commit), so older entries are simply never
+# looked up again and age out via the cache timeout.
+
+
+def get_cache():
+    return caches[getattr(settings, "GRAPHQL_RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _version_key(org_id):
+    return f"gql:org-version:{org_id}"
+
+
+def get_org_version(org_id):
+    cache = get_cache()
+    version = cache.get(_version_key(org_id))
+    if version is None:
+        # Seed from the clock so a lost/evicted counter never repeats an old version
+        cache.add(_version_key(org_id), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(org_id))
+    return version
+
+
+def _bump(org_id):
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(org_id))
+    except ValueError:
+        cache.add(_version_key(org_id), time.time_ns(), timeout=None)
+
+
+def bump_org_version(org_id):
+    """
+    Invalidate every cached response of an organization.
+    Bumped now and again after commit: a read racing with the open
+    transaction may cache pre-commit data under the first bump.
+    """
+    if org_id is not None:
+        _bump(org_id)
+        transaction.on_commit(lambda: _bump(org_id))
+
+
+def response_cache_key(org_id, document_hash, variables, operation_name):
+    variables_hash = hashlib.sha256(
+        json.dumps(variables or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return ":".join(
+        [
+            "gql:response",
+            str(org_id),
+            str(get_org_version(org_id)),
+            document_hash,
+            variables_hash,
+            operation_name or "",
+        ]
+    )
+
+
+class ResponseCacheStats:
+    """Process-local counters (the cache itself may be shared)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_stored = 0
+
+    def record_lookup(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_store(self, size):
+        with self._lock:
+            self.bytes_stored += size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "bytes_stored": self.bytes_stored,
+            }
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_cached_response(key):
+    result = get_cache().get(key)
+    response_cache_stats.record_lookup(hit=result is not None)
+    return result
+
+
+def set_cached_response(key, result):
+    get_cache().set(key, result, getattr(settings, "GRAPHQL_RESPONSE_CACHE_TIMEOUT", 300))
+    response_cache_stats.record_store(len(result))
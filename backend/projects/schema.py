@@ -1,7 +1,18 @@
+import asyncio
+
 import graphene
+from django.db import transaction
 from graphene_django import DjangoObjectType
 
+from .broker import publish_comment_added, publish_tasks_changed, publish_tasks_changed_by_id
+from .changes import DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT, changes_since
+from .loaders import get_loaders, only_columns
 from .models import Organization, Project, Task, TaskComment
+from .org_cache import org_cache
+from .pagination import encode_cursor, paginate
+from .purge import soft_delete_project
+from .search import search
+from .stats import DEFAULT_WEEKS, MAX_WEEKS, get_org_stats
 
 
 # --------------------
@@ -15,10 +26,17 @@ class OrganizationType(DjangoObjectType):
         fields = ("id", "name", "slug", "contact_email", "created_at")
 
 
+class TaskStatusBreakdownType(graphene.ObjectType):
+    todo = graphene.Int()
+    in_progress = graphene.Int()
+    done = graphene.Int()
+
+
 class ProjectType(DjangoObjectType):
     # extra computed fields
     task_count = graphene.Int()
     completed_tasks = graphene.Int()
+    status_breakdown = graphene.Field(TaskStatusBreakdownType)
 
     class Meta:
         model = Project
@@ -29,18 +47,46 @@ class ProjectType(DjangoObjectType):
             "status",
             "due_date",
             "created_at",
+            "updated_at",
             "organization",
             "tasks",
         )
 
+    def resolve_organization(self, info):
+        return get_loaders(info).organization_by_id.load(self.organization_id)
+
+    def resolve_tasks(self, info):
+        return get_loaders(info).tasks_by_project.load(self.pk)
+
+    # Counters are stored on the project row (see update_project_counters)
+
     def resolve_task_count(self, info):
-        return self.tasks.count()
+        return self.task_count
 
     def resolve_completed_tasks(self, info):
-        return self.tasks.filter(status=Task.Status.DONE).count()
+        return self.done_count
+
+    def resolve_status_breakdown(self, info):
+        return {
+            "todo": self.todo_count,
+            "in_progress": self.in_progress_count,
+            "done": self.done_count,
+        }
 
 
 class TaskType(DjangoObjectType):
+    comments = graphene.List(
+        graphene.NonNull(lambda: TaskCommentType),
+        required=True,
+        first=graphene.Int(),
+        after=graphene.String(),
+        description=(
+            "The newest `first` comments (default 20, max 100), oldest first. "
+            "Pass the first comment's cursor as `after` to get the ones before it."
+        ),
+    )
+    comment_count = graphene.Int(required=True)
+
     class Meta:
         model = Task
         fields = (
@@ -51,12 +97,24 @@ class TaskType(DjangoObjectType):
             "assignee_email",
             "due_date",
             "created_at",
+            "updated_at",
             "project",
             "comments",
         )
 
+    def resolve_project(self, info):
+        return get_loaders(info).project_by_id.load(self.project_id)
+
+    def resolve_comments(self, info, first=None, after=None):
+        return get_loaders(info).comments_page(first, after).load(self.pk)
+
+    def resolve_comment_count(self, info):
+        return get_loaders(info).comment_count_by_task.load(self.pk)
+
 
 class TaskCommentType(DjangoObjectType):
+    cursor = graphene.String(required=True)
+
     class Meta:
         model = TaskComment
         fields = (
@@ -64,23 +122,153 @@ class TaskCommentType(DjangoObjectType):
             "content",
             "author_email",
             "created_at",
+            "updated_at",
             "task",
         )
 
+    def resolve_task(self, info):
+        return get_loaders(info).task_by_id.load(self.task_id)
+
+    def resolve_cursor(self, info):
+        return encode_cursor(self)
+
 
 # --------------------
-# Helper: get org from request (with safe fallback for dev)
+# Connections (keyset pagination, see pagination.py)
 # --------------------
 
 
-def get_request_org(request):
-    """
-    Multi-tenancy helper:
-    - Prefer X-ORG-SLUG header
-    - Fallback to first organization in dev so GraphiQL still works
-    """
-    org_slug = request.META.get("HTTP_X_ORG_SLUG")
+class CountableConnection(graphene.relay.Connection):
+    class Meta:
+        abstract = True
+
+    total_count = graphene.Int()
+
+    @classmethod
+    def from_queryset(cls, qs, rows, page_info):
+        connection = cls(
+            edges=[cls.Edge(node=row, cursor=encode_cursor(row)) for row in rows],
+            page_info=graphene.relay.PageInfo(**page_info),
+        )
+        # Only counted if totalCount is selected
+        connection.queryset = qs
+        return connection
+
+    def resolve_total_count(self, info):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self.queryset.count()
+        # On the ASGI view's event loop
+        return self.queryset.acount()
+
+
+class ProjectConnection(CountableConnection):
+    class Meta:
+        node = ProjectType
+
+
+class TaskConnection(CountableConnection):
+    class Meta:
+        node = TaskType
+
+
+# --------------------
+# Search (ranked tasks and comments, see search.py)
+# --------------------
+
+
+class SearchHitType(graphene.ObjectType):
+    kind = graphene.String()  # TASK or COMMENT
+    rank = graphene.Float()
+    task = graphene.Field(TaskType)  # the matched task, or the comment's task
+    comment = graphene.Field(TaskCommentType)
+
+
+class SearchConnection(graphene.relay.Connection):
+    class Meta:
+        node = SearchHitType
+
+    @classmethod
+    def from_hits(cls, hits, page_info):
+        return cls(
+            edges=[
+                cls.Edge(
+                    node=SearchHitType(
+                        kind=hit["kind"], rank=hit["rank"], task=hit["task"], comment=hit["comment"]
+                    ),
+                    cursor=hit["cursor"],
+                )
+                for hit in hits
+            ],
+            page_info=graphene.relay.PageInfo(**page_info),
+        )
+
+
+# --------------------
+# Dashboard statistics (see stats.py)
+# --------------------
+
+
+class ProjectStatsType(graphene.ObjectType):
+    project_id = graphene.ID(required=True)
+    name = graphene.String(required=True)
+    status = graphene.String(required=True)
+    task_count = graphene.Int(required=True)
+    status_breakdown = graphene.Field(TaskStatusBreakdownType, required=True)
+    overdue_count = graphene.Int(required=True)
+
+
+class AssigneeWorkloadType(graphene.ObjectType):
+    assignee_email = graphene.String(required=True)
+    task_count = graphene.Int(required=True)
+    status_breakdown = graphene.Field(TaskStatusBreakdownType, required=True)
+    overdue_count = graphene.Int(required=True)
 
+
+class WeeklyTaskCountType(graphene.ObjectType):
+    week_start = graphene.Date(required=True)  # Monday
+    created = graphene.Int(required=True)
+    completed = graphene.Int(required=True)
+
+
+class OrgStatsType(graphene.ObjectType):
+    generated_at = graphene.DateTime(required=True)
+    task_count = graphene.Int(required=True)
+    status_breakdown = graphene.Field(TaskStatusBreakdownType, required=True)
+    overdue_count = graphene.Int(required=True)  # due before today and not DONE
+    projects = graphene.List(graphene.NonNull(ProjectStatsType), required=True)
+    assignees = graphene.List(graphene.NonNull(AssigneeWorkloadType), required=True)
+    weeks = graphene.List(graphene.NonNull(WeeklyTaskCountType), required=True)
+
+
+# --------------------
+# Incremental sync (see changes.py)
+# --------------------
+
+
+class DeletedEntityType(graphene.ObjectType):
+    entity = graphene.String(required=True)  # PROJECT, TASK or COMMENT
+    id = graphene.ID(required=True)
+
+
+class ChangeSetType(graphene.ObjectType):
+    projects = graphene.List(graphene.NonNull(ProjectType), required=True)
+    tasks = graphene.List(graphene.NonNull(TaskType), required=True)
+    comments = graphene.List(graphene.NonNull(TaskCommentType), required=True)
+    deleted = graphene.List(graphene.NonNull(DeletedEntityType), required=True)
+    # Pass as changesSince(cursor:) on the next poll
+    cursor = graphene.String(required=True)
+    # More changes are waiting: poll again right away
+    has_more = graphene.Boolean(required=True)
+
+
+# --------------------
+# Helper: get org from request (with safe fallback for dev)
+# --------------------
+
+
+def _lookup_org(org_slug):
     if org_slug:
         try:
             return Organization.objects.get(slug=org_slug)
@@ -94,6 +282,58 @@ def get_request_org(request):
         return org
 
 
+def get_request_org(request):
+    """
+    Multi-tenancy helper:
+    - Prefer X-ORG-SLUG header
+    - Fallback to first organization in dev so GraphiQL still works
+    - Memoized on the request, and across requests by org_cache
+    """
+    org = getattr(request, "organization", None)
+    if org is None:
+        org_slug = request.META.get("HTTP_X_ORG_SLUG")
+        org = org_cache.get(org_slug, lambda: _lookup_org(org_slug))
+        request.organization = org
+    return org
+
+
+# --------------------
+# Tenant-scoped querysets shared by resolvers (and explain_queries)
+# --------------------
+
+
+def filter_projects(org, status=None):
+    qs = Project.objects.visible().filter(organization=org)
+
+    if status:
+        qs = qs.filter(status=status)
+
+    return qs
+
+
+def filter_tasks(org, project_id=None, status=None):
+    qs = Task.objects.visible().filter(organization=org)
+
+    if project_id:
+        qs = qs.filter(project_id=project_id)
+
+    if status:
+        qs = qs.filter(status=status)
+
+    return qs
+
+
+def select_project_fields(qs, info):
+    """Joins the organization and loads only the columns the operation selects."""
+    qs = qs.select_related("organization")
+    return only_columns(qs, get_loaders(info).columns)
+
+
+def select_task_fields(qs, info):
+    """Task columns are projected; projects come from the project_by_id loader."""
+    return only_columns(qs, get_loaders(info).columns)
+
+
 # --------------------
 # Queries
 # --------------------
@@ -121,29 +361,77 @@ class Query(graphene.ObjectType):
         id=graphene.ID(required=True),
     )
 
+    # Paginated variants (first/after/last/before added by ConnectionField)
+    projects_connection = graphene.relay.ConnectionField(
+        ProjectConnection,
+        status=graphene.Argument(graphene.String, required=False),
+    )
+    tasks_connection = graphene.relay.ConnectionField(
+        TaskConnection,
+        project_id=graphene.Argument(graphene.ID, required=False),
+        status=graphene.Argument(graphene.String, required=False),
+    )
+
+    # Full-text search over task titles/descriptions and comments
+    search = graphene.relay.ConnectionField(
+        SearchConnection,
+        query=graphene.String(required=True),
+        project_id=graphene.Argument(graphene.ID, required=False),
+        status=graphene.Argument(graphene.String, required=False),
+    )
+
+    # Dashboard aggregates for the whole organization
+    org_stats = graphene.Field(
+        graphene.NonNull(OrgStatsType),
+        weeks=graphene.Int(default_value=DEFAULT_WEEKS, description=f"Weeks of history (max {MAX_WEEKS})"),
+    )
+
+    # Entities created, updated or deleted since a previous sync
+    changes_since = graphene.Field(
+        graphene.NonNull(ChangeSetType),
+        cursor=graphene.String(description="cursor of the previous change set; empty for a full sync"),
+        limit=graphene.Int(
+            default_value=DEFAULT_CHANGES_LIMIT, description=f"Changes per call (max {MAX_CHANGES_LIMIT})"
+        ),
+    )
+
     # ----- Project resolvers -----
 
     def resolve_projects(self, info, status=None):
         request = info.context
         org = get_request_org(request)
 
-        qs = Project.objects.select_related("organization").filter(
-            organization=org
-        )
-
-        if status:
-            qs = qs.filter(status=status)
+        qs = select_project_fields(filter_projects(org, status), info)
 
-        return qs
+        projects = list(qs)
+        get_loaders(info).add_projects(projects)
+        return projects
 
     def resolve_project(self, info, id):
         request = info.context
         org = get_request_org(request)
 
-        return Project.objects.select_related("organization").get(
+        qs = select_project_fields(Project.objects.visible(), info)
+
+        project = qs.get(
             pk=id,
             organization=org,
         )
+        get_loaders(info).add_projects([project])
+        return project
+
+    def resolve_projects_connection(
+        self, info, status=None, first=None, after=None, last=None, before=None
+    ):
+        request = info.context
+        org = get_request_org(request)
+
+        qs = filter_projects(org, status)
+
+        page_qs = select_project_fields(qs, info)
+        projects, page_info = paginate(page_qs, first, after, last, before)
+        get_loaders(info).add_projects(projects)
+        return ProjectConnection.from_queryset(qs, projects, page_info)
 
     # ----- Task resolvers -----
 
@@ -151,26 +439,92 @@ class Query(graphene.ObjectType):
         request = info.context
         org = get_request_org(request)
 
-        qs = Task.objects.select_related("project", "project__organization").filter(
-            project__organization=org
+        qs = select_task_fields(filter_tasks(org, project_id, status), info)
+
+        tasks = list(qs)
+        get_loaders(info).add_tasks(tasks)
+        return tasks
+
+    def resolve_task(self, info, id):
+        request = info.context
+        org = get_request_org(request)
+
+        task = select_task_fields(Task.objects.visible(), info).get(
+            pk=id,
+            organization=org,
         )
+        get_loaders(info).add_tasks([task])
+        return task
 
-        if project_id:
-            qs = qs.filter(project_id=project_id)
+    def resolve_tasks_connection(
+        self,
+        info,
+        project_id=None,
+        status=None,
+        first=None,
+        after=None,
+        last=None,
+        before=None,
+    ):
+        request = info.context
+        org = get_request_org(request)
 
-        if status:
-            qs = qs.filter(status=status)
+        qs = filter_tasks(org, project_id, status)
 
-        return qs
+        page_qs = select_task_fields(qs, info)
+        tasks, page_info = paginate(page_qs, first, after, last, before)
+        get_loaders(info).add_tasks(tasks)
+        return TaskConnection.from_queryset(qs, tasks, page_info)
 
-    def resolve_task(self, info, id):
+    # ----- Stats resolver -----
+
+    def resolve_org_stats(self, info, weeks=DEFAULT_WEEKS):
         request = info.context
         org = get_request_org(request)
 
-        return Task.objects.select_related("project", "project__organization").get(
-            pk=id,
-            project__organization=org,
+        return get_org_stats(org, weeks)
+
+    # ----- Sync resolver -----
+
+    def resolve_changes_since(self, info, cursor=None, limit=DEFAULT_CHANGES_LIMIT):
+        request = info.context
+        org = get_request_org(request)
+
+        loaders = get_loaders(info)
+        changes = changes_since(
+            org,
+            cursor,
+            limit,
+            projects=select_project_fields(Project.objects.all(), info),
+            tasks=select_task_fields(Task.objects.all(), info),
+            comments=only_columns(TaskComment.objects.all(), loaders.columns),
         )
+        loaders.add_projects(changes["projects"])
+        loaders.add_tasks(changes["tasks"])
+        return changes
+
+    # ----- Search resolver -----
+
+    def resolve_search(
+        self,
+        info,
+        query,
+        project_id=None,
+        status=None,
+        first=None,
+        after=None,
+        last=None,
+        before=None,
+    ):
+        request = info.context
+        org = get_request_org(request)
+
+        if last is not None or before:
+            raise Exception("Search results only page forward (first/after).")
+
+        hits, page_info = search(org, query, project_id, status, first, after)
+        get_loaders(info).add_tasks(hit["task"] for hit in hits)
+        return SearchConnection.from_hits(hits, page_info)
 
 
 # --------------------
@@ -228,7 +582,7 @@ class CreateTask(graphene.Mutation):
         org = get_request_org(request)
 
         try:
-            project = Project.objects.get(pk=project_id, organization=org)
+            project = Project.objects.visible().get(pk=project_id, organization=org)
         except Project.DoesNotExist:
             raise Exception("Project not found in this organization.")
 
@@ -240,6 +594,7 @@ class CreateTask(graphene.Mutation):
             assignee_email=assignee_email,
             due_date=due_date,
         )
+        publish_tasks_changed(org.pk, [task])
         return CreateTask(task=task)
 
 
@@ -256,9 +611,8 @@ class UpdateTaskStatus(graphene.Mutation):
         org = get_request_org(request)
 
         try:
-            task = Task.objects.select_related("project", "project__organization").get(
-                pk=task_id,
-                project__organization=org,
+            task = (
+                Task.objects.visible().get(pk=task_id, organization=org)
             )
         except Task.DoesNotExist:
             raise Exception("Task not found in this organization.")
@@ -270,6 +624,7 @@ class UpdateTaskStatus(graphene.Mutation):
 
         task.status = status
         task.save()
+        publish_tasks_changed(org.pk, [task])
         return UpdateTaskStatus(task=task)
 
 
@@ -287,9 +642,8 @@ class AddTaskComment(graphene.Mutation):
         org = get_request_org(request)
 
         try:
-            task = Task.objects.select_related("project", "project__organization").get(
-                pk=task_id,
-                project__organization=org,
+            task = (
+                Task.objects.visible().get(pk=task_id, organization=org)
             )
         except Task.DoesNotExist:
             raise Exception("Task not found in this organization.")
@@ -299,6 +653,7 @@ class AddTaskComment(graphene.Mutation):
             content=content,
             author_email=author_email,
         )
+        publish_comment_added(org.pk, comment)
         return AddTaskComment(comment=comment)
 
 class DeleteTask(graphene.Mutation):
@@ -313,9 +668,8 @@ class DeleteTask(graphene.Mutation):
         org = get_request_org(request)
 
         try:
-            task = Task.objects.select_related("project", "project__organization").get(
-                pk=task_id,
-                project__organization=org,
+            task = (
+                Task.objects.visible().get(pk=task_id, organization=org)
             )
         except Task.DoesNotExist:
             raise Exception("Task not found in this organization.")
@@ -335,16 +689,182 @@ class DeleteProject(graphene.Mutation):
         org = get_request_org(request)
 
         try:
-            project = Project.objects.select_related("organization").get(
-                pk=project_id,
-                organization=org,
-            )
+            project = Project.objects.visible().get(pk=project_id, organization=org)
         except Project.DoesNotExist:
             raise Exception("Project not found in this organization.")
 
-        project.delete()
+        # Hidden at once; purge_deleted_projects deletes the rows in chunks
+        soft_delete_project(project)
         return DeleteProject(ok=True)
 
+
+# --------------------
+# Bulk mutations
+# --------------------
+
+BULK_MUTATION_MAX_ITEMS = 500
+
+
+class TaskInput(graphene.InputObjectType):
+    project_id = graphene.ID(required=True)
+    title = graphene.String(required=True)
+    description = graphene.String(required=False)
+    status = graphene.String(required=False)
+    assignee_email = graphene.String(required=True)
+    due_date = graphene.Date(required=False)
+
+
+class BulkTaskResult(graphene.ObjectType):
+    # index into the input list, so clients can match results to items
+    index = graphene.Int()
+    ok = graphene.Boolean()
+    task_id = graphene.ID()
+    task = graphene.Field(TaskType)
+    error = graphene.String()
+
+
+def _check_bulk_size(items):
+    if len(items) > BULK_MUTATION_MAX_ITEMS:
+        raise Exception(f"At most {BULK_MUTATION_MAX_ITEMS} items per request.")
+
+
+def _parse_ids(raw_ids):
+    """Map input index -> int id (None when the id is not numeric)."""
+    parsed = {}
+    for index, raw_id in enumerate(raw_ids):
+        try:
+            parsed[index] = int(raw_id)
+        except (TypeError, ValueError):
+            parsed[index] = None
+    return parsed
+
+
+def _bulk_error(index, message):
+    return BulkTaskResult(index=index, ok=False, error=message)
+
+
+def _id_results(ids, owned):
+    return [
+        BulkTaskResult(index=index, ok=True, task_id=pk)
+        if pk in owned
+        else _bulk_error(index, "Task not found in this organization.")
+        for index, pk in ids.items()
+    ]
+
+
+def _owned_task_ids(org, ids):
+    # One query validates tenant ownership of every id
+    return set(
+        Task.objects.visible()
+        .filter(pk__in=ids, organization=org)
+        .values_list("pk", flat=True)
+    )
+
+
+class BulkCreateTasks(graphene.Mutation):
+    class Arguments:
+        tasks = graphene.List(graphene.NonNull(TaskInput), required=True)
+
+    results = graphene.List(BulkTaskResult)
+
+    @staticmethod
+    def mutate(root, info, tasks):
+        request = info.context
+        org = get_request_org(request)
+        _check_bulk_size(tasks)
+
+        project_ids = _parse_ids([item.project_id for item in tasks])
+        # Instances, so the change log needs no second look-up of their organization
+        owned_projects = (
+            Project.objects.visible()
+            .filter(pk__in={pk for pk in project_ids.values() if pk is not None}, organization=org)
+            .only("pk", "organization_id")
+            .in_bulk()
+        )
+        valid_statuses = {choice[0] for choice in Task.Status.choices}
+
+        results = []
+        to_create = []
+        for index, item in enumerate(tasks):
+            if project_ids[index] not in owned_projects:
+                results.append(_bulk_error(index, "Project not found in this organization."))
+                continue
+            status = item.status or Task.Status.TODO.value
+            if status not in valid_statuses:
+                results.append(
+                    _bulk_error(index, f"Invalid status. Allowed: {', '.join(valid_statuses)}")
+                )
+                continue
+            task = Task(
+                project=owned_projects[project_ids[index]],
+                title=item.title,
+                description=item.description or "",
+                status=status,
+                assignee_email=item.assignee_email,
+                due_date=item.due_date,
+            )
+            to_create.append(task)
+            results.append(BulkTaskResult(index=index, ok=True, task=task))
+
+        with transaction.atomic():
+            Task.objects.bulk_create(to_create, batch_size=BULK_MUTATION_MAX_ITEMS)
+
+        for result in results:
+            if result.ok:
+                result.task_id = result.task.pk
+        if to_create:
+            publish_tasks_changed(org.pk, to_create)
+        return BulkCreateTasks(results=results)
+
+
+class BulkUpdateTaskStatus(graphene.Mutation):
+    class Arguments:
+        task_ids = graphene.List(graphene.NonNull(graphene.ID), required=True)
+        status = graphene.String(required=True)
+
+    results = graphene.List(BulkTaskResult)
+
+    @staticmethod
+    def mutate(root, info, task_ids, status):
+        request = info.context
+        org = get_request_org(request)
+        _check_bulk_size(task_ids)
+
+        valid_statuses = {choice[0] for choice in Task.Status.choices}
+        if status not in valid_statuses:
+            raise Exception(f"Invalid status. Allowed: {', '.join(valid_statuses)}")
+
+        ids = _parse_ids(task_ids)
+        with transaction.atomic():
+            owned = _owned_task_ids(org, {pk for pk in ids.values() if pk is not None})
+            # Single UPDATE ... WHERE id IN (...)
+            Task.objects.filter(pk__in=owned).update(status=status)
+
+        if owned:
+            publish_tasks_changed_by_id(org.pk, owned)
+        return BulkUpdateTaskStatus(results=_id_results(ids, owned))
+
+
+class BulkDeleteTasks(graphene.Mutation):
+    class Arguments:
+        task_ids = graphene.List(graphene.NonNull(graphene.ID), required=True)
+
+    results = graphene.List(BulkTaskResult)
+
+    @staticmethod
+    def mutate(root, info, task_ids):
+        request = info.context
+        org = get_request_org(request)
+        _check_bulk_size(task_ids)
+
+        ids = _parse_ids(task_ids)
+        with transaction.atomic():
+            owned = _owned_task_ids(org, {pk for pk in ids.values() if pk is not None})
+            # Comments are fast-deleted by task_id, then one DELETE for the tasks
+            Task.objects.filter(pk__in=owned).delete()
+        return BulkDeleteTasks(results=_id_results(ids, owned))
+
+
 class Mutation(graphene.ObjectType):
     create_project = CreateProject.Field()
     create_task = CreateTask.Field()
@@ -352,3 +872,6 @@ class Mutation(graphene.ObjectType):
     add_task_comment = AddTaskComment.Field()
     delete_task = DeleteTask.Field()
     delete_project = DeleteProject.Field()
+    bulk_create_tasks = BulkCreateTasks.Field()
+    bulk_update_task_status = BulkUpdateTaskStatus.Field()
+    bulk_delete_tasks = BulkDeleteTasks.Field()
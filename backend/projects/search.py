@@ -0,0 +1,158 @@
+import base64
+import re
+
+from django.db import connection
+
+from .models import Task, TaskComment
+from .pagination import _page_sizes
+
+
+# --------------------
+# Full-text search over tasks and comments (see migration 0004_search_index)
+# --------------------
+# PostgreSQL: generated tsvector columns (title A, description B, comment C)
+#             with GIN indexes, ranked by ts_rank_cd
+# SQLite:     projects_search_fts (FTS5) kept in sync by triggers,
+#             rowid = task.id * 2 or comment.id * 2 + 1, ranked by bm25
+# Both rank every match in the index, then filter to the tenant, so the
+# cost follows the number of matches, not the size of the tenant.
+
+TASK, COMMENT = 0, 1
+KIND_NAMES = {TASK: "TASK", COMMENT: "COMMENT"}
+
+_POSTGRES_SQL = """
+SELECT kind, id, rank FROM (
+    SELECT 0 AS kind, t.id AS id, ts_rank_cd(t.search_vector, q.query) AS rank
+    FROM projects_task t
+    JOIN projects_project p ON p.id = t.project_id
+    CROSS JOIN (SELECT websearch_to_tsquery('english', %s) AS query) q
+    WHERE t.search_vector @@ q.query AND t.organization_id = %s AND p.deleted_at IS NULL {filters}
+    UNION ALL
+    SELECT 1, c.id, ts_rank_cd(c.search_vector, q.query)
+    FROM projects_taskcomment c
+    JOIN projects_task t ON t.id = c.task_id
+    JOIN projects_project p ON p.id = t.project_id
+    CROSS JOIN (SELECT websearch_to_tsquery('english', %s) AS query) q
+    WHERE c.search_vector @@ q.query AND c.organization_id = %s AND p.deleted_at IS NULL {filters}
+) hits
+"""
+
+_SQLITE_SQL = """
+SELECT kind, id, rank FROM (
+    SELECT projects_search_fts.rowid %% 2 AS kind,
+           projects_search_fts.rowid / 2 AS id,
+           -bm25(projects_search_fts, 10.0, 1.0) AS rank
+    FROM projects_search_fts
+    JOIN projects_task t ON t.id = projects_search_fts.task_id
+    JOIN projects_project p ON p.id = t.project_id
+    WHERE projects_search_fts MATCH %s AND t.organization_id = %s AND p.deleted_at IS NULL {filters}
+) hits
+"""
+
+
+# ----- queries -----
+
+
+def encode_search_cursor(rank, kind, pk):
+    raw = f"{rank!r}|{kind}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_search_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        rank, kind, pk = raw.split("|")
+        return float(rank), int(kind), int(pk)
+    except ValueError:
+        raise Exception("Invalid cursor.")
+
+
+def fts5_query(text):
+    # Quote every word: user input never reaches FTS5 query syntax
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+def _search_sql(query, org_id, project_id, status):
+    filters = ""
+    filter_params = []
+    if project_id:
+        filters += " AND t.project_id = %s"
+        filter_params.append(project_id)
+    if status:
+        filters += " AND t.status = %s"
+        filter_params.append(status)
+
+    if connection.vendor == "postgresql":
+        sql = _POSTGRES_SQL.format(filters=filters)
+        params = [query, org_id, *filter_params] * 2
+    elif connection.vendor == "sqlite":
+        sql = _SQLITE_SQL.format(filters=filters)
+        params = [fts5_query(query), org_id, *filter_params]
+    else:
+        raise Exception(f"Search is not supported on {connection.vendor}.")
+    return sql, params
+
+
+def search_hits(org, query, project_id=None, status=None, limit=20, after=None):
+    """[(kind, id, rank)] best first, seeking past `after` when given."""
+    if not re.search(r"\w", query):
+        return []
+    try:
+        project_id = int(project_id) if project_id else None
+    except ValueError:
+        raise Exception("Project not found in this organization.")
+
+    sql, params = _search_sql(query, org.pk, project_id, status)
+    if after:
+        sql += " WHERE (rank < %s) OR (rank = %s AND (kind < %s OR (kind = %s AND id < %s)))"
+        rank, kind, pk = decode_search_cursor(after)
+        params += [rank, rank, kind, kind, pk]
+    sql += " ORDER BY rank DESC, kind DESC, id DESC LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def search(org, query, project_id=None, status=None, first=None, after=None):
+    """
+    One page of ranked hits (forward pagination only):
+    - hits are dicts with kind, rank, task, comment (None for task hits) and cursor
+    - comments come with their task; projects are left to the loaders
+    Returns (hits, page_info) like pagination.paginate().
+    """
+    first, _ = _page_sizes(first, None)
+    rows = search_hits(org, query, project_id, status, limit=first + 1, after=after)
+    has_next_page = len(rows) > first
+    rows = rows[:first]
+
+    tasks = Task.objects.in_bulk([pk for kind, pk, _ in rows if kind == TASK])
+    comments = TaskComment.objects.select_related("task").in_bulk(
+        [pk for kind, pk, _ in rows if kind == COMMENT]
+    )
+
+    hits = []
+    for kind, pk, rank in rows:
+        comment = comments.get(pk) if kind == COMMENT else None
+        task = comment.task if comment else tasks.get(pk) if kind == TASK else None
+        if task is None:
+            # Deleted between the ranking query and the fetch
+            continue
+        hits.append(
+            {
+                "kind": KIND_NAMES[kind],
+                "rank": rank,
+                "task": task,
+                "comment": comment,
+                "cursor": encode_search_cursor(rank, kind, pk),
+            }
+        )
+
+    page_info = {
+        "has_next_page": has_next_page,
+        "has_previous_page": bool(after),
+        "start_cursor": hits[0]["cursor"] if hits else None,
+        "end_cursor": hits[-1]["cursor"] if hits else None,
+    }
+    return hits, page_info
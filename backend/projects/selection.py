@@ -0,0 +1,41 @@
+from collections import defaultdict
+
+from graphql import get_named_type
+from graphql.language import FieldNode, FragmentSpreadNode
+
+
+# --------------------
+# Selection-set inspection helpers
+# --------------------
+
+
+def get_selected_fields_by_type(info):
+    """
+    Every field selected anywhere in the operation, grouped by the name of
+    the GraphQL type it is selected on (e.g. {"TaskType": {"id", "title"}}).
+    """
+    selected = defaultdict(set)
+
+    def walk(selection_set, parent_type):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field = getattr(parent_type, "fields", {}).get(selection.name.value)
+                if field is None:
+                    # __typename and other meta fields
+                    continue
+                selected[parent_type.name].add(selection.name.value)
+                if selection.selection_set is not None:
+                    walk(selection.selection_set, get_named_type(field.type))
+                continue
+
+            if isinstance(selection, FragmentSpreadNode):
+                selection = info.fragments.get(selection.name.value)
+                if selection is None:
+                    continue
+            fragment_type = parent_type
+            if selection.type_condition is not None:
+                fragment_type = info.schema.get_type(selection.type_condition.name.value)
+            walk(selection.selection_set, fragment_type)
+
+    walk(info.operation.selection_set, info.schema.get_root_type(info.operation.operation))
+    return selected
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Organization
+from .org_cache import org_cache
+from .response_cache import bump_org_version
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_org_cache(sender, instance, **kwargs):
+    # Renames/deletes and the header-less fallback (first org) can all change
+    org_cache.clear()
+    bump_org_version(instance.pk)
+
+
+# Project/Task/TaskComment writes bump the response cache version in
+# record_changes (models.py), which every write path goes through. No
+# post_delete receivers: they would disable Django's fast cascade deletes.
@@ -0,0 +1,121 @@
+import datetime
+
+from django.conf import settings
+from django.db.models import Count, DateField, Q
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import PROJECT_COUNTER_FIELDS, Project, Task, task_status_counts
+from .response_cache import get_cache, get_org_version
+
+
+# --------------------
+# Organization dashboard statistics (orgStats)
+# --------------------
+# One query per dimension over the tenant:
+# - per-project status breakdowns: the stored project counters
+# - overdue tasks per project: GROUP BY project_id
+# - workload per assignee: GROUP BY assignee_email
+# - tasks created / completed per week: GROUP BY week, one query each
+# Results are cached under the organization's response-cache version, which
+# every task write bumps (record_changes -> bump_org_version, models.py),
+# plus the current date so "overdue" moves on at midnight. Only on by default
+# with a cache shared by all workers (settings.ORG_STATS_CACHE_TIMEOUT).
+
+DEFAULT_WEEKS = 12
+MAX_WEEKS = 52
+
+
+def _breakdown(row, prefix="tasks_", suffix=""):
+    return {status.lower(): row[f"{prefix}{status.lower()}{suffix}"] for status in Task.Status.values}
+
+
+def week_start(day):
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def compute_org_stats(org, weeks=DEFAULT_WEEKS, today=None):
+    today = today or timezone.localdate()
+    overdue = Q(due_date__lt=today) & ~Q(status=Task.Status.DONE)
+    tasks = Task.objects.visible().filter(organization=org).order_by()
+
+    projects = list(
+        Project.objects.visible()
+        .filter(organization=org)
+        .order_by("name", "pk")
+        .values("pk", "name", "status", "task_count", *PROJECT_COUNTER_FIELDS.values())
+    )
+    overdue_by_project = dict(
+        tasks.filter(overdue).values("project_id").annotate(n=Count("pk")).values_list("project_id", "n")
+    )
+    assignees = (
+        tasks.values("assignee_email")
+        .annotate(**task_status_counts(), overdue=Count("pk", filter=overdue))
+        .order_by("-tasks_total", "assignee_email")
+    )
+
+    first_week = week_start(today) - datetime.timedelta(weeks=weeks - 1)
+    since = timezone.make_aware(datetime.datetime.combine(first_week, datetime.time.min))
+    per_week = {}
+    for field, key in (("created_at", "created"), ("completed_at", "completed")):
+        rows = (
+            tasks.filter(**{f"{field}__gte": since})
+            .annotate(week=TruncWeek(field, output_field=DateField()))
+            .values("week")
+            .annotate(n=Count("pk"))
+            .values_list("week", "n")
+        )
+        for week, n in rows:
+            per_week.setdefault(week, {"created": 0, "completed": 0})[key] = n
+
+    project_stats = [
+        {
+            "project_id": row["pk"],
+            "name": row["name"],
+            "status": row["status"],
+            "task_count": row["task_count"],
+            "status_breakdown": _breakdown(row, prefix="", suffix="_count"),
+            "overdue_count": overdue_by_project.get(row["pk"], 0),
+        }
+        for row in projects
+    ]
+    return {
+        "generated_at": timezone.now(),
+        "task_count": sum(p["task_count"] for p in project_stats),
+        "overdue_count": sum(p["overdue_count"] for p in project_stats),
+        "status_breakdown": {
+            status.lower(): sum(p["status_breakdown"][status.lower()] for p in project_stats)
+            for status in Task.Status.values
+        },
+        "projects": project_stats,
+        "assignees": [
+            {
+                "assignee_email": row["assignee_email"],
+                "task_count": row["tasks_total"],
+                "status_breakdown": _breakdown(row),
+                "overdue_count": row["overdue"],
+            }
+            for row in assignees
+        ],
+        "weeks": [
+            {"week_start": week, **per_week.get(week, {"created": 0, "completed": 0})}
+            for week in (first_week + datetime.timedelta(weeks=i) for i in range(weeks))
+        ],
+    }
+
+
+def get_org_stats(org, weeks=DEFAULT_WEEKS):
+    """compute_org_stats, cached until the organization's next write."""
+    if not 1 <= weeks <= MAX_WEEKS:
+        raise Exception(f"weeks must be between 1 and {MAX_WEEKS}.")
+    today = timezone.localdate()
+    timeout = getattr(settings, "ORG_STATS_CACHE_TIMEOUT", 0)
+    if not timeout:
+        return compute_org_stats(org, weeks, today)
+    key = f"gql:org-stats:{org.pk}:{get_org_version(org.pk)}:{weeks}:{today.isoformat()}"
+    cache = get_cache()
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_org_stats(org, weeks, today)
+        cache.set(key, stats, timeout)
+    return stats
@@ -0,0 +1,76 @@
+import graphene
+
+from .async_schema import aget_request_org
+from .broker import comment_channel, get_broker, task_channel
+from .loaders import AsyncRequestLoaders, get_loaders
+from .models import Project, Task, TaskComment
+from .schema import TaskCommentType, TaskType
+
+
+# --------------------
+# Subscriptions, served over WebSockets (pm_backend/websocket.py)
+# --------------------
+# The subscribe_* functions check the tenant once and return the broker
+# stream; mutations publish the written rows (broker.py). Each event is
+# resolved with fresh loaders, so nested fields never see rows cached by an
+# earlier event.
+
+
+def _stream(channel, model):
+    async def events():
+        async for payload in get_broker().subscribe(channel):
+            yield model(**payload)
+
+    return events()
+
+
+def _fresh_loaders(info):
+    info.context.loaders = AsyncRequestLoaders()
+    return get_loaders(info)
+
+
+class Subscription(graphene.ObjectType):
+    task_changed = graphene.Field(
+        graphene.NonNull(TaskType),
+        project_id=graphene.ID(required=True),
+        description="Tasks of the project as they are created or updated",
+    )
+    comment_added = graphene.Field(
+        graphene.NonNull(TaskCommentType),
+        task_id=graphene.ID(required=True),
+        description="New comments on the task",
+    )
+
+    # ----- Task stream -----
+
+    @staticmethod
+    async def subscribe_task_changed(root, info, project_id):
+        org = await aget_request_org(info.context)
+
+        try:
+            project = await Project.objects.visible().only("pk").aget(pk=project_id, organization=org)
+        except (Project.DoesNotExist, ValueError):
+            raise Exception("Project not found in this organization.")
+        return _stream(task_channel(org.pk, project.pk), Task)
+
+    @staticmethod
+    def resolve_task_changed(task, info, project_id):
+        _fresh_loaders(info).add_tasks([task])
+        return task
+
+    # ----- Comment stream -----
+
+    @staticmethod
+    async def subscribe_comment_added(root, info, task_id):
+        org = await aget_request_org(info.context)
+
+        try:
+            task = await Task.objects.visible().only("pk").aget(pk=task_id, organization=org)
+        except (Task.DoesNotExist, ValueError):
+            raise Exception("Task not found in this organization.")
+        return _stream(comment_channel(org.pk, task.pk), TaskComment)
+
+    @staticmethod
+    def resolve_comment_added(comment, info, task_id):
+        _fresh_loaders(info)
+        return comment
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from projects.models import Organization, Project, Task
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+class TaskCountAggregateTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        for p in range(4):
+            project = Project.objects.create(organization=self.org, name=f"P{p}")
+            for status in ["TODO", "TODO", "IN_PROGRESS", "DONE"]:
+                Task.objects.create(
+                    project=project, title="T", status=status, assignee_email="u@x.com"
+                )
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps(body),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+
+    def _project_query(self, queries):
+        [sql] = [q["sql"] for q in queries.captured_queries if 'FROM "projects_project"' in q["sql"]]
+        return sql
+
+    def test_counts_read_from_project_columns(self):
+        query = """
+        {
+          projects {
+            id taskCount completedTasks
+            statusBreakdown { todo inProgress done }
+          }
+        }
+        """
+        # org lookup + projects (counters are stored columns)
+        with CaptureQueriesContext(connection) as queries:
+            resp = self._post(query)
+        self.assertEqual(len(queries), 2)
+        sql = self._project_query(queries)
+        self.assertNotIn("COUNT(", sql)
+        self.assertIn('"done_count"', sql)
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        for project in data["data"]["projects"]:
+            self.assertEqual(project["taskCount"], 4)
+            self.assertEqual(project["completedTasks"], 1)
+            self.assertEqual(
+                project["statusBreakdown"], {"todo": 2, "inProgress": 1, "done": 1}
+            )
+
+    def test_project_list_without_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self._post("{ projects { id name } }")
+        data = json.loads(resp.content)
+        self.assertEqual(len(data["data"]["projects"]), 4)
+        self.assertEqual(len(queries), 2)
+        sql = self._project_query(queries)
+        # Neither aggregated nor loaded from the counter columns
+        for fragment in ("COUNT(", "CASE WHEN", '"task_count"', '"done_count"'):
+            self.assertNotIn(fragment, sql)
+
+    def test_nested_project_counts_need_no_extra_query(self):
+        query = "{ tasks { id project { taskCount completedTasks } } }"
+        # org lookup + tasks + their projects (one batch), no count query
+        with self.assertNumQueries(3):
+            resp = self._post(query)
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(data["data"]["tasks"][0]["project"]["taskCount"], 4)
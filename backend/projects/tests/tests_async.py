@@ -0,0 +1,154 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import TestCase, AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from pm_backend.schema import async_schema, schema
+from pm_backend.views import AsyncGraphQLView
+from projects import async_schema as async_schema_module
+from projects.models import Organization, Project, Task, TaskComment
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class AsyncGraphQLViewTests(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.view = AsyncGraphQLView.as_view(schema=async_schema)
+        self.org1 = Organization.objects.create(name="Org One", slug="org-one")
+        self.org2 = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org1, name="P1")
+        for i in range(3):
+            task = Task.objects.create(
+                project=self.project,
+                title=f"T{i}",
+                assignee_email="u@x.com",
+                status=Task.Status.DONE.value if i == 0 else Task.Status.TODO.value,
+            )
+            TaskComment.objects.create(task=task, content="c", author_email="a@x.com")
+        Project.objects.create(organization=self.org2, name="Other")
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        request = self.factory.post(
+            GRAPHQL_URL,
+            data=json.dumps(body),
+            content_type="application/json",
+            headers={"X-Org-Slug": org_slug},
+        )
+        response = async_to_sync(self.view)(request)
+        return json.loads(response.content)
+
+    def test_async_schema_matches_sync_schema(self):
+        self.assertEqual(str(async_schema), str(schema))
+
+    def test_root_fields_and_nested_loaders(self):
+        query = """
+        query {
+          projects { name taskCount completedTasks tasks { title comments { content } } }
+          tasks(status: "TODO") { title project { name organization { slug } } }
+          tasksConnection(first: 2) { totalCount edges { node { title } } pageInfo { hasNextPage } }
+        }
+        """
+        data = self._post(query)
+        self.assertIsNone(data.get("errors"))
+        projects = data["data"]["projects"]
+        self.assertEqual([p["name"] for p in projects], ["P1"])
+        self.assertEqual(projects[0]["taskCount"], 3)
+        self.assertEqual(projects[0]["completedTasks"], 1)
+        self.assertEqual(len(projects[0]["tasks"]), 3)
+        self.assertEqual(projects[0]["tasks"][0]["comments"], [{"content": "c"}])
+        self.assertEqual(len(data["data"]["tasks"]), 2)
+        self.assertEqual(data["data"]["tasks"][0]["project"]["organization"]["slug"], "org-one")
+        connection = data["data"]["tasksConnection"]
+        self.assertEqual(connection["totalCount"], 3)
+        self.assertEqual(len(connection["edges"]), 2)
+        self.assertTrue(connection["pageInfo"]["hasNextPage"])
+
+    def test_root_fields_run_concurrently(self):
+        events = []
+        lookup = async_schema_module.aget_request_org
+
+        async def slow_lookup(request):
+            events.append("start")
+            await asyncio.sleep(0.05)
+            events.append("end")
+            return await lookup(request)
+
+        with mock.patch.object(async_schema_module, "aget_request_org", slow_lookup):
+            data = self._post("query { projects { name } tasks { title } }")
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(len(data["data"]["tasks"]), 3)
+        # The second root field started before the first one finished
+        self.assertEqual(events, ["start", "start", "end", "end"])
+
+    def test_nested_fields_are_batched(self):
+        query = "query { projects { tasks { comments { content } } } }"
+        # org lookup + projects + tasks_by_project + comments_by_task
+        with self.assertNumQueries(4):
+            data = self._post(query)
+        self.assertIsNone(data.get("errors"))
+
+    def test_mutations_are_scoped_to_organization(self):
+        mutation = """
+        mutation U($taskId: ID!, $status: String!) {
+          updateTaskStatus(taskId: $taskId, status: $status) { task { id } }
+        }
+        """
+        task = Task.objects.filter(project=self.project).first()
+        data = self._post(mutation, {"taskId": str(task.pk), "status": "DONE"})
+        self.assertIsNone(data.get("errors"))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+
+        data = self._post(mutation, {"taskId": str(task.pk), "status": "TODO"}, org_slug="org-two")
+        self.assertIn("Task not found", data["errors"][0]["message"])
+
+    def test_mutations_run_the_sync_path(self):
+        mutation = """
+        mutation C($projectId: ID!) {
+          createTask(projectId: $projectId, title: "New", assigneeEmail: "u@x.com") {
+            task { title project { name } comments { id } }
+          }
+        }
+        """
+        variables = {"projectId": str(self.project.pk)}
+        with mock.patch.dict(connection.settings_dict, {"ATOMIC_MUTATIONS": True}):
+            with CaptureQueriesContext(connection) as queries:
+                data = self._post(mutation, variables)
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(
+            data["data"]["createTask"]["task"], {"title": "New", "project": {"name": "P1"}, "comments": []}
+        )
+        # One transaction around the operation (a savepoint inside the test's)
+        self.assertTrue(any(q["sql"].startswith("SAVEPOINT") for q in queries.captured_queries))
+
+    def test_bulk_mutation_runs_in_worker_thread(self):
+        mutation = """
+        mutation D($ids: [ID!]!) { bulkDeleteTasks(taskIds: $ids) { results { ok } } }
+        """
+        ids = [str(pk) for pk in Task.objects.values_list("pk", flat=True)]
+        data = self._post(mutation, {"ids": ids})
+        self.assertIsNone(data.get("errors"))
+        self.assertTrue(all(r["ok"] for r in data["data"]["bulkDeleteTasks"]["results"]))
+        self.assertFalse(Task.objects.exists())
+
+    def test_changes_since(self):
+        query = "query { changesSince { cursor projects { name } tasks { title project { name } } comments { content } } }"
+        data = self._post(query)
+        self.assertIsNone(data.get("errors"))
+        changes = data["data"]["changesSince"]
+        self.assertEqual([p["name"] for p in changes["projects"]], ["P1"])
+        self.assertEqual({t["project"]["name"] for t in changes["tasks"]}, {"P1"})
+        self.assertEqual(len(changes["comments"]), 3)
+
+        query = "query C($cursor: String) { changesSince(cursor: $cursor) { tasks { id } deleted { id } } }"
+        data = self._post(query, {"cursor": changes["cursor"]})
+        self.assertEqual(data["data"]["changesSince"], {"tasks": [], "deleted": []})
@@ -0,0 +1,39 @@
+from io import StringIO
+import json
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from projects.models import Organization, Project, Task, TaskComment, recompute_project_counters
+
+
+class BenchmarkCommandTests(TestCase):
+    def setUp(self):
+        call_command(
+            "seed_benchmark_data", orgs=2, projects=10, tasks=200, comments=300, stdout=StringIO()
+        )
+
+    def test_seed_is_skewed_and_counters_match(self):
+        self.assertEqual(Organization.objects.filter(slug__startswith="bench-").count(), 2)
+        self.assertEqual(Project.objects.count(), 10)
+        self.assertEqual(Task.objects.count(), 200)
+        self.assertGreater(TaskComment.objects.count(), 0)
+        # bulk_create keeps the stored counters right
+        self.assertEqual(recompute_project_counters(Project.objects.values_list("pk", flat=True)), 0)
+        sizes = sorted(Project.objects.values_list("task_count", flat=True))
+        self.assertGreater(sizes[-1], 3 * sizes[0])
+
+        with self.assertRaises(CommandError):
+            call_command("seed_benchmark_data", orgs=1, stdout=StringIO())
+
+    def test_benchmark_reports_json(self):
+        out = StringIO()
+        call_command("run_benchmark", org="bench-0", requests=40, warmup=0, concurrency=1, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["requests"], 40)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["target"], "test-client")
+        for key in ("requests_per_second", "p50_ms", "p95_ms", "p99_ms"):
+            self.assertIsNotNone(report[key])
+        self.assertEqual(report["operations"]["GetProjects"]["queries"]["max"], 2)
+        self.assertEqual(sum(op["count"] for op in report["operations"].values()), 40)
@@ -0,0 +1,98 @@
+from django.test import TestCase, Client
+from projects.models import Organization, Project, Task, TaskComment
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+class BulkMutationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org1 = Organization.objects.create(name="Org One", slug="org-one")
+        self.org2 = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org1, name="P1")
+        self.other_project = Project.objects.create(organization=self.org2, name="P2")
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return json.loads(
+            self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps(body),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG=org_slug,
+            ).content
+        )
+
+    def _tasks(self, n, project=None):
+        return [
+            Task.objects.create(
+                project=project or self.project, title=f"T{i}", assignee_email="u@x.com"
+            )
+            for i in range(n)
+        ]
+
+    def test_bulk_create_reports_per_item_errors(self):
+        mutation = """
+        mutation B($tasks: [TaskInput!]!) {
+          bulkCreateTasks(tasks: $tasks) {
+            results { index ok taskId error task { title status } }
+          }
+        }
+        """
+        items = [
+            {"projectId": str(self.project.pk), "title": f"T{i}", "assigneeEmail": "u@x.com"}
+            for i in range(50)
+        ]
+        items.append({"projectId": str(self.other_project.pk), "title": "X", "assigneeEmail": "u@x.com"})
+        items.append({"projectId": str(self.project.pk), "title": "Y", "assigneeEmail": "u@x.com", "status": "BAD"})
+
+        # org lookup + project ownership + one INSERT + one counter UPDATE
+        # + change sequence + change log upsert (inside a savepoint)
+        with self.assertNumQueries(8):
+            data = self._post(mutation, {"tasks": items})
+        self.assertIsNone(data.get("errors"))
+        results = data["data"]["bulkCreateTasks"]["results"]
+        self.assertEqual(len(results), 52)
+        self.assertTrue(all(r["ok"] for r in results[:50]))
+        self.assertEqual(results[0]["task"], {"title": "T0", "status": "TODO"})
+        self.assertEqual(results[50]["error"], "Project not found in this organization.")
+        self.assertFalse(results[51]["ok"])
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 50)
+
+    def test_bulk_update_status_is_one_update(self):
+        tasks = self._tasks(20)
+        foreign = self._tasks(1, project=self.other_project)[0]
+        mutation = """
+        mutation U($ids: [ID!]!) {
+          bulkUpdateTaskStatus(taskIds: $ids, status: "DONE") { results { index ok error } }
+        }
+        """
+        ids = [str(t.pk) for t in tasks] + [str(foreign.pk), "nope"]
+        # org lookup + ownership SELECT + locked status SELECT + one UPDATE
+        # + one counter UPDATE + change sequence + change log upsert (inside a savepoint)
+        with self.assertNumQueries(9):
+            data = self._post(mutation, {"ids": ids})
+        results = data["data"]["bulkUpdateTaskStatus"]["results"]
+        self.assertEqual([r["ok"] for r in results], [True] * 20 + [False, False])
+        self.assertEqual(Task.objects.filter(status="DONE").count(), 20)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, "TODO")
+
+    def test_bulk_delete(self):
+        tasks = self._tasks(10)
+        for task in tasks:
+            TaskComment.objects.create(task=task, content="c", author_email="a@x.com")
+        foreign = self._tasks(1, project=self.other_project)[0]
+        mutation = """
+        mutation D($ids: [ID!]!) { bulkDeleteTasks(taskIds: $ids) { results { ok } } }
+        """
+        data = self._post(mutation, {"ids": [str(t.pk) for t in tasks] + [str(foreign.pk)]})
+        results = data["data"]["bulkDeleteTasks"]["results"]
+        self.assertEqual([r["ok"] for r in results], [True] * 10 + [False])
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 0)
+        self.assertEqual(TaskComment.objects.count(), 0)
+        self.assertTrue(Task.objects.filter(pk=foreign.pk).exists())
@@ -0,0 +1,119 @@
+from django.test import TestCase, Client, override_settings
+from projects.changes import encode_change_cursor
+from projects.models import ChangeLogEntry, ChangeSequence, Organization, Project, Task, TaskComment
+from projects.operations import DELETE_PROJECT, DELETE_TASK, GET_CHANGES, UPDATE_TASK_STATUS
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class ChangesSinceTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        other = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org, name="P1")
+        self.tasks = Task.objects.bulk_create(
+            Task(project=self.project, title=f"T{i}", assignee_email="u@x.com") for i in range(5)
+        )
+        TaskComment.objects.create(task=self.tasks[0], content="C", author_email="a@x.com")
+        Project.objects.create(organization=other, name="Other")
+
+    def _post(self, query, variables=None):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query, "variables": variables or {}}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"), data.get("errors"))
+        return data["data"]
+
+    def _changes(self, cursor=None, limit=None):
+        return self._post(GET_CHANGES, {"cursor": cursor, "limit": limit})["changesSince"]
+
+    def _cursor(self):
+        return self._changes()["cursor"]
+
+    def test_empty_cursor_is_a_full_sync_of_the_organization(self):
+        changes = self._changes()
+        self.assertEqual([p["name"] for p in changes["projects"]], ["P1"])
+        self.assertEqual(len(changes["tasks"]), 5)
+        self.assertEqual([c["content"] for c in changes["comments"]], ["C"])
+        self.assertEqual((changes["deleted"], changes["hasMore"]), ([], False))
+
+        # Nothing new: same cursor, nothing returned
+        again = self._changes(changes["cursor"])
+        self.assertEqual(again["cursor"], changes["cursor"])
+        self.assertEqual(again["projects"] + again["tasks"] + again["comments"], [])
+
+    def test_poll_returns_only_what_changed(self):
+        cursor = self._cursor()
+        task = self.tasks[2]
+        self._post(UPDATE_TASK_STATUS, {"taskId": str(task.pk), "status": "DONE"})
+        self._post(UPDATE_TASK_STATUS, {"taskId": str(task.pk), "status": "IN_PROGRESS"})
+
+        # Two writes to one task: it comes back once, with its project's counters.
+        # Log page + projects + tasks (the organization is cached)
+        with self.assertNumQueries(3):
+            changes = self._changes(cursor)
+        self.assertEqual([t["id"] for t in changes["tasks"]], [str(task.pk)])
+        self.assertEqual(changes["tasks"][0]["status"], "IN_PROGRESS")
+        self.assertEqual([p["taskCount"] for p in changes["projects"]], [5])
+        self.assertEqual(changes["comments"], [])
+
+        task.refresh_from_db()
+        self.assertGreater(task.updated_at, task.created_at)
+
+    def test_deletes_come_back_as_tombstones(self):
+        cursor = self._cursor()
+        self._post(DELETE_TASK, {"taskId": str(self.tasks[0].pk)})
+        changes = self._changes(cursor)
+        self.assertEqual(changes["deleted"], [{"entity": "TASK", "id": str(self.tasks[0].pk)}])
+        self.assertEqual([p["taskCount"] for p in changes["projects"]], [4])
+
+        cursor = changes["cursor"]
+        self._post(DELETE_PROJECT, {"projectId": str(self.project.pk)})
+        changes = self._changes(cursor)
+        self.assertEqual(changes["deleted"], [{"entity": "PROJECT", "id": str(self.project.pk)}])
+        self.assertEqual(changes["projects"], [])
+
+    def test_bulk_writes_are_logged(self):
+        cursor = self._cursor()
+        Task.objects.filter(pk__in=[t.pk for t in self.tasks[:3]]).update(title="Renamed")
+        Task.objects.filter(pk=self.tasks[4].pk).delete()
+
+        changes = self._changes(cursor)
+        self.assertEqual({t["title"] for t in changes["tasks"]}, {"Renamed"})
+        self.assertEqual(len(changes["tasks"]), 3)
+        self.assertEqual(changes["deleted"], [{"entity": "TASK", "id": str(self.tasks[4].pk)}])
+
+    def test_pages_follow_the_organization_sequence(self):
+        seen = []
+        cursor, has_more = None, True
+        while has_more:
+            changes = self._changes(cursor, limit=3)
+            seen += changes["projects"] + changes["tasks"] + changes["comments"]
+            cursor, has_more = changes["cursor"], changes["hasMore"]
+        self.assertEqual(len(seen), 7)
+
+        # Sequence numbers are per organization and match the log
+        seqs = list(ChangeLogEntry.objects.filter(organization=self.org).values_list("seq", flat=True))
+        self.assertEqual(seqs, sorted(set(seqs)))
+        self.assertEqual(cursor, encode_change_cursor(ChangeSequence.objects.get(organization=self.org).value))
+
+    def test_invalid_cursor_and_limit(self):
+        for variables, message in (
+            ({"cursor": "nope"}, "Invalid cursor."),
+            ({"limit": 0}, "limit must be between 1 and 1000."),
+        ):
+            resp = self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps({"query": GET_CHANGES, "variables": variables}),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG="org-one",
+            )
+            self.assertEqual(json.loads(resp.content)["errors"][0]["message"], message)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from projects.models import Organization, Project, Task, TaskComment
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+COMMENTS_QUERY = """
+query ($first: Int, $after: String) {
+  tasks { id commentCount comments(first: $first, after: $after) { content cursor } }
+}
+"""
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class CommentPagingTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        project = Project.objects.create(organization=self.org, name="P1")
+        self.busy = Task.objects.create(project=project, title="Busy", assignee_email="u@x.com")
+        self.quiet = Task.objects.create(project=project, title="Quiet", assignee_email="u@x.com")
+        self.empty = Task.objects.create(project=project, title="Empty", assignee_email="u@x.com")
+
+        start = timezone.now() - timedelta(days=1)
+        comments = TaskComment.objects.bulk_create(
+            TaskComment(task=self.busy, content=f"C{i}", author_email="a@x.com") for i in range(30)
+        )
+        # created_at is auto_now_add: spread the rows out afterwards
+        for i, comment in enumerate(comments):
+            comment.created_at = start + timedelta(minutes=i)
+        TaskComment.objects.bulk_update(comments, ["created_at"])
+        TaskComment.objects.create(task=self.quiet, content="Only", author_email="a@x.com")
+
+    def _tasks(self, **variables):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": COMMENTS_QUERY, "variables": variables}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"), data.get("errors"))
+        return {int(task["id"]): task for task in data["data"]["tasks"]}
+
+    def test_default_page_is_newest_comments_oldest_first(self):
+        tasks = self._tasks()
+        busy = tasks[self.busy.pk]
+        self.assertEqual(busy["commentCount"], 30)
+        self.assertEqual([c["content"] for c in busy["comments"]], [f"C{i}" for i in range(10, 30)])
+        self.assertEqual([c["content"] for c in tasks[self.quiet.pk]["comments"]], ["Only"])
+        empty = tasks[self.empty.pk]
+        self.assertEqual((empty["commentCount"], empty["comments"]), (0, []))
+
+    def test_after_cursor_returns_older_comments(self):
+        first_page = self._tasks(first=12)[self.busy.pk]["comments"]
+        self.assertEqual(first_page[0]["content"], "C18")
+        older = self._tasks(first=12, after=first_page[0]["cursor"])[self.busy.pk]["comments"]
+        self.assertEqual([c["content"] for c in older], [f"C{i}" for i in range(6, 18)])
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self._tasks()  # warm the org cache
+        # tasks, comment counts, one windowed query for every task's page
+        with self.assertNumQueries(3):
+            self._tasks(first=5)
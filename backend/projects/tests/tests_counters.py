@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from projects.models import Organization, Project, Task
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+class ProjectCounterTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        self.project = Project.objects.create(organization=self.org, name="P1")
+        self.other = Project.objects.create(organization=self.org, name="P2")
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return json.loads(
+            self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps(body),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG=org_slug,
+            ).content
+        )
+
+    def _task(self, status="TODO", project=None):
+        return Task.objects.create(
+            project=project or self.project, title="T", status=status, assignee_email="u@x.com"
+        )
+
+    def assertCounters(self, project, total, todo, in_progress, done):
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.task_count, project.todo_count, project.in_progress_count, project.done_count),
+            (total, todo, in_progress, done),
+        )
+
+    def test_single_row_writes(self):
+        task = self._task()
+        self._task("DONE")
+        self.assertCounters(self.project, 2, 1, 0, 1)
+
+        task.status = "IN_PROGRESS"
+        task.save()
+        self.assertCounters(self.project, 2, 0, 1, 1)
+
+        # Saving unrelated fields leaves the counters alone
+        task.title = "Renamed"
+        task.save(update_fields=["title"])
+        self.assertCounters(self.project, 2, 0, 1, 1)
+
+        task.project = self.other
+        task.save()
+        self.assertCounters(self.project, 1, 0, 0, 1)
+        self.assertCounters(self.other, 1, 0, 1, 0)
+
+        task.delete()
+        self.assertCounters(self.other, 0, 0, 0, 0)
+
+    def test_stale_instance_uses_stored_status(self):
+        task = self._task()
+        Task.objects.filter(pk=task.pk).update(status="DONE")
+        # task.status is still TODO in memory; the row says DONE
+        task.save()
+        self.assertCounters(self.project, 1, 1, 0, 0)
+
+    def test_queryset_writes(self):
+        Task.objects.bulk_create(
+            [Task(project=self.project, title="T", assignee_email="u@x.com") for _ in range(3)]
+            + [Task(project=self.other, title="T", status="DONE", assignee_email="u@x.com")]
+        )
+        self.assertCounters(self.project, 3, 3, 0, 0)
+        self.assertCounters(self.other, 1, 0, 0, 1)
+
+        Task.objects.filter(project=self.project).update(status="DONE")
+        self.assertCounters(self.project, 3, 0, 0, 3)
+
+        Task.objects.filter(project=self.other).update(project=self.project)
+        self.assertCounters(self.project, 4, 0, 0, 4)
+        self.assertCounters(self.other, 0, 0, 0, 0)
+
+        Task.objects.filter(project=self.project)[:1].get().delete()
+        Task.objects.filter(project=self.project).delete()
+        self.assertCounters(self.project, 0, 0, 0, 0)
+
+    def test_mutations_keep_counters(self):
+        data = self._post(
+            """
+            mutation C($projectId: ID!) {
+              createTask(projectId: $projectId, title: "T", assigneeEmail: "u@x.com") { task { id } }
+            }
+            """,
+            {"projectId": str(self.project.pk)},
+        )
+        task_id = data["data"]["createTask"]["task"]["id"]
+        self._post(
+            'mutation U($id: ID!) { updateTaskStatus(taskId: $id, status: "DONE") { task { id } } }',
+            {"id": task_id},
+        )
+        self.assertCounters(self.project, 1, 0, 0, 1)
+
+        data = self._post(f"{{ project(id: {self.project.pk}) {{ taskCount completedTasks }} }}")
+        self.assertEqual(data["data"]["project"], {"taskCount": 1, "completedTasks": 1})
+
+        self._post('mutation D($id: ID!) { deleteTask(taskId: $id) { ok } }', {"id": task_id})
+        self.assertCounters(self.project, 0, 0, 0, 0)
+
+    def test_recompute_repairs_drift(self):
+        self._task()
+        self._task("DONE")
+        Project.objects.filter(pk=self.project.pk).update(task_count=7, done_count=0)
+        Project.objects.filter(pk=self.other.pk).update(todo_count=-1)
+
+        out = StringIO()
+        call_command("recompute_project_counters", "--batch-size", "1", stdout=out)
+        self.assertIn("Checked 2 projects, repaired 2.", out.getvalue())
+        self.assertCounters(self.project, 2, 1, 0, 1)
+        self.assertCounters(self.other, 0, 0, 0, 0)
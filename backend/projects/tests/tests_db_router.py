@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from pm_backend.db_router import PrimaryReplicaRouter, pin_to_primary, read_from, replica_for_query
+from projects.models import Organization, Project, Task
+from projects.operations import CREATE_TASK, GET_PROJECTS
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(DATABASE_READ_REPLICA="replica")
+class RouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_reads_use_the_replica_only_inside_read_from(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Task), "default")
+        with read_from("replica"):
+            self.assertEqual(router.db_for_read(Task), "replica")
+            self.assertEqual(router.db_for_write(Task), "default")
+        self.assertEqual(router.db_for_read(Task), "default")
+
+    def test_pinned_organizations_read_from_the_primary(self):
+        self.assertEqual(replica_for_query(1), "replica")
+        pin_to_primary(1)
+        self.assertIsNone(replica_for_query(1))
+        self.assertEqual(replica_for_query(2), "replica")
+
+        with override_settings(DATABASE_READ_REPLICA=None):
+            self.assertIsNone(replica_for_query(2))
+
+    def test_sync_command_needs_a_replica(self):
+        with override_settings(DATABASE_READ_REPLICA=None):
+            with self.assertRaisesMessage(CommandError, "No replica configured"):
+                call_command("sync_sqlite_replica", stdout=StringIO())
+
+
+# "default" stands in for the replica alias: same rows, real queries
+@override_settings(DATABASE_READ_REPLICA="default", GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class ReadYourWritesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        org = Organization.objects.create(name="Org One", slug="org-one")
+        self.project = Project.objects.create(organization=org, name="P1")
+
+    def _post(self, query, variables=None):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query, "variables": variables or {}}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        self.assertIsNone(json.loads(resp.content).get("errors"))
+        return resp.wsgi_request
+
+    def test_queries_read_from_the_replica_until_a_mutation_pins_the_org(self):
+        self.assertEqual(self._post(GET_PROJECTS).read_alias, "default")
+
+        variables = {"projectId": str(self.project.pk), "title": "New", "assigneeEmail": "u@x.com"}
+        self.assertIsNone(self._post(CREATE_TASK, variables).read_alias)
+
+        # Pinned: the next read goes to the primary and sees the new task
+        self.assertIsNone(self._post(GET_PROJECTS).read_alias)
+        cache.clear()
+        self.assertEqual(self._post(GET_PROJECTS).read_alias, "default")
@@ -0,0 +1,23 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from projects.models import Project
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def test_every_resolver_queryset_uses_an_index(self):
+        out = StringIO()
+        call_command(
+            "explain_queries",
+            orgs=2,
+            projects=20,
+            tasks=5,
+            comments=1,
+            fail_on_seq_scan=True,
+            stdout=out,
+        )
+        self.assertIn("tasks(projectId, status)", out.getvalue())
+        self.assertNotIn("SEQ SCAN", out.getvalue())
+        # seeded rows are rolled back unless --keep is passed
+        self.assertEqual(Project.objects.count(), 0)
@@ -0,0 +1,74 @@
+from django.test import TestCase, Client
+from projects.models import Organization, Project, Task, TaskComment
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+class DataLoaderBatchingTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps(body),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+
+    def _seed(self, projects, tasks_per_project, comments_per_task):
+        for p in range(projects):
+            project = Project.objects.create(organization=self.org, name=f"P{p}")
+            for t in range(tasks_per_project):
+                task = Task.objects.create(
+                    project=project, title=f"T{p}-{t}", assignee_email="u@x.com"
+                )
+                for c in range(comments_per_task):
+                    TaskComment.objects.create(
+                        task=task, content=f"c{c}", author_email="a@x.com"
+                    )
+
+    def test_nested_relations_use_one_query_per_level(self):
+        self._seed(projects=3, tasks_per_project=2, comments_per_task=2)
+        query = """
+        {
+          projects {
+            id
+            organization { slug }
+            tasks {
+              id
+              project { id }
+              comments { id task { id } }
+            }
+          }
+        }
+        """
+        # org lookup + projects + tasks + comments
+        with self.assertNumQueries(4):
+            resp = self._post(query)
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        projects = data["data"]["projects"]
+        self.assertEqual(len(projects), 3)
+        for project in projects:
+            self.assertEqual(project["organization"]["slug"], "org-one")
+            self.assertEqual(len(project["tasks"]), 2)
+            for task in project["tasks"]:
+                self.assertEqual(task["project"]["id"], project["id"])
+                self.assertEqual(len(task["comments"]), 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._seed(projects=6, tasks_per_project=3, comments_per_task=1)
+        query = "{ tasks { id project { id name } comments { id } } }"
+        # org lookup + tasks + projects + comments
+        with self.assertNumQueries(4):
+            resp = self._post(query)
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(len(data["data"]["tasks"]), 18)
@@ -0,0 +1,57 @@
+from django.test import TestCase, Client, override_settings
+from projects.models import Organization, Project
+from projects.org_cache import OrganizationCache
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class OrganizationCacheTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        Project.objects.create(organization=self.org, name="P1")
+
+    def _post(self, query, org_slug="org-one"):
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+
+    def test_org_lookup_is_cached_across_requests_and_root_fields(self):
+        with self.assertNumQueries(3):  # org + projects + tasks
+            self._post("{ projects { id } tasks { id } }")
+        with self.assertNumQueries(2):  # projects + tasks
+            self._post("{ projects { id } tasks { id } }")
+
+    def test_save_invalidates(self):
+        self._post("{ projects { id } }")
+        self.org.slug = "renamed"
+        self.org.save()
+        data = json.loads(self._post("{ projects { id } }").content)
+        self.assertEqual(data["errors"][0]["message"], "Invalid organization slug.")
+        data = json.loads(self._post("{ projects { id } }", org_slug="renamed").content)
+        self.assertEqual(len(data["data"]["projects"]), 1)
+
+    def test_invalid_slug_is_not_cached(self):
+        self._post("{ projects { id } }", org_slug="org-two")
+        Organization.objects.create(name="Org Two", slug="org-two")
+        data = json.loads(self._post("{ projects { id } }", org_slug="org-two").content)
+        self.assertIsNone(data.get("errors"))
+
+    def test_lru_eviction_and_ttl(self):
+        cache = OrganizationCache(max_size=2, ttl=60)
+        for key in ["a", "b", "a", "c"]:
+            cache.get(key, lambda: key.upper())
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.get("a", lambda: "reloaded"), "A")
+        self.assertEqual(cache.get("b", lambda: "reloaded"), "reloaded")
+
+        expired = OrganizationCache(max_size=2, ttl=0)
+        expired.get("a", lambda: 1)
+        self.assertEqual(expired.get("a", lambda: 2), 2)
+        self.assertEqual(expired.stats()["misses"], 2)
@@ -0,0 +1,125 @@
+from io import StringIO
+import json
+import os
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import AsyncRequestFactory, TestCase, Client
+from pm_backend.views import export_org_data
+from projects.models import Organization, Project, Task, TaskComment, recompute_project_counters
+from projects.org_data import export_records
+
+
+class OrgDataTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        self.target = Organization.objects.create(name="Org Two", slug="org-two")
+        for p in range(3):
+            project = Project.objects.create(organization=self.org, name=f"P{p}", description="d")
+            for t in range(4):
+                task = Task.objects.create(
+                    project=project,
+                    title=f"P{p} T{t}",
+                    status=Task.Status.DONE.value if t == 0 else Task.Status.TODO.value,
+                    assignee_email="u@x.com",
+                )
+                TaskComment.objects.create(task=task, content=f"on {task.title}", author_email="a@x.com")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _round_trip(self, fmt, chunk_size):
+        path = os.path.join(self.tmp.name, f"export.{fmt}")
+        call_command("export_org_data", "org-one", format=fmt, output=path, stderr=StringIO())
+        out = StringIO()
+        call_command("import_org_data", path, org="org-two", chunk_size=chunk_size, stdout=out)
+        self.assertIn("Imported 3 projects, 12 tasks and 12 comments into org-two", out.getvalue())
+
+        # Comments stay on the task they were written on
+        for comment in TaskComment.objects.filter(task__project__organization=self.target):
+            self.assertEqual(comment.content, f"on {comment.task.title}")
+            self.assertEqual(comment.task.title[:2], comment.task.project.name)
+        project = Project.objects.get(organization=self.target, name="P1")
+        self.assertEqual((project.task_count, project.done_count), (4, 1))
+        self.assertEqual(recompute_project_counters(Project.objects.values_list("pk", flat=True)), 0)
+
+    def test_ndjson_round_trip(self):
+        # chunk_size=5 splits tasks and comments across several bulk_create batches
+        self._round_trip("ndjson", chunk_size=5)
+
+    def test_csv_round_trip(self):
+        self._round_trip("csv", chunk_size=5)
+
+    def test_import_into_existing_projects_and_errors(self):
+        project = Project.objects.get(organization=self.org, name="P0")
+        path = os.path.join(self.tmp.name, "tasks.ndjson")
+        with open(path, "w") as f:
+            f.write(json.dumps({"type": "task", "project": project.pk, "title": "New", "assignee_email": "u@x.com"}))
+        call_command("import_org_data", path, org="org-one", stdout=StringIO())
+        self.assertTrue(project.tasks.filter(title="New").exists())
+
+        with open(path, "w") as f:
+            f.write(json.dumps({"type": "task", "project": 999999, "title": "X", "assignee_email": "u@x.com"}))
+        with self.assertRaisesMessage(CommandError, "Line 1: unknown project '999999'."):
+            call_command("import_org_data", path, org="org-one", stdout=StringIO())
+
+    def test_import_creates_organization_from_file(self):
+        path = os.path.join(self.tmp.name, "export.ndjson")
+        call_command("export_org_data", "org-one", output=path, stderr=StringIO())
+        self.org.slug = "org-one-old"
+        self.org.save()
+        call_command("import_org_data", path, stdout=StringIO())
+        self.assertEqual(Project.objects.filter(organization__slug="org-one").count(), 3)
+
+
+class ExportEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        org = Organization.objects.create(name="Org One", slug="org-one")
+        project = Project.objects.create(organization=org, name="P1")
+        Task.objects.create(project=project, title="T1", assignee_email="u@x.com")
+
+    def test_requires_staff(self):
+        self.assertEqual(self.client.get("/export/", HTTP_X_ORG_SLUG="org-one").status_code, 401)
+        self.client.force_login(User.objects.create_user("member"))
+        self.assertEqual(self.client.get("/export/", HTTP_X_ORG_SLUG="org-one").status_code, 403)
+
+    def test_streams_ndjson_and_csv(self):
+        self.client.force_login(User.objects.create_user("admin", is_staff=True))
+        resp = self.client.get("/export/", HTTP_X_ORG_SLUG="org-one")
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in b"".join(resp.streaming_content).splitlines()]
+        self.assertEqual([r["type"] for r in records], ["organization", "project", "task"])
+
+        resp = self.client.get("/export/?org=org-one&format=csv")
+        self.assertEqual(resp["Content-Disposition"], 'attachment; filename="org-one.csv"')
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith("type,"))
+        self.assertEqual(len(lines), 4)
+
+        self.assertEqual(self.client.get("/export/?org=missing").status_code, 404)
+
+    def test_streams_under_asgi_before_the_export_is_read(self):
+        request = AsyncRequestFactory().get("/export/", headers={"X-Org-Slug": "org-one"})
+        request.user = User.objects.create_user("admin", is_staff=True)
+        read = []
+
+        def tracked_records(org):
+            for record in export_records(org):
+                read.append(record["type"])
+                yield record
+
+        async def first_line(resp):
+            return await anext(aiter(resp))
+
+        with mock.patch("pm_backend.views.export_records", tracked_records):
+            resp = export_org_data(request)
+            self.assertTrue(resp.is_async)
+            line = async_to_sync(first_line)(resp)
+        self.assertEqual(json.loads(line)["type"], "organization")
+        # Only the first record was pulled from the export generator
+        self.assertEqual(read, ["organization"])
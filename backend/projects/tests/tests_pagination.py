@@ -0,0 +1,93 @@
+from django.test import TestCase, Client
+from projects.models import Organization, Project, Task
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+PROJECTS_PAGE = """
+query Page($first: Int, $after: String, $last: Int, $before: String) {
+  projectsConnection(first: $first, after: $after, last: $last, before: $before) {
+    edges { cursor node { name } }
+    pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+  }
+}
+"""
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        other = Organization.objects.create(name="Org Two", slug="org-two")
+        Project.objects.create(organization=other, name="Hidden")
+        # Created in order, so newest-first listing is P9 .. P0
+        self.projects = [
+            Project.objects.create(organization=self.org, name=f"P{i}")
+            for i in range(10)
+        ]
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps(body),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+
+    def _page(self, **variables):
+        data = json.loads(self._post(PROJECTS_PAGE, variables).content)
+        self.assertIsNone(data.get("errors"))
+        return data["data"]["projectsConnection"]
+
+    def test_forward_pagination_walks_all_rows(self):
+        names, after = [], None
+        while True:
+            page = self._page(first=4, after=after)
+            names += [edge["node"]["name"] for edge in page["edges"]]
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+        self.assertEqual(names, [f"P{i}" for i in range(9, -1, -1)])
+
+    def test_backward_pagination(self):
+        first_page = self._page(first=4)
+        cursor = first_page["pageInfo"]["endCursor"]
+        second_page = self._page(first=4, after=cursor)
+        back = self._page(last=2, before=second_page["edges"][0]["cursor"])
+        self.assertEqual([e["node"]["name"] for e in back["edges"]], ["P7", "P6"])
+        self.assertTrue(back["pageInfo"]["hasPreviousPage"])
+        self.assertTrue(back["pageInfo"]["hasNextPage"])
+
+    def test_deep_page_query_count_is_constant(self):
+        first = self._page(first=1)
+        # one seek query (org is cached), regardless of how deep the cursor is
+        with self.assertNumQueries(1):
+            self._page(first=3, after=first["pageInfo"]["endCursor"])
+
+    def test_total_count_and_filters(self):
+        Task.objects.create(project=self.projects[0], title="A", assignee_email="u@x.com")
+        Task.objects.create(
+            project=self.projects[1], title="B", status="DONE", assignee_email="u@x.com"
+        )
+        query = """
+        {
+          projectsConnection(first: 2) { totalCount }
+          tasksConnection(status: "DONE", first: 5) {
+            totalCount edges { node { title } }
+          }
+        }
+        """
+        data = json.loads(self._post(query).content)
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(data["data"]["projectsConnection"]["totalCount"], 10)
+        tasks = data["data"]["tasksConnection"]
+        self.assertEqual(tasks["totalCount"], 1)
+        self.assertEqual(tasks["edges"][0]["node"]["title"], "B")
+
+    def test_invalid_cursor(self):
+        data = json.loads(self._post(PROJECTS_PAGE, {"after": "bogus"}).content)
+        self.assertEqual(data["errors"][0]["message"], "Invalid cursor.")
@@ -0,0 +1,52 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from projects.models import Organization, Project, Task, TaskComment
+from projects.partitioning import COMMENT_FK, TABLE, _referencing_fks, convert_task_table, is_partitioned
+
+
+@skipUnless(connection.vendor == "postgresql", "Task partitioning needs PostgreSQL.")
+class ConvertTaskTableTests(TestCase):
+    def setUp(self):
+        if is_partitioned(connection):
+            self.skipTest("projects_task was partitioned by migration 0011 (TASK_PARTITIONING).")
+        org = Organization.objects.create(name="Org One", slug="org-one")
+        other = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=org, name="P1")
+        self.task = Task.objects.create(project=self.project, title="T1", assignee_email="u@x.com")
+        Task.objects.create(
+            project=Project.objects.create(organization=other, name="P2"),
+            title="T2",
+            assignee_email="u@x.com",
+        )
+        TaskComment.objects.create(task=self.task, content="c", author_email="a@x.com")
+
+    def _convert(self):
+        # Fire the deferred FK checks of setUp: ALTER TABLE refuses to run
+        # with trigger events pending
+        connection.check_constraints()
+        with connection.schema_editor() as schema_editor:
+            return convert_task_table(schema_editor, Task, batch_size=1)
+
+    def test_convert_keeps_rows_and_comment_references(self):
+        self.assertTrue(self._convert())
+        self.assertTrue(is_partitioned(connection))
+        self.assertFalse(self._convert())
+
+        self.assertEqual(sorted(Task.objects.values_list("title", flat=True)), ["T1", "T2"])
+        self.assertEqual(TaskComment.objects.get().task, self.task)
+        self.assertEqual(_referencing_fks(connection), [("projects_taskcomment", COMMENT_FK)])
+
+        # Ids keep coming from one sequence; comments go through the new key
+        task = Task.objects.create(project=self.project, title="T3", assignee_email="u@x.com")
+        self.assertGreater(task.pk, self.task.pk)
+        TaskComment.objects.create(task=task, content="c", author_email="a@x.com")
+        self.assertEqual(Task.objects.filter(organization=self.project.organization_id).count(), 2)
+
+    def test_refuses_other_references(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE task_watcher (task_id bigint REFERENCES {TABLE} (id))")
+        with self.assertRaisesMessage(Exception, "on task_watcher"):
+            self._convert()
+        self.assertFalse(is_partitioned(connection))
@@ -0,0 +1,60 @@
+from django.test import TestCase, Client
+from pm_backend.views import document_cache, query_hash
+from projects.models import Organization, Project
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+QUERY = "query GetProjects { projects { id name } }"
+
+
+class PersistedQueryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        Project.objects.create(organization=self.org, name="P1")
+        document_cache.clear()
+
+    def _post(self, body, org_slug="org-one"):
+        return json.loads(
+            self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps(body),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG=org_slug,
+            ).content
+        )
+
+    def _extensions(self, digest):
+        return {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+
+    def test_unknown_hash_then_register_then_hash_only(self):
+        digest = query_hash(QUERY)
+
+        data = self._post({"extensions": self._extensions(digest)})
+        self.assertEqual(data["errors"][0]["message"], "PersistedQueryNotFound")
+        self.assertEqual(
+            data["errors"][0]["extensions"]["code"], "PERSISTED_QUERY_NOT_FOUND"
+        )
+
+        data = self._post({"query": QUERY, "extensions": self._extensions(digest)})
+        self.assertEqual(data["data"]["projects"][0]["name"], "P1")
+
+        data = self._post({"extensions": self._extensions(digest)})
+        self.assertEqual(data["data"]["projects"][0]["name"], "P1")
+
+    def test_hash_mismatch_is_rejected(self):
+        data = self._post({"query": QUERY, "extensions": self._extensions("0" * 64)})
+        self.assertEqual(data["errors"][0]["message"], "provided sha does not match query")
+
+    def test_repeat_queries_skip_parse(self):
+        self._post({"query": QUERY})
+        hits = document_cache.stats()["hits"]
+        self._post({"query": QUERY})
+        self.assertEqual(document_cache.stats()["hits"], hits + 1)
+
+    def test_validation_errors_are_still_reported(self):
+        data = self._post({"query": "{ projects { nope } }"})
+        self.assertIn("nope", data["errors"][0]["message"])
+        data = self._post({"query": "{ projects { nope } }"})
+        self.assertIn("nope", data["errors"][0]["message"])
@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from projects.models import Organization, Project, Task, TaskComment
+from projects.operations import GET_PROJECTS
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class ColumnProjectionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        for p in range(2):
+            project = Project.objects.create(organization=self.org, name=f"P{p}", description="long " * 100)
+            for t in range(2):
+                task = Task.objects.create(
+                    project=project, title=f"T{t}", description="long " * 100, assignee_email="u@x.com"
+                )
+                TaskComment.objects.create(task=task, content="C", author_email="a@x.com")
+        # Warm the org cache so only resolver queries are captured
+        self._post("{ projects { id } }")
+
+    def _post(self, query):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        return data
+
+    def _sql(self, query, num_queries):
+        with CaptureQueriesContext(connection) as ctx:
+            self._post(query)
+        self.assertEqual(len(ctx), num_queries, [q["sql"] for q in ctx])
+        return {
+            table: next(q["sql"] for q in ctx if f'FROM "projects_{table}"' in q["sql"])
+            for table in ("project", "task", "taskcomment")
+            if any(f'FROM "projects_{table}"' in q["sql"] for q in ctx)
+        }
+
+    def test_project_list_skips_task_descriptions(self):
+        sql = self._sql(GET_PROJECTS, 2)
+        self.assertIn('"projects_project"."description"', sql["project"])
+        self.assertNotIn('"projects_task"."description"', sql["task"])
+        self.assertNotIn('"projects_project"."task_count"', sql["project"])
+
+    def test_computed_fields_load_their_columns(self):
+        sql = self._sql("{ projects { name taskCount statusBreakdown { done } } }", 1)
+        self.assertIn('"projects_project"."task_count"', sql["project"])
+        self.assertIn('"projects_project"."in_progress_count"', sql["project"])
+        self.assertNotIn('"projects_project"."description"', sql["project"])
+
+    def test_rows_shared_between_positions_have_every_selected_column(self):
+        # Projects primed by the root list are reused by task { project { description } }
+        query = "{ projects { name tasks { title project { description } } } }"
+        sql = self._sql(query, 2)
+        self.assertIn('"projects_project"."description"', sql["project"])
+
+    def test_fragments_and_connections(self):
+        query = """
+        { tasksConnection(first: 2) { edges { cursor node { ...T } } } }
+        fragment T on TaskType { title comments { content } }
+        """
+        sql = self._sql(query, 2)
+        self.assertNotIn('"projects_task"."description"', sql["task"])
+        self.assertNotIn('"projects_project"."description"', sql["task"])
+        self.assertNotIn('"projects_taskcomment"."author_email"', sql["taskcomment"])
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from projects.models import Organization, Project, ProjectPurgeJob, Task, TaskComment
+from projects.operations import CREATE_TASK, DELETE_PROJECT
+from projects.purge import claim_job, purge_chunk
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class ProjectPurgeTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        org = Organization.objects.create(name="Org One", slug="org-one")
+        self.doomed = Project.objects.create(organization=org, name="Doomed")
+        self.kept = Project.objects.create(organization=org, name="Kept")
+        for project in (self.doomed, self.kept):
+            tasks = Task.objects.bulk_create(
+                Task(project=project, title=f"{project.name} task {i}", assignee_email="u@x.com")
+                for i in range(5)
+            )
+            TaskComment.objects.bulk_create(
+                TaskComment(task=task, content="C", author_email="a@x.com")
+                for task in tasks
+                for _ in range(2)
+            )
+
+    def _post(self, query, variables=None):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query, "variables": variables or {}}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        return json.loads(resp.content)
+
+    def _delete_doomed(self):
+        data = self._post(DELETE_PROJECT, {"projectId": str(self.doomed.pk)})
+        self.assertEqual(data["data"]["deleteProject"]["ok"], True)
+
+    def test_delete_hides_the_project_at_once(self):
+        self._delete_doomed()
+
+        data = self._post("{ projects { name } tasks { title } }")["data"]
+        self.assertEqual([p["name"] for p in data["projects"]], ["Kept"])
+        self.assertTrue(all(t["title"].startswith("Kept") for t in data["tasks"]))
+
+        data = self._post("query ($id: ID!) { project(id: $id) { name } }", {"id": str(self.doomed.pk)})
+        self.assertIsNone(data["data"]["project"])
+        search = self._post('{ search(query: "Doomed") { edges { cursor } } }')["data"]["search"]
+        self.assertEqual(search["edges"], [])
+        variables = {"projectId": str(self.doomed.pk), "title": "X", "assigneeEmail": "u@x.com"}
+        self.assertEqual(
+            self._post(CREATE_TASK, variables)["errors"][0]["message"],
+            "Project not found in this organization.",
+        )
+        self.assertEqual(
+            self._post(DELETE_PROJECT, {"projectId": str(self.doomed.pk)})["errors"][0]["message"],
+            "Project not found in this organization.",
+        )
+
+        # Rows are still there until the worker runs
+        self.assertEqual(Task.objects.filter(project=self.doomed).count(), 5)
+        job = ProjectPurgeJob.objects.get(project_id=self.doomed.pk)
+        self.assertEqual(job.status, ProjectPurgeJob.Status.PENDING)
+        self.assertEqual(job.stage, ProjectPurgeJob.Stage.COMMENTS)
+
+    def test_worker_purges_comments_then_tasks_then_project(self):
+        self._delete_doomed()
+        out = StringIO()
+        call_command("purge_deleted_projects", chunk_size=3, stdout=out)
+        self.assertIn(f"Purged project {self.doomed.pk}: 10 comments, 5 tasks", out.getvalue())
+
+        self.assertFalse(Project.objects.filter(pk=self.doomed.pk).exists())
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertEqual(TaskComment.objects.count(), 10)
+        job = ProjectPurgeJob.objects.get(project_id=self.doomed.pk)
+        self.assertEqual(job.status, ProjectPurgeJob.Status.DONE)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_interrupted_purge_resumes_after_the_lease(self):
+        self._delete_doomed()
+        job = claim_job()
+        purge_chunk(job, chunk_size=4)
+        purge_chunk(job, chunk_size=4)
+        # The worker dies here: others leave the job alone while its lease runs
+        self.assertIsNone(claim_job())
+        self.assertEqual(TaskComment.objects.filter(task__project=self.doomed).count(), 2)
+
+        ProjectPurgeJob.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        call_command("purge_deleted_projects", chunk_size=4, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ProjectPurgeJob.Status.DONE, 2))
+        self.assertEqual((job.comments_deleted, job.tasks_deleted), (10, 5))
+        self.assertFalse(Project.objects.filter(pk=self.doomed.pk).exists())
@@ -0,0 +1,135 @@
+from django.test import TestCase, Client, override_settings
+from projects.changes import encode_change_cursor
+from projects.models import ChangeSequence, Organization, Project, Task, TaskComment
+from projects.operations import (
+    ADD_TASK_COMMENT,
+    CREATE_PROJECT,
+    CREATE_TASK,
+    DELETE_PROJECT,
+    DELETE_TASK,
+    GET_CHANGES,
+    GET_ORG_STATS,
+    GET_PROJECT_DETAIL,
+    GET_PROJECTS,
+    QUERY_BUDGETS,
+    UPDATE_TASK_STATUS,
+)
+from projects.org_cache import org_cache
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+# Each fixture has N projects with N tasks each, and one comment per task
+FIXTURE_SIZES = (1, 10, 100)
+
+# operation name -> (document, variables for a fixture). Deletes run last:
+# with N=1 they remove the rows the other operations use.
+OPERATIONS = {
+    "GetProjects": (GET_PROJECTS, lambda f: {}),
+    "GetProjectDetail": (GET_PROJECT_DETAIL, lambda f: {"id": str(f["project"].pk)}),
+    "CreateProject": (
+        CREATE_PROJECT,
+        lambda f: {"name": "New", "status": Project.Status.ACTIVE.value, "dueDate": None},
+    ),
+    "CreateTask": (
+        CREATE_TASK,
+        lambda f: {"projectId": str(f["project"].pk), "title": "New", "assigneeEmail": "u@x.com"},
+    ),
+    "UpdateTaskStatus": (
+        UPDATE_TASK_STATUS,
+        lambda f: {"taskId": str(f["task"].pk), "status": Task.Status.DONE.value},
+    ),
+    "AddTaskComment": (
+        ADD_TASK_COMMENT,
+        lambda f: {"taskId": str(f["task"].pk), "content": "Hi", "authorEmail": "a@x.com"},
+    ),
+    "GetOrgStats": (GET_ORG_STATS, lambda f: {}),
+    # A poll after the writes above: one project, task and comment changed
+    "GetChanges": (GET_CHANGES, lambda f: {"cursor": f["cursor"]}),
+    "DeleteTask": (DELETE_TASK, lambda f: {"taskId": str(f["task"].pk)}),
+    "DeleteProject": (DELETE_PROJECT, lambda f: {"projectId": str(f["last_project"].pk)}),
+}
+
+
+def format_queries(queries):
+    lines = []
+    for i, query in enumerate(queries, 1):
+        path = ".".join(str(part) for part in query["path"]) if query["path"] else "(outside resolvers)"
+        lines.append(f"  {i}. [{path}] {query['sql']}")
+    return "\n".join(lines)
+
+
+@override_settings(
+    GRAPHQL_TRACING_ENABLED=True,
+    GRAPHQL_RESPONSE_CACHE_ENABLED=False,
+    GRAPHQL_SLOW_OPERATION_MS=float("inf"),
+)
+class QueryBudgetTests(TestCase):
+    """
+    Every operation the client sends must run a fixed number of SQL queries,
+    whatever the number of rows. Budgets live in projects/operations.py.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixtures = {}
+        for size in FIXTURE_SIZES:
+            org = Organization.objects.create(name=f"Budget {size}", slug=f"budget-{size}")
+            projects = Project.objects.bulk_create(
+                Project(organization=org, name=f"P{i}") for i in range(size)
+            )
+            tasks = Task.objects.bulk_create(
+                Task(project=project, title=f"T{i}", assignee_email="u@x.com")
+                for project in projects
+                for i in range(size)
+            )
+            TaskComment.objects.bulk_create(
+                TaskComment(task=task, content="C", author_email="a@x.com") for task in tasks
+            )
+            cls.fixtures[size] = {
+                "org": org,
+                "project": projects[0],
+                "last_project": projects[-1],
+                "task": tasks[0],
+                "cursor": encode_change_cursor(ChangeSequence.objects.get(organization=org).value),
+            }
+
+    def setUp(self):
+        self.client = Client()
+
+    def _queries(self, document, variables, org):
+        # Count the tenant lookup on every request, not only on cache misses
+        org_cache.clear()
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": document, "variables": variables}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org.slug,
+            HTTP_X_DEBUG_TRACING="1",
+        )
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"), data.get("errors"))
+        return data["extensions"]["tracing"]["queries"]
+
+    def test_every_operation_has_a_budget(self):
+        self.assertEqual(set(OPERATIONS), set(QUERY_BUDGETS))
+
+    def test_query_count_is_constant_and_within_budget(self):
+        for name, (document, variables) in OPERATIONS.items():
+            budget = QUERY_BUDGETS[name]
+            counts = {}
+            for size, fixture in self.fixtures.items():
+                with self.subTest(operation=name, size=size):
+                    queries = self._queries(document, variables(fixture), fixture["org"])
+                    counts[size] = len(queries)
+                    if len(queries) > budget:
+                        self.fail(
+                            f"{name} ran {len(queries)} queries with {size} rows "
+                            f"(budget {budget}):\n{format_queries(queries)}"
+                        )
+                    if counts[size] != counts[FIXTURE_SIZES[0]]:
+                        self.fail(
+                            f"{name} query count grows with row count {counts}:\n"
+                            f"{format_queries(queries)}"
+                        )
@@ -0,0 +1,108 @@
+from django.test import TestCase, Client, override_settings
+from projects.models import Organization, Project
+from projects.operations import GET_PROJECT_DETAIL
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+CYCLE = """
+{
+  projects { tasks { comments { task { project { tasks { comments { id } } } } } } }
+}
+"""
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class QueryCostTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        self.project = Project.objects.create(organization=self.org, name="P1")
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps(body),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+
+    def test_cost_reported_in_extensions(self):
+        resp = self._post(GET_PROJECT_DETAIL, {"id": str(self.project.pk)})
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        # project 1 + tasks 1 + comments 20 (one per task)
+        self.assertEqual(data["extensions"]["cost"]["cost"], 22)
+        self.assertEqual(data["extensions"]["cost"]["depth"], 4)
+
+    def test_connection_cost_uses_page_size(self):
+        query = """
+        query Q($n: Int) { tasksConnection(first: $n) { edges { node { comments { id } } } } }
+        """
+        data = json.loads(self._post(query, {"n": 5}).content)
+        # connection 1 + edges 5 + node 5 + comments 5
+        self.assertEqual(data["extensions"]["cost"]["cost"], 16)
+
+    def test_page_size_is_clamped(self):
+        query = """
+        query Q($n: Int) { tasksConnection(first: $n) { edges { node { comments { id } } } } }
+        """
+        data = json.loads(self._post(query, {"n": -100000}).content)
+        self.assertEqual(data["extensions"]["cost"]["cost"], 1)
+        data = json.loads(self._post(query, {"n": 100000}).content)
+        self.assertEqual(data["extensions"]["cost"]["cost"], 1 + 3 * 100)
+
+        # A negative sibling does not offset the cost of the others
+        expensive = " ".join(
+            f"p{i}: projectsConnection(first: 100) {{ edges {{ node {{ tasks {{ comments(first: 100) {{ id }} }} }} }} }}"
+            for i in range(10)
+        )
+        cheap = "n: projectsConnection(first: -100000) { edges { node { tasks { id } } } }"
+        resp = self._post("{ %s %s }" % (expensive, cheap))
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(json.loads(resp.content)["errors"][0]["extensions"]["code"], "QUERY_TOO_COMPLEX")
+
+    def test_fragments_are_counted(self):
+        query = """
+        { projects { ...P } }
+        fragment P on ProjectType { tasks { ... on TaskType { comments { id } } } }
+        """
+        data = json.loads(self._post(query).content)
+        self.assertEqual(data["extensions"]["cost"]["cost"], 1 + 20 + 400)
+
+    def test_cyclic_query_rejected_before_execution(self):
+        # Only the tenant lookup runs, no resolver
+        with self.assertNumQueries(1):
+            resp = self._post(CYCLE)
+        self.assertEqual(resp.status_code, 400)
+        data = json.loads(resp.content)
+        self.assertNotIn("data", data)
+        error = data["errors"][0]
+        self.assertEqual(error["extensions"]["code"], "QUERY_TOO_COMPLEX")
+        self.assertIn("exceeds the limit", error["message"])
+
+    @override_settings(GRAPHQL_MAX_QUERY_DEPTH=3)
+    def test_depth_limit(self):
+        data = json.loads(self._post("{ projects { tasks { comments { id } } } }").content)
+        self.assertEqual(data["errors"][0]["message"], "Query depth 4 exceeds the limit of 3.")
+        data = json.loads(self._post("{ projects { tasks { id } } }").content)
+        self.assertIsNone(data.get("errors"))
+
+    def test_per_organization_limits(self):
+        Organization.objects.filter(pk=self.org.pk).update(max_query_cost=10)
+        Organization.objects.create(name="Org Two", slug="org-two")
+        query = "{ projects { tasks { id } } }"
+        data = json.loads(self._post(query).content)
+        self.assertEqual(data["errors"][0]["extensions"]["cost"]["maxCost"], 10)
+        data = json.loads(self._post(query, org_slug="org-two").content)
+        self.assertIsNone(data.get("errors"))
+
+    def test_introspection_is_free(self):
+        query = "{ __schema { types { name fields { name type { name ofType { name } } } } } }"
+        data = json.loads(self._post(query).content)
+        self.assertIsNone(data.get("errors"))
+        self.assertEqual(data["extensions"]["cost"]["cost"], 0)
@@ -0,0 +1,97 @@
+from django.test import TestCase, Client, override_settings
+from projects.models import Organization, Project, Task, TaskComment, recompute_project_counters
+from projects.response_cache import response_cache_stats
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+QUERY = "{ projects { name tasks { title status } } }"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org1 = Organization.objects.create(name="Org One", slug="org-one")
+        self.org2 = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org1, name="P1")
+        self.task = Task.objects.create(
+            project=self.project, title="T1", assignee_email="u@x.com"
+        )
+
+    def _post(self, query, variables=None, org_slug="org-one"):
+        body = {"query": query}
+        if variables is not None:
+            body["variables"] = variables
+        return json.loads(
+            self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps(body),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG=org_slug,
+            ).content
+        )
+
+    def test_repeat_query_is_served_from_cache(self):
+        first = self._post(QUERY)
+        hits = response_cache_stats.hits
+        with self.assertNumQueries(0):
+            second = self._post(QUERY)
+        self.assertEqual(first, second)
+        self.assertEqual(response_cache_stats.hits, hits + 1)
+        self.assertGreater(response_cache_stats.bytes_stored, 0)
+
+    def test_cache_is_per_organization(self):
+        self._post(QUERY)
+        data = self._post(QUERY, org_slug="org-two")
+        self.assertEqual(data["data"]["projects"], [])
+
+    def test_mutation_invalidates(self):
+        self._post(QUERY)
+        mutation = """
+        mutation U($taskId: ID!) {
+          updateTaskStatus(taskId: $taskId, status: "DONE") { task { id } }
+        }
+        """
+        self.assertIsNone(self._post(mutation, {"taskId": str(self.task.pk)}).get("errors"))
+        data = self._post(QUERY)
+        self.assertEqual(data["data"]["projects"][0]["tasks"][0]["status"], "DONE")
+
+    def test_orm_write_invalidates(self):
+        self._post(QUERY)
+        Project.objects.create(organization=self.org1, name="P2")
+        names = {p["name"] for p in self._post(QUERY)["data"]["projects"]}
+        self.assertEqual(names, {"P1", "P2"})
+
+    def test_bulk_and_admin_writes_invalidate(self):
+        query = "{ projects { name taskCount tasks { title status comments { content } } } }"
+        # Drifted counter (a raw UPDATE, not a tracked write), then repaired (bulk_update)
+        Project.objects.filter(pk=self.project.pk).update(task_count=7)
+        self.assertEqual(self._post(query)["data"]["projects"][0]["taskCount"], 7)
+        recompute_project_counters([self.project.pk])
+        self.assertEqual(self._post(query)["data"]["projects"][0]["taskCount"], 1)
+
+        # Admin deletes and bulk actions go through the model and queryset methods
+        comment = TaskComment.objects.create(task=self.task, content="C1", author_email="a@x.com")
+        self._post(query)
+        comment.delete()
+        self.assertEqual(self._post(query)["data"]["projects"][0]["tasks"][0]["comments"], [])
+
+        TaskComment.objects.create(task=self.task, content="C2", author_email="a@x.com")
+        self._post(query)
+        TaskComment.objects.filter(task=self.task).delete()
+        self.assertEqual(self._post(query)["data"]["projects"][0]["tasks"][0]["comments"], [])
+
+        Task.objects.filter(pk=self.task.pk).update(status="DONE")
+        self.assertEqual(self._post(query)["data"]["projects"][0]["tasks"][0]["status"], "DONE")
+
+        Task.objects.filter(pk=self.task.pk).delete()
+        self.assertEqual(self._post(query)["data"]["projects"][0]["tasks"], [])
+
+    def test_variables_are_part_of_the_key(self):
+        query = "query P($status: String) { projects(status: $status) { name } }"
+        Project.objects.create(organization=self.org1, name="Done", status="COMPLETED")
+        active = self._post(query, {"status": "ACTIVE"})["data"]["projects"]
+        completed = self._post(query, {"status": "COMPLETED"})["data"]["projects"]
+        self.assertEqual([p["name"] for p in active], ["P1"])
+        self.assertEqual([p["name"] for p in completed], ["Done"])
@@ -0,0 +1,92 @@
+import gzip
+
+from django.test import TestCase, Client, override_settings
+from pm_backend.response_encoding import dumps, etag_matches, negotiate_encoding
+from projects.models import Organization, Project, Task
+from projects.operations import GET_PROJECT_DETAIL, UPDATE_TASK_STATUS
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_COMPRESSION_MIN_BYTES=200)
+class ResponseEncodingTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        self.project = Project.objects.create(organization=self.org, name="P1", description="x" * 300)
+        self.task = Task.objects.create(project=self.project, title="T1", assignee_email="u@x.com")
+
+    def _post(self, query, variables, **headers):
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query, "variables": variables}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+            **headers,
+        )
+
+    def _detail(self, **headers):
+        return self._post(GET_PROJECT_DETAIL, {"id": str(self.project.pk)}, **headers)
+
+    def test_gzip_above_the_threshold_only(self):
+        resp = self._detail(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        data = json.loads(gzip.decompress(resp.content))
+        self.assertEqual(data["data"]["project"]["name"], "P1")
+        self.assertTrue(resp["ETag"].endswith('-gzip"'))
+
+        # No Accept-Encoding: identity, same body
+        plain = self._detail()
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(plain.content), data)
+
+        with override_settings(GRAPHQL_COMPRESSION_MIN_BYTES=100_000):
+            self.assertFalse(self._detail(HTTP_ACCEPT_ENCODING="gzip").has_header("Content-Encoding"))
+
+    def test_if_none_match_returns_304_until_the_data_changes(self):
+        first = self._detail()
+        etag = first["ETag"]
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+
+        again = self._detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again["ETag"], etag)
+        # The validator is the same whatever the client decompressed it from
+        coded = self._detail(HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertEqual(self._detail(HTTP_IF_NONE_MATCH=coded).status_code, 304)
+
+        # GET queries too
+        params = {"query": GET_PROJECT_DETAIL, "variables": json.dumps({"id": str(self.project.pk)})}
+        headers = {"HTTP_X_ORG_SLUG": "org-one", "HTTP_ACCEPT": "application/json"}
+        get = self.client.get(GRAPHQL_URL, params, **headers)
+        revalidated = self.client.get(GRAPHQL_URL, params, HTTP_IF_NONE_MATCH=get["ETag"], **headers)
+        self.assertEqual(revalidated.status_code, 304)
+
+        mutation = self._post(
+            UPDATE_TASK_STATUS, {"taskId": str(self.task.pk), "status": "DONE"}, HTTP_IF_NONE_MATCH="*"
+        )
+        self.assertEqual(mutation.status_code, 200)
+        self.assertFalse(mutation.has_header("ETag"))
+
+        changed = self._detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_negotiation_and_encoder(self):
+        both = ("br", "gzip")
+        self.assertEqual(negotiate_encoding("gzip, br", both), "br")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip", both), "gzip")
+        self.assertEqual(negotiate_encoding("br", ("gzip",)), None)
+        self.assertEqual(negotiate_encoding("*;q=0", both), None)
+        self.assertEqual(negotiate_encoding("identity, *;q=0.1", both), "br")
+        self.assertEqual(negotiate_encoding(None, both), None)
+
+        self.assertTrue(etag_matches('W/"abc-br", "zzz"', "abc"))
+        self.assertFalse(etag_matches('"abcd"', "abc"))
+
+        data = {"data": {"name": "Ünïcode", "n": [1, 2.5, None, True]}}
+        self.assertEqual(json.loads(dumps(data)), data)
@@ -0,0 +1,103 @@
+from django.test import TestCase, Client, override_settings
+from projects.models import Organization, Project, Task, TaskComment
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+SEARCH = """
+query S($q: String!, $projectId: ID, $status: String, $first: Int, $after: String) {
+  search(query: $q, projectId: $projectId, status: $status, first: $first, after: $after) {
+    edges { cursor node { kind rank task { title } comment { content } } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org1 = Organization.objects.create(name="Org One", slug="org-one")
+        self.org2 = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org1, name="P1")
+        self.other_project = Project.objects.create(organization=self.org1, name="P2")
+        self.foreign = Project.objects.create(organization=self.org2, name="F")
+
+        self.title_hit = self._task("Fix login redirect", "Users bounce after signing in")
+        self.description_hit = self._task("Polish header", "Login button misaligned", status="DONE")
+        self.other_hit = self._task("Login audit", "", project=self.other_project)
+        self.foreign_hit = self._task("Login for org two", "", project=self.foreign)
+        TaskComment.objects.create(
+            task=self._task("Unrelated", ""), content="Repro steps for the login crash", author_email="a@x.com"
+        )
+
+    def _task(self, title, description, status="TODO", project=None):
+        return Task.objects.create(
+            project=project or self.project,
+            title=title,
+            description=description,
+            status=status,
+            assignee_email="u@x.com",
+        )
+
+    def _search(self, q, org_slug="org-one", **variables):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": SEARCH, "variables": {"q": q, **variables}}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG=org_slug,
+        )
+        return json.loads(resp.content)
+
+    def _titles(self, data):
+        self.assertIsNone(data.get("errors"))
+        return [edge["node"]["task"]["title"] for edge in data["data"]["search"]["edges"]]
+
+    def test_ranks_tasks_and_comments_within_org(self):
+        # org lookup + ranked ids + tasks + comments
+        with self.assertNumQueries(4):
+            data = self._search("login")
+        edges = data["data"]["search"]["edges"]
+        titles = self._titles(data)
+        self.assertEqual(len(titles), 4)
+        self.assertNotIn("Login for org two", titles)
+        # Title matches outrank description matches
+        self.assertLess(titles.index("Fix login redirect"), titles.index("Polish header"))
+        comment_hits = [e["node"] for e in edges if e["node"]["kind"] == "COMMENT"]
+        self.assertEqual(comment_hits[0]["task"]["title"], "Unrelated")
+        self.assertIn("login crash", comment_hits[0]["comment"]["content"])
+        ranks = [e["node"]["rank"] for e in edges]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_filters_and_stemming(self):
+        self.assertEqual(
+            self._titles(self._search("logins", projectId=str(self.other_project.pk))), ["Login audit"]
+        )
+        self.assertEqual(self._titles(self._search("login", status="DONE")), ["Polish header"])
+        self.assertEqual(self._titles(self._search("login", org_slug="org-two")), ["Login for org two"])
+
+    def test_pagination_seeks_past_cursor(self):
+        seen = []
+        after = None
+        while True:
+            data = self._search("login", first=1, after=after)
+            seen += self._titles(data)
+            page_info = data["data"]["search"]["pageInfo"]
+            if not page_info["hasNextPage"]:
+                break
+            after = page_info["endCursor"]
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    def test_index_follows_writes(self):
+        self.title_hit.title = "Fix signup redirect"
+        self.title_hit.save()
+        self.description_hit.delete()
+        self.assertEqual(self._titles(self._search("signup")), ["Fix signup redirect"])
+        self.assertEqual(len(self._titles(self._search("login"))), 2)
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self._titles(self._search('login" *(:')), self._titles(self._search("login")))
+        self.assertEqual(self._titles(self._search("  ")), [])
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from projects.models import Organization, Project, Task
+from projects.operations import GET_ORG_STATS, UPDATE_TASK_STATUS
+from projects.stats import week_start
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class OrgStatsTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        other = Organization.objects.create(name="Org Two", slug="org-two")
+        yesterday = timezone.localdate() - timedelta(days=1)
+
+        self.alpha = Project.objects.create(organization=self.org, name="Alpha")
+        beta = Project.objects.create(organization=self.org, name="Beta")
+        self.late = Task.objects.create(
+            project=self.alpha, title="Late", assignee_email="ann@x.com", due_date=yesterday
+        )
+        Task.objects.create(
+            project=self.alpha,
+            title="Late but done",
+            status=Task.Status.DONE,
+            assignee_email="ann@x.com",
+            due_date=yesterday,
+        )
+        Task.objects.create(
+            project=beta, title="Open", status=Task.Status.IN_PROGRESS, assignee_email="bob@x.com"
+        )
+        Task.objects.create(
+            project=Project.objects.create(organization=other, name="Elsewhere"),
+            title="Other tenant",
+            assignee_email="ann@x.com",
+            due_date=yesterday,
+        )
+
+    def _stats(self, **variables):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": GET_ORG_STATS, "variables": variables}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        data = json.loads(resp.content)
+        return data.get("errors"), data.get("data") and data["data"]["orgStats"]
+
+    def test_dimensions(self):
+        errors, stats = self._stats()
+        self.assertIsNone(errors)
+        self.assertEqual((stats["taskCount"], stats["overdueCount"]), (3, 1))
+        self.assertEqual(stats["statusBreakdown"], {"todo": 1, "inProgress": 1, "done": 1})
+
+        projects = {p["name"]: p for p in stats["projects"]}
+        self.assertEqual(projects["Alpha"]["overdueCount"], 1)
+        self.assertEqual(projects["Alpha"]["statusBreakdown"], {"todo": 1, "inProgress": 0, "done": 1})
+        self.assertEqual(projects["Beta"]["overdueCount"], 0)
+
+        self.assertEqual(
+            [(a["assigneeEmail"], a["taskCount"], a["overdueCount"]) for a in stats["assignees"]],
+            [("ann@x.com", 2, 1), ("bob@x.com", 1, 0)],
+        )
+
+        weeks = stats["weeks"]
+        self.assertEqual(len(weeks), 12)
+        this_week = week_start(timezone.localdate()).isoformat()
+        self.assertEqual(weeks[-1], {"weekStart": this_week, "created": 3, "completed": 1})
+        self.assertEqual(sum(w["created"] for w in weeks[:-1]), 0)
+
+    @override_settings(ORG_STATS_CACHE_TIMEOUT=300)
+    def test_cached_until_a_task_changes(self):
+        self._stats()
+        # The tenant and the aggregates both come from caches
+        with self.assertNumQueries(0):
+            self._stats()
+
+        self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps(
+                {"query": UPDATE_TASK_STATUS, "variables": {"taskId": str(self.late.pk), "status": "DONE"}}
+            ),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        _, stats = self._stats()
+        self.assertEqual(stats["overdueCount"], 0)
+        self.assertEqual(stats["weeks"][-1]["completed"], 2)
+
+    @override_settings(ORG_STATS_CACHE_TIMEOUT=0)
+    def test_not_cached_when_disabled(self):
+        self._stats()
+        # The tenant still comes from its cache; the aggregates are recomputed
+        with self.assertNumQueries(5):
+            self._stats()
+
+    def test_weeks_argument_is_bounded(self):
+        errors, _ = self._stats(weeks=4)
+        self.assertIsNone(errors)
+        errors, _ = self._stats(weeks=53)
+        self.assertEqual(errors[0]["message"], "weeks must be between 1 and 52.")
+
+
+class CompletedAtTests(TestCase):
+    def setUp(self):
+        org = Organization.objects.create(name="Org One", slug="org-one")
+        self.project = Project.objects.create(organization=org, name="P1")
+
+    def test_set_when_done_and_cleared_when_reopened(self):
+        task = Task.objects.create(project=self.project, title="T", assignee_email="u@x.com")
+        self.assertIsNone(task.completed_at)
+
+        task.status = Task.Status.DONE
+        task.save(update_fields=["status"])
+        task.refresh_from_db()
+        completed_at = task.completed_at
+        self.assertIsNotNone(completed_at)
+
+        task.title = "Renamed"
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.completed_at, completed_at)
+
+        Task.objects.filter(pk=task.pk).update(status=Task.Status.TODO)
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+
+    def test_bulk_writes(self):
+        done, todo = Task.objects.bulk_create(
+            [
+                Task(project=self.project, title="A", status=Task.Status.DONE, assignee_email="u@x.com"),
+                Task(project=self.project, title="B", assignee_email="u@x.com"),
+            ]
+        )
+        self.assertIsNotNone(done.completed_at)
+        self.assertIsNone(todo.completed_at)
+
+        Task.objects.filter(pk__in=[done.pk, todo.pk]).update(status=Task.Status.DONE)
+        # Tasks that were already done keep their completion time
+        self.assertEqual(Task.objects.get(pk=done.pk).completed_at, done.completed_at)
+        self.assertIsNotNone(Task.objects.get(pk=todo.pk).completed_at)
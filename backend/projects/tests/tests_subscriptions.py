@@ -0,0 +1,185 @@
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from pm_backend.websocket import websocket_router
+from projects.broker import InMemoryBroker, get_broker, task_channel
+from projects.models import Organization, Project, Task
+from projects.operations import ADD_TASK_COMMENT, UPDATE_TASK_STATUS
+from projects.tests.websocket_client import InProcessConnection
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+TASK_CHANGED = """
+subscription S($projectId: ID!) {
+  taskChanged(projectId: $projectId) { id status project { name } }
+}
+"""
+
+COMMENT_ADDED = """
+subscription S($taskId: ID!) { commentAdded(taskId: $taskId) { content authorEmail task { title } } }
+"""
+
+
+async def _not_found_app(scope, receive, send):
+    raise AssertionError("HTTP app called for a WebSocket")
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class SubscriptionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.app = websocket_router(_not_found_app)
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        other = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org, name="P1")
+        self.task = Task.objects.create(project=self.project, title="T1", assignee_email="u@x.com")
+        self.other_task = Task.objects.create(project=self.project, title="T2", assignee_email="u@x.com")
+        self.foreign = Project.objects.create(organization=other, name="Foreign")
+
+    def _mutate(self, document, variables):
+        # TestCase never commits: run the publish-on-commit hooks by hand
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                GRAPHQL_URL,
+                data=json.dumps({"query": document, "variables": variables}),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG="org-one",
+            )
+        self.assertIsNone(json.loads(resp.content).get("errors"))
+
+    async def _connect(self, org_slug="org-one"):
+        ws = InProcessConnection(self.app)
+        self.assertEqual((await ws.connect())["type"], "websocket.accept")
+        await ws.send_json({"type": "connection_init", "payload": {"orgSlug": org_slug}})
+        self.assertEqual(await ws.receive_json(), {"type": "connection_ack"})
+        return ws
+
+    async def _subscribe(self, ws, id, query, variables, subscribers):
+        await ws.send_json({"id": id, "type": "subscribe", "payload": {"query": query, "variables": variables}})
+        # The subscription is live once the broker counts it
+        while get_broker().subscriber_count() < subscribers:
+            await asyncio.sleep(0.01)
+
+    def test_task_changed_streams_status_updates(self):
+        async def scenario():
+            ws = await self._connect()
+            await self._subscribe(ws, "1", TASK_CHANGED, {"projectId": str(self.project.pk)}, 1)
+
+            await sync_to_async(self._mutate)(UPDATE_TASK_STATUS, {"taskId": str(self.task.pk), "status": "DONE"})
+            message = await ws.receive_json()
+            self.assertEqual(message["id"], "1")
+            self.assertEqual(message["type"], "next")
+            self.assertEqual(
+                message["payload"]["data"]["taskChanged"],
+                {"id": str(self.task.pk), "status": "DONE", "project": {"name": "P1"}},
+            )
+
+            # complete unsubscribes: nothing more is delivered
+            await ws.send_json({"id": "1", "type": "complete"})
+            while get_broker().subscriber_count():
+                await asyncio.sleep(0.01)
+            await sync_to_async(self._mutate)(UPDATE_TASK_STATUS, {"taskId": str(self.task.pk), "status": "TODO"})
+            with self.assertRaises(asyncio.TimeoutError):
+                await ws.receive_json(timeout=0.1)
+            await ws.close()
+
+        async_to_sync(scenario)()
+
+    def test_comment_added_only_for_the_subscribed_task(self):
+        async def scenario():
+            ws = await self._connect()
+            await self._subscribe(ws, "c", COMMENT_ADDED, {"taskId": str(self.task.pk)}, 1)
+
+            for task in (self.other_task, self.task):
+                await sync_to_async(self._mutate)(
+                    ADD_TASK_COMMENT, {"taskId": str(task.pk), "content": f"on {task.title}", "authorEmail": "a@x.com"}
+                )
+            message = await ws.receive_json()
+            self.assertEqual(
+                message["payload"]["data"]["commentAdded"],
+                {"content": "on T1", "authorEmail": "a@x.com", "task": {"title": "T1"}},
+            )
+            with self.assertRaises(asyncio.TimeoutError):
+                await ws.receive_json(timeout=0.1)
+            await ws.close()
+
+        async_to_sync(scenario)()
+
+    def test_subscriptions_are_scoped_to_the_organization(self):
+        async def scenario():
+            ws = await self._connect()
+            payload = {"query": TASK_CHANGED, "variables": {"projectId": str(self.foreign.pk)}}
+            await ws.send_json({"id": "1", "type": "subscribe", "payload": payload})
+            message = await ws.receive_json()
+            self.assertEqual(message["type"], "error")
+            self.assertEqual(message["payload"][0]["message"], "Project not found in this organization.")
+
+            payload = {"query": "{ projects { name } }"}
+            await ws.send_json({"id": "2", "type": "subscribe", "payload": payload})
+            message = await ws.receive_json()
+            self.assertEqual(message["type"], "error")
+            await ws.close()
+
+            ws = InProcessConnection(self.app)
+            await ws.connect()
+            await ws.send_json({"type": "connection_init", "payload": {"orgSlug": "nope"}})
+            self.assertEqual((await ws.receive())["code"], 4403)
+
+        async_to_sync(scenario)()
+
+    def test_protocol_errors_close_the_connection(self):
+        async def scenario():
+            ws = InProcessConnection(self.app, subprotocols=["graphql-ws"])
+            self.assertEqual((await ws.connect())["code"], 4406)
+
+            ws = InProcessConnection(self.app)
+            await ws.connect()
+            await ws.send_json({"id": "1", "type": "subscribe", "payload": {"query": TASK_CHANGED}})
+            self.assertEqual((await ws.receive())["code"], 4401)
+
+            ws = await self._connect()
+            await ws.send_json({"type": "ping"})
+            self.assertEqual(await ws.receive_json(), {"type": "pong"})
+            await ws.send_json({"type": "connection_init"})
+            self.assertEqual((await ws.receive())["code"], 4429)
+
+        async_to_sync(scenario)()
+
+    def test_http_rejects_subscriptions(self):
+        resp = self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": TASK_CHANGED, "variables": {"projectId": str(self.project.pk)}}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+        )
+        self.assertIn("WebSockets", json.loads(resp.content)["errors"][0]["message"])
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+    def test_publish_from_another_thread_and_drop_oldest(self):
+        broker = InMemoryBroker(queue_size=2)
+        channel = task_channel(1, 1)
+
+        async def scenario():
+            stream = broker.subscribe(channel)
+            first = asyncio.ensure_future(stream.__anext__())
+            while not broker.subscriber_count(channel):
+                await asyncio.sleep(0)
+            broker.publish(channel, {"n": 0})
+            received = [await asyncio.wait_for(first, 1)]
+
+            thread = threading.Thread(target=lambda: [broker.publish(channel, {"n": n}) for n in (1, 2, 3)])
+            thread.start()
+            thread.join()
+            # Two slots: n=1 was dropped for n=3 while nobody was reading
+            received += [await asyncio.wait_for(stream.__anext__(), 1) for _ in range(2)]
+            await stream.aclose()
+            return received
+
+        self.assertEqual(async_to_sync(scenario)(), [{"n": 0}, {"n": 2}, {"n": 3}])
+        self.assertEqual(broker.subscriber_count(), 0)
+        self.assertEqual(broker.publish(channel, {"n": 4}), 0)
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from projects.models import Organization, Project, Task, TaskComment
+from projects.schema import filter_tasks
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class TaskOrganizationTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        self.other = Organization.objects.create(name="Org Two", slug="org-two")
+        self.project = Project.objects.create(organization=self.org, name="P1")
+        self.foreign = Project.objects.create(organization=self.other, name="P2")
+
+    def test_writes_copy_the_organization(self):
+        task = Task.objects.create(project=self.project, title="T", assignee_email="u@x.com")
+        # Project given by id only: bulk_create looks the organization up
+        bulk = Task.objects.bulk_create(
+            [Task(project_id=self.foreign.pk, title="B", assignee_email="u@x.com")]
+        )
+        comment = TaskComment.objects.create(task=task, content="C", author_email="a@x.com")
+        TaskComment.objects.bulk_create(
+            [TaskComment(task_id=bulk[0].pk, content="D", author_email="a@x.com")]
+        )
+
+        self.assertEqual(Task.objects.get(pk=task.pk).organization_id, self.org.pk)
+        self.assertEqual(Task.objects.get(pk=bulk[0].pk).organization_id, self.other.pk)
+        self.assertEqual(TaskComment.objects.get(pk=comment.pk).organization_id, self.org.pk)
+        self.assertEqual(TaskComment.objects.get(content="D").organization_id, self.other.pk)
+
+    def test_moving_a_task_moves_its_organization(self):
+        first, second = Task.objects.bulk_create(
+            Task(project=self.project, title=f"T{i}", assignee_email="u@x.com") for i in range(2)
+        )
+        first.project_id = self.foreign.pk
+        first.save()
+        Task.objects.filter(pk=second.pk).update(project=self.foreign)
+
+        self.assertEqual(
+            set(Task.objects.filter(pk__in=[first.pk, second.pk]).values_list("organization_id", flat=True)),
+            {self.other.pk},
+        )
+        # A status-only save leaves it alone
+        first.status = Task.Status.DONE
+        first.save(update_fields=["status"])
+        self.assertEqual(Task.objects.get(pk=first.pk).organization_id, self.other.pk)
+
+    def test_tenant_filters_do_not_join_projects_for_the_organization(self):
+        task = Task.objects.create(project=self.project, title="T", assignee_email="u@x.com")
+        self.assertIn('"projects_task"."organization_id" =', str(filter_tasks(self.org).query))
+
+        query = 'mutation($id: ID!) { updateTaskStatus(taskId: $id, status: "DONE") { task { id } } }'
+        with CaptureQueriesContext(connection) as queries:
+            resp = Client().post(
+                GRAPHQL_URL,
+                data=json.dumps({"query": query, "variables": {"id": str(task.pk)}}),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG="org-one",
+            )
+        self.assertIsNone(json.loads(resp.content).get("errors"))
+        lookup = next(q["sql"] for q in queries.captured_queries if 'FROM "projects_task"' in q["sql"])
+        where = lookup.split(" WHERE ", 1)[1]
+        self.assertIn('"projects_task"."organization_id" =', where)
+        self.assertNotIn('"projects_project"."organization_id" =', where)
+
+    def test_task_reads_do_not_join_projects(self):
+        task = Task.objects.create(project=self.project, title="T", assignee_email="u@x.com")
+        hidden = Project.objects.create(organization=self.org, name="Deleted")
+        Task.objects.create(project=hidden, title="Hidden", assignee_email="u@x.com")
+        Project.objects.filter(pk=hidden.pk).update(deleted_at=timezone.now())
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = Client().post(
+                GRAPHQL_URL,
+                data=json.dumps({"query": "{ tasks { title project { name } } }"}),
+                content_type="application/json",
+                HTTP_X_ORG_SLUG="org-one",
+            )
+        data = json.loads(resp.content)
+        self.assertEqual(data["data"]["tasks"], [{"title": "T", "project": {"name": "P1"}}])
+        task_query = next(q["sql"] for q in queries.captured_queries if 'FROM "projects_task"' in q["sql"])
+        self.assertNotIn("JOIN", task_query)
+        self.assertNotIn("JOIN", str(Task.objects.visible().filter(pk=task.pk).query))
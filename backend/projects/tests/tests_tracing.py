@@ -0,0 +1,86 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, Client, AsyncClient, override_settings
+from django.urls import path
+from pm_backend.schema import async_schema
+from pm_backend.views import AsyncGraphQLView
+from projects.models import Organization, Project, Task
+import json
+
+
+GRAPHQL_URL = "/graphql/"
+QUERY = "query Board { projects { name tasks { title } } }"
+
+async_graphql_view = AsyncGraphQLView.as_view(schema=async_schema)
+async_graphql_view.csrf_exempt = True
+urlpatterns = [path("graphql/", async_graphql_view)]
+
+
+@override_settings(GRAPHQL_TRACING_ENABLED=True, GRAPHQL_RESPONSE_CACHE_ENABLED=False)
+class TracingTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.org = Organization.objects.create(name="Org One", slug="org-one")
+        for p in range(2):
+            project = Project.objects.create(organization=self.org, name=f"P{p}")
+            Task.objects.create(project=project, title="T", assignee_email="u@x.com")
+
+    def _post(self, query, **headers):
+        return self.client.post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query}),
+            content_type="application/json",
+            HTTP_X_ORG_SLUG="org-one",
+            **headers,
+        )
+
+    def test_tracing_returned_with_debug_header(self):
+        resp = self._post(QUERY, HTTP_X_DEBUG_TRACING="1")
+        data = json.loads(resp.content)
+        self.assertIsNone(data.get("errors"))
+        tracing = data["extensions"]["tracing"]
+        self.assertEqual(tracing["operationName"], "Board")
+        # org lookup + projects + tasks
+        self.assertEqual(tracing["sql"]["count"], 3)
+        self.assertGreater(tracing["responseBytes"], 0)
+        paths = [r["path"] for r in tracing["resolvers"]]
+        self.assertIn(["projects"], paths)
+        self.assertIn(["projects", 1, "tasks", 0, "title"], paths)
+
+    def test_no_tracing_without_header(self):
+        data = json.loads(self._post(QUERY).content)
+        self.assertNotIn("tracing", data.get("extensions", {}))
+
+    @override_settings(GRAPHQL_SLOW_OPERATION_MS=0)
+    def test_slow_operations_are_logged(self):
+        with self.assertLogs("pm_backend.slow_operations", "WARNING") as logs:
+            self._post(QUERY)
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry["event"], "slow_graphql_operation")
+        self.assertEqual(entry["operationName"], "Board")
+        self.assertEqual(entry["org"], "org-one")
+        self.assertEqual(entry["sql"]["count"], 3)
+
+    def test_async_view_is_traced(self):
+        # This module's urlpatterns serve the async view
+        with self.settings(ROOT_URLCONF=__name__):
+            resp = async_to_sync(AsyncClient().post)(
+                GRAPHQL_URL,
+                data=json.dumps({"query": QUERY}),
+                content_type="application/json",
+                headers={"X-Org-Slug": "org-one", "X-Debug-Tracing": "1"},
+            )
+        tracing = json.loads(resp.content)["extensions"]["tracing"]
+        self.assertEqual(tracing["sql"]["count"], 3)
+        self.assertIn(["projects", 0, "tasks"], [r["path"] for r in tracing["resolvers"]])
+
+
+class TracingDisabledTests(TestCase):
+    def test_middleware_not_loaded_by_default(self):
+        client = Client()
+        client.get("/graphql/stats/")
+        middleware = client.handler._middleware_chain
+        names = []
+        while middleware is not None:
+            names.append(type(middleware).__name__)
+            middleware = getattr(middleware, "get_response", None)
+        self.assertNotIn("GraphQLTracingMiddleware", names)
@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from pm_backend.websocket import PROTOCOL
+
+
+class InProcessConnection:
+    """
+    A client connection to an ASGI app without a socket, for
+    tests_subscriptions and loadtest_subscriptions: ASGI messages go
+    through two asyncio queues.
+    """
+
+    def __init__(self, application, path="/graphql/", headers=None, subprotocols=(PROTOCOL,)):
+        self.application = application
+        self.scope = {
+            "type": "websocket",
+            "path": path,
+            "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+            "subprotocols": list(subprotocols),
+        }
+        self.to_app = asyncio.Queue()
+        self.from_app = asyncio.Queue()
+        self.task = None
+
+    async def connect(self, timeout=1):
+        """Returns the app's websocket.accept or websocket.close message."""
+        self.task = asyncio.create_task(self.application(self.scope, self.to_app.get, self.from_app.put))
+        await self.to_app.put({"type": "websocket.connect"})
+        return await self.receive(timeout)
+
+    async def send_json(self, message):
+        await self.to_app.put({"type": "websocket.receive", "text": json.dumps(message)})
+
+    async def receive(self, timeout=1):
+        return await asyncio.wait_for(self.from_app.get(), timeout)
+
+    async def receive_json(self, timeout=1):
+        message = await self.receive(timeout)
+        if message["type"] != "websocket.send":
+            raise AssertionError(f"Expected a message, got {message}")
+        return json.loads(message["text"])
+
+    async def close(self, timeout=1):
+        await self.to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, timeout)
@@ -23,7 +23,7 @@ const GET_PROJECT_DETAIL = gql`
         status
         assigneeEmail
         dueDate
-        comments {
+        comments(first: 20) {
           id
           content
           authorEmail